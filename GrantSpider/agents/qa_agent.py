@@ -2,11 +2,29 @@
 Question-answering agent
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional
 from agents.base_agent import BaseAgent
 from config.models import get_llm_model
 from langchain_core.prompts import PromptTemplate
 
+# Fixed part of the QA prompt, kept byte-identical across calls so it can be
+# served from the provider's prompt (prefix) cache
+QA_INSTRUCTIONS = """
+You are given information from grant documents and a question.
+Based on this information, answer the question accurately and in detail.
+
+IMPORTANT: Respond in the same language as the question. If the question is in Turkish, respond in Turkish. If in English, respond in English. If in Italian, respond in Italian.
+
+When answering:
+1. Use the information from the given documents AND cross-document analysis
+2. If cross-document analysis provides grant comparisons or synthesis, incorporate that into your answer
+3. Specify which document each piece of information comes from
+4. If comparing multiple grants, highlight the differences and similarities clearly
+5. If the answer involves multiple grants, use the cross-document insights
+6. Respond in the SAME LANGUAGE as the question
+7. Provide a detailed and clear explanation that leverages both document content and cross-document insights
+"""
+
 class QAAgent(BaseAgent):
     """Agent that performs question-answering operations"""
     
@@ -20,12 +38,9 @@ class QAAgent(BaseAgent):
     
     def _create_universal_prompt_template(self) -> PromptTemplate:
         """Universal QA prompt template - supports cross-document analysis"""
-        template = """
-You are given the following information from grant documents and a question.
-Based on this information, answer the question accurately and in detail.
-
-IMPORTANT: Respond in the same language as the question. If the question is in Turkish, respond in Turkish. If in English, respond in English. If in Italian, respond in Italian.
-
+        # Static instructions first, request-specific content last: the provider
+        # caches the longest repeated prefix, so every call reuses QA_INSTRUCTIONS
+        template = QA_INSTRUCTIONS + """
 Given Documents:
 {documents}
 
@@ -34,15 +49,6 @@ Cross-Document Analysis (if available):
 
 Question: {question}
 
-When answering:
-1. Use the information from the given documents AND cross-document analysis
-2. If cross-document analysis provides grant comparisons or synthesis, incorporate that into your answer
-3. Specify which document each piece of information comes from
-4. If comparing multiple grants, highlight the differences and similarities clearly
-5. If the answer involves multiple grants, use the cross-document insights
-6. Respond in the SAME LANGUAGE as the question
-7. Provide a detailed and clear explanation that leverages both document content and cross-document insights
-
 Answer:
 """
         return PromptTemplate(
@@ -52,6 +58,23 @@ Answer:
     
 
 
+    def prepare_prefix(self, query: str, cross_document_analysis: Dict[str, Any] = None) -> PromptTemplate:
+        """
+        Prompt'un belgelerden bağımsız kısmını önceden doldurur
+        (belge araması sürerken çağrılabilir)
+        
+        Args:
+            query: Kullanıcı sorusu
+            cross_document_analysis: Cross-document analiz sonuçları
+            
+        Returns:
+            Yalnızca {documents} bekleyen kısmi prompt template
+        """
+        return self.universal_prompt_template.partial(
+            question=query,
+            cross_document_analysis=self._format_cross_document_analysis(cross_document_analysis or {})
+        )
+    
     def execute(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
         Soru-cevap işlemini gerçekleştirir
@@ -62,6 +85,57 @@ Answer:
         Returns:
             Yanıt ve güncellenmiş durum
         """
+        prompt = self._build_prompt(state)
+        if prompt is None:
+            return state
+        
+        response = self.llm.invoke(prompt)
+        
+        print(f"✅ LLM yanıtı alındı - Uzunluk: {len(response.content)} karakter")
+        
+        # Yanıtı duruma ekle
+        state["qa_response"] = response.content
+        state["qa_performed"] = True
+        
+        return state
+    
+    def stream(self, state: Dict[str, Any]) -> Iterator[str]:
+        """
+        Yanıtı LLM'den geldikçe parça parça üretir; bitince state["qa_response"] doldurulur
+        
+        Args:
+            state: Mevcut durum (execute ile aynı alanlar)
+            
+        Yields:
+            Yanıt metni parçaları
+        """
+        prompt = self._build_prompt(state)
+        if prompt is None:
+            yield state["qa_response"]
+            return
+        
+        parts = []
+        for chunk in self.llm.stream(prompt):
+            text = chunk.content
+            if text:
+                parts.append(text)
+                yield text
+        
+        print(f"✅ LLM yanıtı akıtıldı - Uzunluk: {sum(map(len, parts))} karakter")
+        
+        state["qa_response"] = "".join(parts)
+        state["qa_performed"] = True
+    
+    def _build_prompt(self, state: Dict[str, Any]) -> Optional[str]:
+        """
+        LLM'e gönderilecek prompt'u oluşturur
+        
+        Args:
+            state: Mevcut durum
+            
+        Returns:
+            Prompt metni; LLM'e gerek yoksa None (yanıt state'e yazılmıştır)
+        """
         query = state.get("query", "")
         retrieved_documents = state.get("retrieved_documents", [])
         detected_language = state.get("detected_language", "tr")
@@ -76,41 +150,28 @@ Answer:
                 # o4-mini'nin doğal dil algılamasına güven - soru hangi dildeyse o dilde yanıt ver
                 state["qa_response"] = "I'm designed to answer questions about AMIF grant documents. Please ask me about grant procedures, eligibility criteria, or application requirements."
                 state["qa_performed"] = True
-                return state
+                return None
         
         if not query or not retrieved_documents:
             state["qa_response"] = "I couldn't find sufficient information to answer your question."
             state["qa_performed"] = True
-            return state
+            return None
         
         # Belgeleri formatla
         formatted_docs = self._format_documents(retrieved_documents)
         
-        # Cross-document analysis'i formatla
-        formatted_cross_analysis = self._format_cross_document_analysis(cross_document_analysis)
-        
-        # Evrensel prompt kullan - cross-document analysis ile
-        prompt = self.universal_prompt_template
+        # Önceden hazırlanmış prompt varsa sadece belgeler eklenir
+        prepared_prompt = state.get("prepared_prompt")
+        if prepared_prompt is None:
+            prepared_prompt = self.prepare_prefix(query, cross_document_analysis)
         print(f"🌍 Cross-document destekli prompt kullanılıyor")
         
-        # Prompt oluştur ve LLM'e gönder
-        prompt = prompt.format(
-            documents=formatted_docs,
-            question=query,
-            cross_document_analysis=formatted_cross_analysis
-        )
+        # Prompt oluştur
+        prompt = prepared_prompt.format(documents=formatted_docs)
         
         print(f"📝 Prompt uzunluğu: {len(prompt)} karakter")
         
-        response = self.llm.invoke(prompt)
-        
-        print(f"✅ LLM yanıtı alındı - Uzunluk: {len(response.content)} karakter")
-        
-        # Yanıtı duruma ekle
-        state["qa_response"] = response.content
-        state["qa_performed"] = True
-        
-        return state
+        return prompt
     
     def _format_documents(self, documents: List[Dict[str, Any]]) -> str:
         """
@@ -7,6 +7,9 @@ from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain_anthropic import ChatAnthropic
 from config.settings import settings
 
+# LLM clients are stateless and thread-safe, so one instance per model is shared
+_llm_models = {}
+
 def get_llm_model(model_name: Optional[str] = None):
     """
     Returns LLM model - OpenRouter support for DeepSeek R1
@@ -15,10 +18,17 @@ def get_llm_model(model_name: Optional[str] = None):
         model_name: Model name, uses default model if None
         
     Returns:
-        LLM model instance
+        LLM model instance (shared per model name)
     """
     model_name = model_name or settings.DEFAULT_LLM_MODEL
     
+    if model_name not in _llm_models:
+        _llm_models[model_name] = _create_llm_model(model_name)
+    
+    return _llm_models[model_name]
+
+def _create_llm_model(model_name: str):
+    """Creates a new LLM client for the given model"""
     if model_name.startswith("gpt"):
         # Use OpenAI direct API
         return ChatOpenAI(
@@ -31,6 +31,12 @@ class Settings:
     # Vector database settings
     VECTOR_DB_TYPE: str = "chromadb"  # chromadb, faiss
     VECTOR_DB_PATH: str = str(PROJECT_ROOT / "data" / "db")  # Absolute path
+    HNSW_SEARCH_EF: int = int(os.getenv("HNSW_SEARCH_EF", "100"))  # Raise for recall, lower for latency
+    
+    # Cache settings
+    REDIS_URL: str = os.getenv("REDIS_URL", "")
+    SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+    SEMANTIC_CACHE_DIR: str = os.getenv("SEMANTIC_CACHE_DIR", str(PROJECT_ROOT / "data" / "cache"))
     
     # PDF processing settings
     CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "1000"))
@@ -4,6 +4,7 @@ Vektör veritabanı yönetimi - OpenAI Embeddings ile
 
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 from pathlib import Path
 
@@ -14,10 +15,20 @@ from langchain_chroma import Chroma
 from langchain.schema import Document
 
 from config.settings import settings
+from utils.redis_cache import bump_index_version
 
 # Global vector store instance
 _vector_store = None
 
+# HNSW index parametreleri - yalnızca collection ilk oluşturulurken uygulanır
+# (mevcut bir collection için reset_vector_store + yeniden ingestion gerekir)
+HNSW_COLLECTION_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": settings.HNSW_SEARCH_EF,
+}
+
 def reset_global_vector_store():
     """Global vector store instance'ını sıfırla"""
     global _vector_store
@@ -65,7 +76,8 @@ def get_vector_store():
             collection_name="amif_documents",
             embedding_function=embeddings,
             persist_directory=str(db_path),
-            client_settings=chroma_settings
+            client_settings=chroma_settings,
+            collection_metadata=HNSW_COLLECTION_METADATA
         )
         
         print("✅ Vector store hazır")
@@ -92,6 +104,8 @@ def reset_vector_store():
     # Yeni dizini oluştur
     db_path.mkdir(parents=True, exist_ok=True)
     print("✅ Yeni veritabanı dizini oluşturuldu")
+    
+    bump_index_version()
 
 def add_documents_to_vector_store(documents: List[Document]) -> bool:
     """
@@ -138,6 +152,9 @@ def add_documents_to_vector_store(documents: List[Document]) -> bool:
             total_added = len(documents)
         
         print(f"✅ Toplam {total_added} belge başarıyla eklendi")
+        
+        # İndeks değişti: Redis'teki arama sonuçlarını geçersiz kıl
+        bump_index_version()
         return True
         
     except Exception as e:
@@ -176,6 +193,65 @@ def search_documents(query: str, k: int = 5) -> List[Document]:
         print(f"❌ Arama hatası: {e}")
         return []
 
+def search_documents_by_vector(embedding: List[float], k: int = 5) -> List[Document]:
+    """
+    Önceden hesaplanmış sorgu embedding'i ile arama yap (tekrar embed etmeden)
+    
+    Args:
+        embedding: Sorgu embedding'i
+        k: Döndürülecek sonuç sayısı
+        
+    Returns:
+        List[Document]: Bulunan belgeler
+    """
+    try:
+        vector_store = get_vector_store()
+        results = vector_store.similarity_search_by_vector(list(embedding), k=k)
+        print(f"✅ Vektör araması tamamlandı: {len(results)} sonuç bulundu")
+        return results
+        
+    except Exception as e:
+        print(f"❌ Arama hatası: {e}")
+        return []
+
+def search_documents_batch(queries: List[str], k: int = 5,
+                           embeddings: Optional[List[List[float]]] = None) -> List[List[Document]]:
+    """
+    Birden fazla sorguyu tek embedding çağrısı ve paralel aramalarla işle
+    
+    Args:
+        queries: Arama sorguları
+        k: Sorgu başına döndürülecek sonuç sayısı
+        embeddings: Önceden hesaplanmış sorgu embedding'leri (yoksa tek çağrıda hesaplanır)
+        
+    Returns:
+        List[List[Document]]: Her sorgu için bulunan belgeler (aynı sırada)
+    """
+    if not queries:
+        return []
+    
+    try:
+        vector_store = get_vector_store()
+        
+        # Tüm sorgular tek bir embedding isteğinde
+        if embeddings is None:
+            embeddings = vector_store.embeddings.embed_documents(list(queries))
+        
+        print(f"🔍 Toplu arama yapılıyor: {len(queries)} sorgu (k={k})")
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(queries))) as executor:
+            results = list(executor.map(
+                lambda embedding: vector_store.similarity_search_by_vector(list(embedding), k=k),
+                embeddings
+            ))
+        
+        print(f"✅ Toplu arama tamamlandı: {sum(len(r) for r in results)} sonuç bulundu")
+        return results
+        
+    except Exception as e:
+        print(f"❌ Toplu arama hatası: {e}")
+        return [[] for _ in queries]
+
 def get_collection_info():
     """
     Collection bilgilerini döndür
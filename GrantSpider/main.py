@@ -126,6 +126,10 @@ Example Usage:
     if not check_environment():
         return 1
     
+    # Route workflow logs (batch/scheduler progress) to the console once
+    from utils.helpers import configure_logging
+    configure_logging()
+    
     # Run appropriate function based on arguments
     try:
         if args.ingest:
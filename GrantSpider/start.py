@@ -3,10 +3,18 @@
 AMIF Grant Assistant - Quick Start Script
 """
 
+# Keep top-level imports minimal: this launcher's own import time is on the
+# critical path to the banner. Heavier modules (subprocess, main) are imported
+# only in the code paths that need them.
+import io
 import os
 import sys
-import subprocess
+import shutil
+import importlib.util
 from pathlib import Path
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional
 
 # Add project root directory to Python path
 project_root = os.path.dirname(os.path.abspath(__file__))
@@ -22,15 +30,13 @@ def print_banner():
 ╚══════════════════════════════════════════════════════════════╝
     """)
 
+@lru_cache(maxsize=None)
 def get_correct_python_executable():
     """Detects the correct Python executable"""
-    # First try the which python3 command
-    try:
-        result = subprocess.run(["which", "python3"], capture_output=True, text=True)
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except:
-        pass
+    # First resolve python3 from PATH (in-process, no subprocess)
+    python3_path = shutil.which("python3")
+    if python3_path:
+        return python3_path
     
     # Try alternative paths
     possible_paths = [
@@ -46,87 +52,250 @@ def get_correct_python_executable():
     
     return sys.executable  # Last resort
 
-def check_prerequisites():
+# (display_name, import_name) for every package the launcher checks.
+# The display name is the pip distribution, the import name is what Python imports.
+DEPS = (
+    ("streamlit", "streamlit"),
+    ("langchain", "langchain"),
+    ("chromadb", "chromadb"),
+    ("openai", "openai"),
+    ("langchain-openai", "langchain_openai"),
+    ("langchain-chroma", "langchain_chroma"),
+    ("python-dotenv", "dotenv"),
+)
+# The first four are required to start the application
+CORE_DEPS = DEPS[:4]
+
+DB_DIR = Path("data/db")
+RAW_DIR = Path("data/raw")
+ENV_FILE = Path(".env")
+CHROMA_SQLITE = DB_DIR / "chroma.sqlite3"
+READY_MARKER = Path.home() / ".cache" / "amif_grant" / "ready"
+
+CRITICAL_DIRS = [
+    "agents", "config", "graph", "ingestion", "interfaces",
+    "memory", "chains", "utils", "data", "data/db", "data/raw"
+]
+
+CRITICAL_FILES = [
+    ".env", "requirements.txt", "main.py", "start.py",
+    "streamlit_app.py", "config/settings.py", "config/models.py"
+]
+
+@dataclass
+class SystemStatus:
+    """Snapshot of every launcher check, collected once and shared by the reporters"""
+    python_exec: str
+    deps: Dict[str, bool]
+    dep_errors: Dict[str, str]
+    has_env: bool
+    env_key_state: str  # "set", "placeholder", "unset" or "missing"
+    db_entries: Optional[int]  # None when data/db does not exist
+    db_size_mb: Optional[float]
+    collections: int
+    pdf_count: Optional[int]  # None when data/raw does not exist
+    critical_dirs: Dict[str, bool]
+    critical_files: Dict[str, Optional[int]]
+    db_error: Optional[str] = None
+
+    @property
+    def core_deps_ok(self) -> bool:
+        return all(self.deps.get(name, False) for name, _ in CORE_DEPS)
+
+def _scan(parent):
+    """Reads a directory once and returns its entries keyed by name"""
+    try:
+        with os.scandir(parent) as it:
+            return {entry.name: entry for entry in it}
+    except OSError:
+        return None
+
+def _count_pdfs(entries):
+    """Counts PDF files in a scanned directory listing"""
+    if entries is None:
+        return None
+    return sum(1 for e in entries.values() if e.name.endswith(".pdf") and e.is_file())
+
+def _is_current_interpreter(python_exec):
+    """Whether python_exec resolves to the interpreter running this script"""
+    return os.path.realpath(python_exec) == os.path.realpath(sys.executable)
+
+# Imports every requested module in one interpreter and reports errors as JSON
+_PROBE_SCRIPT = """
+import json, importlib
+out = {}
+for name in %r:
+    try:
+        importlib.import_module(name)
+        out[name] = None
+    except Exception as e:
+        out[name] = str(e) or type(e).__name__
+print(json.dumps(out))
+"""
+
+def _probe_dependencies(python_exec, import_names):
+    """Checks importability of packages, returns {import_name: error message or None}"""
+    results = {}
+    pending = []
+    
+    # Fast path: the package is visibly installed for this interpreter, no subprocess needed
+    current = _is_current_interpreter(python_exec)
+    for name in import_names:
+        try:
+            if current and importlib.util.find_spec(name) is not None:
+                results[name] = None
+                continue
+        except (ImportError, ValueError):
+            pass
+        pending.append(name)
+    
+    if not pending:
+        return results
+    
+    # Missing (or a different interpreter): verify all of them with a single interpreter
+    import json
+    import subprocess
+    try:
+        result = subprocess.run([python_exec, "-c", _PROBE_SCRIPT % (pending,)],
+                                capture_output=True, text=True, timeout=15)
+        if result.returncode == 0:
+            results.update(json.loads(result.stdout))
+        else:
+            error = result.stderr.strip() or "import probe failed"
+            results.update((name, error) for name in pending)
+    except Exception as e:
+        results.update((name, str(e)) for name in pending)
+    
+    return results
+
+def _env_key_state(path, size):
+    """Classifies the OPENAI_API_KEY entry of the .env file in a single streaming pass"""
+    if size is None:
+        return "missing"
+    if size == 0:
+        return "unset"
+    with open(path, "r") as f:
+        for line in f:
+            if line.startswith("OPENAI_API_KEY="):
+                value = line[len("OPENAI_API_KEY="):].strip()
+                return "placeholder" if value == "your_openai_api_key_here" else "set"
+    return "unset"
+
+def collect_status() -> SystemStatus:
+    """Runs every filesystem scan and dependency probe exactly once"""
+    python_exec = get_correct_python_executable()
+    
+    probe = _probe_dependencies(python_exec, [import_name for _, import_name in DEPS])
+    deps = {}
+    dep_errors = {}
+    for display_name, import_name in DEPS:
+        error = probe.get(import_name, "not checked")
+        deps[display_name] = error is None
+        if error is not None:
+            dep_errors[display_name] = error
+    
+    # One scandir per parent directory instead of exists/isdir/listdir per entry
+    listings = {parent: _scan(parent) for parent in {os.path.dirname(d) or "." for d in CRITICAL_DIRS}}
+    critical_dirs = {}
+    for dir_name in CRITICAL_DIRS:
+        parent, name = os.path.split(dir_name)
+        critical_dirs[dir_name] = name in (listings.get(parent or ".") or {})
+    
+    critical_files = {}
+    for file_name in CRITICAL_FILES:
+        critical_files[file_name] = os.path.getsize(file_name) if os.path.exists(file_name) else None
+    
+    env_size = critical_files[ENV_FILE.as_posix()]
+    has_env = env_size is not None
+    try:
+        env_key_state = _env_key_state(ENV_FILE, env_size)
+    except OSError:
+        env_key_state = "unreadable"
+    
+    db_listing = _scan(DB_DIR)
+    db_size_mb = None
+    collections = 0
+    db_error = None
+    if db_listing is not None:
+        try:
+            # Reuse the scandir entries: is_dir() uses the cached d_type, no extra stat
+            for entry in db_listing.values():
+                if entry.name == CHROMA_SQLITE.name:
+                    db_size_mb = entry.stat().st_size / (1024*1024)
+                elif entry.is_dir(follow_symlinks=False):
+                    collections += 1
+        except OSError as e:
+            db_error = str(e)
+    
+    return SystemStatus(
+        python_exec=python_exec,
+        deps=deps,
+        dep_errors=dep_errors,
+        has_env=has_env,
+        env_key_state=env_key_state,
+        db_entries=len(db_listing) if db_listing is not None else None,
+        db_size_mb=db_size_mb,
+        collections=collections,
+        pdf_count=_count_pdfs(_scan(RAW_DIR)),
+        critical_dirs=critical_dirs,
+        critical_files=critical_files,
+        db_error=db_error,
+    )
+
+def _buffered_output():
+    """Returns (emit, flush) callables that coalesce printed lines into one write"""
+    buf = io.StringIO()
+    
+    def emit(line=""):
+        buf.write(line + "\n")
+    
+    def flush():
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+        buf.seek(0)
+        buf.truncate()
+    
+    return emit, flush
+
+def check_prerequisites(status: SystemStatus):
     """Checks prerequisites"""
-    print("🔍 Checking prerequisites...")
+    emit, flush = _buffered_output()
+    emit("🔍 Checking prerequisites...")
     
     issues = []
     
     # .env file check
-    env_file = Path(".env")
-    if not env_file.exists():
+    if not status.has_env:
         issues.append("❌ .env file not found")
-        print("💡 Creating .env file...")
+        emit("💡 Creating .env file...")
+        flush()
         create_env_template()
     else:
-        print("✅ .env file exists")
-    
-    # Detect correct Python executable
-    python_exec = get_correct_python_executable()
-    
-    # Dependencies check - use correct Python
-    try:
-        # Streamlit check
-        result = subprocess.run([python_exec, "-c", "import streamlit"], 
-                              capture_output=True, text=True)
-        if result.returncode == 0:
-            print("✅ Streamlit installed")
-        else:
-            issues.append("❌ Streamlit not installed")
-    except Exception:
-        issues.append("❌ Streamlit check failed")
-    
-    try:
-        # LangChain check
-        result = subprocess.run([python_exec, "-c", "import langchain"], 
-                              capture_output=True, text=True)
-        if result.returncode == 0:
-            print("✅ LangChain installed")
-        else:
-            issues.append("❌ LangChain not installed")
-    except Exception:
-        issues.append("❌ LangChain check failed")
+        emit("✅ .env file exists")
     
-    try:
-        # ChromaDB check
-        result = subprocess.run([python_exec, "-c", "import chromadb"], 
-                              capture_output=True, text=True)
-        if result.returncode == 0:
-            print("✅ ChromaDB installed")
-        else:
-            issues.append("❌ ChromaDB not installed")
-    except Exception:
-        issues.append("❌ ChromaDB check failed")
-    
-    try:
-        # OpenAI check
-        result = subprocess.run([python_exec, "-c", "import openai"], 
-                              capture_output=True, text=True)
-        if result.returncode == 0:
-            print("✅ OpenAI installed")
+    # Dependencies check - probed with the correct Python
+    for display_name, _ in CORE_DEPS:
+        if status.deps.get(display_name):
+            emit(f"✅ {display_name} installed")
         else:
-            issues.append("❌ OpenAI not installed")
-    except Exception:
-        issues.append("❌ OpenAI check failed")
+            issues.append(f"❌ {display_name} not installed")
     
     # Database check
-    db_path = Path("data/db")
-    if db_path.exists() and any(db_path.iterdir()):
-        print("✅ Vector database exists")
+    if status.db_entries:
+        emit("✅ Vector database exists")
     else:
         issues.append("⚠️  Vector database empty or missing")
     
     # PDF files check
-    pdf_path = Path("data/raw")
-    if pdf_path.exists():
-        pdf_count = len(list(pdf_path.glob("*.pdf")))
-        if pdf_count > 0:
-            print(f"✅ {pdf_count} PDF files found")
+    if status.pdf_count is not None:
+        if status.pdf_count > 0:
+            emit(f"✅ {status.pdf_count} PDF files found")
         else:
             issues.append("⚠️  No PDF files found")
     else:
         issues.append("❌ data/raw directory not found")
     
+    flush()
     return issues
 
 def create_env_template():
@@ -154,7 +323,7 @@ MAX_SEARCH_RESULTS=8
 LOG_LEVEL=INFO
 """
     
-    with open(".env", "w", encoding="utf-8") as f:
+    with open(ENV_FILE, "w", encoding="utf-8") as f:
         f.write(env_template)
     
     print("📝 .env file created. Please add your API keys!")
@@ -172,27 +341,39 @@ def show_quick_start_menu():
     print("7. 🚪 Exit")
     print("=" * 50)
 
+def _exec_main(*args):
+    """Replaces the current process with main.py (no intermediate shell)"""
+    python_exec = get_correct_python_executable()
+    sys.stdout.flush()
+    os.execvp(python_exec, [python_exec, "main.py", *args])
+
 def handle_user_choice(choice: str):
     """Handles user choice"""
     if choice == '1':
         print("🌐 Starting Streamlit...")
-        os.system("python main.py --streamlit")
+        # Streamlit needs its own process; hand it over directly
+        launch_streamlit()
     
     elif choice == '2':
         print("💻 Starting Advanced CLI...")
-        os.system("python main.py --cli")
+        _exec_main("--cli")
     
     elif choice == '3':
         print("🔧 Starting Simple CLI...")
-        os.system("python main.py --simple")
+        _exec_main("--simple")
     
     elif choice == '4':
         print("📂 Starting PDF upload...")
-        os.system("python main.py --ingest")
+        # Imported lazily so start.py itself stays fast to load
+        import main as app_main
+        if app_main.check_environment():
+            app_main.run_ingestion()
     
     elif choice == '5':
         print("📊 Checking system status...")
-        os.system("python main.py --status")
+        import main as app_main
+        if app_main.check_environment():
+            app_main.show_status()
     
     elif choice == '6':
         show_help()
@@ -231,124 +412,92 @@ def show_help():
     print("   • Updates vector database")
     print("=" * 60)
 
-def run_diagnostic():
+def run_diagnostic(status: Optional[SystemStatus] = None):
     """Runs detailed system diagnostics"""
-    print("\n🔍 DETAILED SYSTEM DIAGNOSTICS")
-    print("=" * 60)
+    if status is None:
+        status = collect_status()
     
-    # Detect correct Python executable
-    python_exec = get_correct_python_executable()
+    emit, flush = _buffered_output()
+    emit("\n🔍 DETAILED SYSTEM DIAGNOSTICS")
+    emit("=" * 60)
     
     # Python information
-    print(f"🐍 Python: {sys.version}")
-    print(f"📁 Python executable: {python_exec}")
-    print(f"📂 Working directory: {os.getcwd()}")
-    
-    print("\n📦 INSTALLED PACKAGES:")
-    print("-" * 30)
+    emit(f"🐍 Python: {sys.version}")
+    emit(f"📁 Python executable: {status.python_exec}")
+    emit(f"📂 Working directory: {os.getcwd()}")
     
-    # Check critical packages
-    critical_packages = [
-        "streamlit", "langchain", "chromadb", "openai", 
-        "langchain-openai", "langchain-chroma", "python-dotenv"
-    ]
-    
-    for package in critical_packages:
-        try:
-            result = subprocess.run([python_exec, "-c", f"import {package}; print(f'{package}: INSTALLED')"], 
-                                  capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                print(f"✅ {package}")
-            else:
-                print(f"❌ {package}: {result.stderr.strip()}")
-        except Exception as e:
-            print(f"❌ {package}: {str(e)}")
+    emit("\n📦 INSTALLED PACKAGES:")
+    emit("-" * 30)
     
-    print("\n📁 CHECK PROJECT STRUCTURE:")
-    print("-" * 30)
+    for package, _ in DEPS:
+        if status.deps.get(package):
+            emit(f"✅ {package}")
+        else:
+            emit(f"❌ {package}: {status.dep_errors.get(package, '')}")
     
-    # Check critical directories
-    critical_dirs = [
-        "agents", "config", "graph", "ingestion", "interfaces", 
-        "memory", "chains", "utils", "data", "data/db", "data/raw"
-    ]
+    emit("\n📁 CHECK PROJECT STRUCTURE:")
+    emit("-" * 30)
     
-    for dir_name in critical_dirs:
-        if os.path.exists(dir_name):
-            if dir_name == "data/db":
-                files = os.listdir(dir_name) if os.path.isdir(dir_name) else []
-                print(f"✅ {dir_name}/ ({len(files)} files)")
-            elif dir_name == "data/raw":
-                pdf_files = [f for f in os.listdir(dir_name) if f.endswith('.pdf')] if os.path.isdir(dir_name) else []
-                print(f"✅ {dir_name}/ ({len(pdf_files)} PDFs)")
+    for dir_name, exists in status.critical_dirs.items():
+        if exists:
+            if dir_name == DB_DIR.as_posix():
+                emit(f"✅ {dir_name}/ ({status.db_entries or 0} files)")
+            elif dir_name == RAW_DIR.as_posix():
+                emit(f"✅ {dir_name}/ ({status.pdf_count or 0} PDFs)")
             else:
-                print(f"✅ {dir_name}/")
+                emit(f"✅ {dir_name}/")
         else:
-            print(f"❌ {dir_name}/ missing")
+            emit(f"❌ {dir_name}/ missing")
     
-    print("\n🔧 CRITICAL FILES:")
-    print("-" * 30)
+    emit("\n🔧 CRITICAL FILES:")
+    emit("-" * 30)
     
-    critical_files = [
-        ".env", "requirements.txt", "main.py", "start.py", 
-        "streamlit_app.py", "config/settings.py", "config/models.py"
-    ]
-    
-    for file_name in critical_files:
-        if os.path.exists(file_name):
-            size = os.path.getsize(file_name)
-            print(f"✅ {file_name} ({size} bytes)")
+    for file_name, size in status.critical_files.items():
+        if size is not None:
+            emit(f"✅ {file_name} ({size} bytes)")
         else:
-            print(f"❌ {file_name} missing")
+            emit(f"❌ {file_name} missing")
     
     # Environment variables check
-    print("\n🔐 ENVIRONMENT VARIABLES:")
-    print("-" * 30)
-    
-    if os.path.exists(".env"):
-        try:
-            with open(".env", "r") as f:
-                env_content = f.read()
-                if "OPENAI_API_KEY=your_openai_api_key_here" in env_content:
-                    print("⚠️  OpenAI API key not configured yet")
-                elif "OPENAI_API_KEY=" in env_content:
-                    print("✅ OpenAI API key appears to be configured")
-                else:
-                    print("❌ API key not found in .env file")
-        except Exception as e:
-            print(f"❌ .env file couldn't be read: {e}")
-    
-    print("\n💾 DATABASE STATUS:")
-    print("-" * 30)
-    
-    db_path = Path("data/db")
-    if db_path.exists():
-        try:
-            # Check ChromaDB files
-            chroma_file = db_path / "chroma.sqlite3"
-            if chroma_file.exists():
-                size_mb = chroma_file.stat().st_size / (1024*1024)
-                print(f"✅ ChromaDB: {size_mb:.1f}MB")
+    emit("\n🔐 ENVIRONMENT VARIABLES:")
+    emit("-" * 30)
+    
+    if status.env_key_state == "placeholder":
+        emit("⚠️  OpenAI API key not configured yet")
+    elif status.env_key_state == "set":
+        emit("✅ OpenAI API key appears to be configured")
+    elif status.env_key_state == "unset":
+        emit("❌ API key not found in .env file")
+    elif status.env_key_state == "unreadable":
+        emit("❌ .env file couldn't be read")
+    
+    emit("\n💾 DATABASE STATUS:")
+    emit("-" * 30)
+    
+    if status.db_entries is not None:
+        if status.db_error:
+            emit(f"❌ Database check failed: {status.db_error}")
+        else:
+            if status.db_size_mb is not None:
+                emit(f"✅ ChromaDB: {status.db_size_mb:.1f}MB")
             else:
-                print("❌ ChromaDB file not found")
-            
-            # Count collection directories
-            collections = [d for d in db_path.iterdir() if d.is_dir()]
-            print(f"📁 Collection count: {len(collections)}")
-            
-        except Exception as e:
-            print(f"❌ Database check failed: {e}")
+                emit("❌ ChromaDB file not found")
+            emit(f"📁 Collection count: {status.collections}")
     else:
-        print("❌ Database directory not found")
+        emit("❌ Database directory not found")
     
-    print("=" * 60)
+    emit("=" * 60)
+    flush()
+
 
 def launch_streamlit():
     """Starts the Streamlit application"""
     print("\n🌐 Starting Streamlit application...")
+    sys.stdout.flush()
     try:
-        os.system(f"{sys.executable} -m streamlit run streamlit_app.py")
-    except Exception as e:
+        # execvp only returns on failure
+        os.execvp(sys.executable, [sys.executable, "-m", "streamlit", "run", "streamlit_app.py"])
+    except OSError as e:
         print(f"❌ Streamlit could not be started: {e}")
 
 def launch_flask_app():
@@ -356,30 +505,24 @@ def launch_flask_app():
     print("\n🌐 Starting Flask web application...")
     print("📍 Address: http://localhost:3000")
     print("🎨 Loading modern web interface...")
+    sys.stdout.flush()
+    
+    # Replace this process with the Flask app; execvp only returns on failure
     try:
-        # Go to interfaces directory and run web_app.py
-        os.chdir("interfaces")
-        import subprocess
-        subprocess.run([sys.executable, "web_app.py"])
-    except Exception as e:
+        os.chdir(os.path.join(project_root, "interfaces"))
+        os.execvp(sys.executable, [sys.executable, "web_app.py"])
+    except OSError as e:
         print(f"❌ Flask application could not be started: {e}")
-        print("💡 Trying alternative solution...")
-        try:
-            os.system(f"{sys.executable} web_app.py")
-        except Exception as e2:
-            print(f"❌ Alternative solution also failed: {e2}")
-        finally:
-            # Return to main directory
-            os.chdir("..")
-
-def show_system_status():
+        sys.exit(1)
+
+def show_system_status(status: Optional[SystemStatus] = None):
     """Shows system status"""
+    if status is None:
+        status = collect_status()
+    
     print("\n📊 SYSTEM STATUS")
     print("=" * 30)
     
-    # Detect correct Python executable
-    python_exec = get_correct_python_executable()
-    
     # Quick checks
     print("🔧 Basic Checks:")
     
@@ -387,42 +530,67 @@ def show_system_status():
     print(f"🐍 Python: {sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}")
     
     # Dependencies
-    deps_ok = True
-    for dep in ["streamlit", "langchain", "chromadb", "openai"]:
-        try:
-            result = subprocess.run([python_exec, "-c", f"import {dep}"], 
-                                  capture_output=True, text=True, timeout=3)
-            if result.returncode == 0:
-                print(f"✅ {dep}")
-            else:
-                print(f"❌ {dep}")
-                deps_ok = False
-        except:
-            print(f"❌ {dep}")
-            deps_ok = False
+    for dep, _ in CORE_DEPS:
+        print(f"{'✅' if status.deps.get(dep) else '❌'} {dep}")
     
     # Database
-    if Path("data/db").exists() and any(Path("data/db").iterdir()):
+    if status.db_entries:
         print("✅ Database")
     else:
         print("❌ Database")
     
     # PDFs
-    pdf_count = len(list(Path("data/raw").glob("*.pdf"))) if Path("data/raw").exists() else 0
+    pdf_count = status.pdf_count or 0
     print(f"📄 PDF Files: {pdf_count}")
     
     # Overall status
-    if deps_ok and Path("data/db").exists() and pdf_count > 0:
+    if status.core_deps_ok and status.db_entries is not None and pdf_count > 0:
         print("\n🎉 System ready! All components working.")
     else:
         print("\n⚠️  Some issues detected. Use option '4' for detailed analysis.")
 
+def _ready_fingerprint():
+    """Fingerprint of what a clean prerequisite check depends on"""
+    import hashlib
+    try:
+        requirements_mtime = os.stat("requirements.txt").st_mtime_ns
+    except OSError:
+        requirements_mtime = 0
+    key = repr((sorted(DEPS), sys.version, sys.executable, os.getcwd(), requirements_mtime))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+def _is_marked_ready():
+    """Whether a previous clean run left a matching ready marker"""
+    try:
+        return READY_MARKER.read_text(encoding="utf-8").strip() == _ready_fingerprint()
+    except OSError:
+        return False
+
+def _mark_ready():
+    """Records a clean prerequisite check so the next launch can skip it"""
+    try:
+        READY_MARKER.parent.mkdir(parents=True, exist_ok=True)
+        READY_MARKER.write_text(_ready_fingerprint(), encoding="utf-8")
+    except OSError:
+        pass
+
 def main():
     """Main function - Directly starts Flask web application"""
-    print_banner()
-    
-    # Check prerequisites
-    issues = check_prerequisites()
+    # Warm path: a previous clean check is still valid (requirements.txt unchanged)
+    if "--force" not in sys.argv[1:] and _is_marked_ready():
+        print_banner()
+        print("✅ System ready (cached check, use --force to re-check). Starting web application...")
+        launch_flask_app()
+        return
+    
+    # Collect the system snapshot in the background while the banner renders
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        status_future = executor.submit(collect_status)
+        print_banner()
+        status = status_future.result()
+    
+    issues = check_prerequisites(status)
     
     if issues:
         print("\n⚠️  Detected issues:")
@@ -434,6 +602,8 @@ def main():
             print("\n❌ Critical errors exist. Please resolve issues and try again.")
             print("💡 For help: python install.sh")
             return
+    else:
+        _mark_ready()
     
     print(f"\n✅ System ready! Starting web application...")
     
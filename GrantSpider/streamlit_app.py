@@ -4,28 +4,41 @@ Streamlit Web Arayüzü - AMIF Grant Assistant
 """
 
 import streamlit as st
+import html
 import os
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 
 # Proje kök dizinini Python path'ine ekle
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
-from ingestion.vector_store import get_vector_store, get_collection_info, search_documents
+from ingestion.vector_store import (
+    get_vector_store, get_collection_info, search_documents,
+    search_documents_by_vector, search_documents_batch
+)
 from agents.qa_agent import QAAgent
+from config.settings import settings
+from utils.helpers import configure_logging, truncate_text
+from utils.redis_cache import get_cached_documents, set_cached_documents, get_index_version
+from utils.semantic_cache import SemanticCache
 
-# Sayfa konfigürasyonu
-st.set_page_config(
-    page_title="AMIF Grant Assistant",
-    page_icon="🚀",
-    layout="wide",
-    initial_sidebar_state="expanded"
+# Sidebar'daki örnek sorular (arka planda önceden aranır)
+EXAMPLE_QUESTIONS = (
+    "AMIF hibesi nedir?",
+    "What are the eligibility criteria?",
+    "Personel maliyetleri nasıl hesaplanır?",
+    "How to calculate daily rates?",
+    "Proje süresi ne kadar olabilir?",
+    "What is the maximum grant amount?",
+    "Başvuru süreci nasıl işler?",
+    "Required documentation for application?"
 )
 
-# CSS stilleri
-st.markdown("""
+# Statik arayüz parçaları: her rerun'da yeniden oluşturulmaz
+_CSS = """
 <style>
     .main-header {
         background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
@@ -56,6 +69,13 @@ st.markdown("""
         border-left: 4px solid #10b981;
         margin: 1rem 0;
     }
+    .metric-row {
+        display: flex;
+        gap: 0.75rem;
+    }
+    .metric-row .metric-card {
+        flex: 1;
+    }
     .metric-card {
         background-color: white;
         padding: 1rem;
@@ -64,21 +84,120 @@ st.markdown("""
         text-align: center;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+_HEADER_HTML = """
+<div class="main-header">
+    <h1>🚀 AMIF Grant Assistant</h1>
+    <p>Akıllı Hibe Danışman Sistemi</p>
+</div>
+"""
+
+# CSS ve başlık tek bir st.html mesajında gönderilir
+_PAGE_CHROME_HTML = _CSS + _HEADER_HTML
+
+_METRIC_CARDS_TEMPLATE = """
+<div class="metric-row">
+    <div class="metric-card">
+        <h3>{total_documents:,}</h3>
+        <p>Toplam Belge</p>
+    </div>
+    <div class="metric-card">
+        <h3>8</h3>
+        <p>Kaynak Sayısı</p>
+    </div>
+</div>
+"""
+
+_SOURCE_TEMPLATE = """
+<div class="source-box">
+    <strong>[{i}]</strong> {filename}<br>
+    <small>📄 Sayfa: {page_number}</small>
+</div>
+"""
+
+_FEATURES_MD = """
+- 🌍 **Çok dilli**: Türkçe ve İngilizce
+- 🎯 **Akıllı arama**: 8 kaynak ile detaylı yanıtlar
+- 📄 **Sayfa referansları**: Her kaynak için sayfa numarası
+- ⚡ **Hızlı yanıt**: ~2-3 saniye
+"""
+
+# Sayfa konfigürasyonu
+st.set_page_config(
+    page_title="AMIF Grant Assistant",
+    page_icon="🚀",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+@st.cache_resource
+def get_vs():
+    """Vector store'u bir kez oluşturur (tüm rerun ve oturumlar arasında paylaşılır)"""
+    return get_vector_store()
+
+@st.cache_resource
+def get_embedder():
+    """Vector store ile aynı embedding modelini döndürür"""
+    return get_vs().embeddings
+
+@st.cache_resource
+def get_qa_agent():
+    """QA Agent'ı bir kez oluşturur"""
+    return QAAgent()
+
+@st.cache_data
+def get_document_count() -> int:
+    """Collection'daki belge sayısını döndürür"""
+    info = get_collection_info()
+    return info.get("document_count", 0)
 
 @st.cache_resource
+def get_semantic_cache() -> SemanticCache:
+    """Semantik yanıt cache'ini oluşturur (tüm oturumlar arasında paylaşılır)"""
+    return SemanticCache(
+        embed_fn=get_embedder().embed_query,
+        threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+        redis_url=settings.REDIS_URL or None,
+        persist_dir=settings.SEMANTIC_CACHE_DIR,
+        version_fn=get_index_version
+    )
+
+@st.cache_resource
+def get_retrieval_pool() -> ThreadPoolExecutor:
+    """Belge aramalarını prompt hazırlığıyla örtüştüren havuz (rerun'lar arasında tek örnek)"""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="retrieval")
+
+def _prefetch_examples(questions) -> Dict[str, Any]:
+    """Örnek soruların embedding'lerini ve arama sonuçlarını toplu olarak hesaplar"""
+    embeddings = get_embedder().embed_documents(list(questions))
+    results = search_documents_batch(list(questions), k=8, embeddings=embeddings)
+    return {
+        question: {"embedding": embedding, "documents": documents}
+        for question, embedding, documents in zip(questions, embeddings, results)
+    }
+
+@st.cache_resource(max_entries=1)
+def get_example_prefetch(index_version: str) -> Future:
+    """Örnek soruları indeks sürümü başına bir kez arka planda önceden arar; ilk tıklama beklemez"""
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(_prefetch_examples, EXAMPLE_QUESTIONS)
+    executor.shutdown(wait=False)
+    return future
+
+def _get_prefetched(prefetch: Optional[Future], question: str) -> Optional[Dict[str, Any]]:
+    """Hazırsa bir örnek sorunun önceden hesaplanmış sonucunu döndürür"""
+    if prefetch is None or not prefetch.done() or prefetch.exception() is not None:
+        return None
+    return prefetch.result().get(question)
+
 def initialize_system():
-    """Sistemi başlatır ve cache'ler"""
+    """Sistem bileşenlerini cache'lenmiş fonksiyonlardan toplar"""
     try:
-        # Vector store'u başlat
-        vector_store = get_vector_store()
-        
-        # QA Agent'ı başlat
-        qa_agent = QAAgent()
-        
-        # Collection bilgilerini al
-        info = get_collection_info()
-        document_count = info.get("document_count", 0)
+        # Her bileşen kendi cache_resource girdisinde tutulur
+        vector_store = get_vs()
+        qa_agent = get_qa_agent()
+        document_count = get_document_count()
         
         return vector_store, qa_agent, document_count
     except Exception as e:
@@ -90,30 +209,80 @@ def format_sources(documents: List[Any]) -> str:
     if not documents:
         return "<p>Kaynak bulunamadı</p>"
     
-    sources_html = ""
-    for i, doc in enumerate(documents, 1):
-        metadata = doc.metadata if hasattr(doc, 'metadata') else {}
-        filename = metadata.get('filename', 'Bilinmeyen kaynak')
-        page_number = metadata.get('page_number', 'Bilinmeyen sayfa')
-        
-        # Dosya adını kısalt
-        if len(filename) > 60:
-            filename = filename[:57] + "..."
-        
-        sources_html += f"""
-        <div class="source-box">
-            <strong>[{i}]</strong> {filename}<br>
-            <small>📄 Sayfa: {page_number}</small>
-        </div>
-        """
+    # Dosya adı truncate_text ile kısaltılır; metadata HTML'e kaçışlanarak yazılır
+    return "".join(
+        _SOURCE_TEMPLATE.format(
+            i=i,
+            filename=html.escape(truncate_text(str(metadata.get('filename', 'Bilinmeyen kaynak')), 60)),
+            page_number=html.escape(str(metadata.get('page_number', 'Bilinmeyen sayfa')))
+        )
+        for i, doc in enumerate(documents, 1)
+        for metadata in (getattr(doc, 'metadata', None) or {},)
+    )
+
+def _retrieve(question: str, query_embedding, k: int) -> List[Any]:
+    """Redis hot cache'i (birebir tekrar eden sorular) ve ardından vector store'u sorgular"""
+    documents = get_cached_documents(question, k)
+    if documents is not None:
+        return documents
+    
+    if query_embedding is not None:
+        documents = search_documents_by_vector(query_embedding, k=k)
+    else:
+        documents = search_documents(question, k=k)
     
-    return sources_html
+    set_cached_documents(question, k, documents)
+    return documents
 
-def process_question(vector_store, qa_agent, question: str) -> Dict[str, Any]:
-    """Soruyu işler ve yanıt döndürür"""
+def _stream_answer(qa_agent, state: Dict[str, Any], result: Dict[str, Any],
+                   semantic_cache: Optional[SemanticCache], query_embedding) -> Iterator[str]:
+    """Yanıtı akıtır; tamamlanınca result["answer"]'ı doldurur ve semantik cache'e yazar"""
+    try:
+        yield from qa_agent.stream(state)
+    except Exception as e:
+        result["answer"] = f"Hata oluştu: {e}"
+        yield result["answer"]
+        return
+    
+    result["answer"] = state.get("qa_response", "Yanıt oluşturulamadı.")
+    if query_embedding is not None and "qa_response" in state:
+        semantic_cache.store(query_embedding, {k: v for k, v in result.items() if k != "answer_stream"})
+
+def process_question(vector_store, qa_agent, question: str, semantic_cache: SemanticCache = None,
+                     prefetch: Optional[Future] = None, stream: bool = False) -> Dict[str, Any]:
+    """
+    Soruyu işler ve yanıt döndürür
+    
+    stream=True ise LLM çağrısı yapılmadan döner; yanıt result["answer_stream"]
+    tüketildikçe üretilir ve result["answer"] akış bitince dolar.
+    """
     try:
-        # Vector store'dan arama yap
-        documents = search_documents(question, k=8)
+        prefetched = _get_prefetched(prefetch, question)
+        
+        # Semantik cache: benzer bir soru daha önce yanıtlandıysa arama ve LLM'i atla
+        query_embedding = None
+        if semantic_cache is not None:
+            try:
+                if prefetched is not None:
+                    query_embedding = semantic_cache.normalize(prefetched["embedding"])
+                else:
+                    query_embedding = semantic_cache.embed(question)
+                cached = semantic_cache.lookup(query_embedding)
+                if cached is not None:
+                    return cached
+            except Exception as e:
+                print(f"⚠️  Semantik cache kullanılamadı: {e}")
+                query_embedding = None
+        
+        # Vector store'dan arama yap (önceden aranmışsa veya embedding varsa tekrar hesaplanmaz).
+        # Arama arka planda sürerken prompt'un belgeden bağımsız kısmı hazırlanır.
+        if prefetched is not None:
+            documents_future = None
+        else:
+            documents_future = get_retrieval_pool().submit(_retrieve, question, query_embedding, 8)
+        
+        prepared_prompt = qa_agent.prepare_prefix(question)
+        documents = prefetched["documents"] if documents_future is None else documents_future.result()
         detected_language = "tr"  # Varsayılan Türkçe
         
         if not documents:
@@ -125,6 +294,8 @@ def process_question(vector_store, qa_agent, question: str) -> Dict[str, Any]:
             }
         
         # QA Agent ile yanıt oluştur
+        # Not: belgeler arama sırasıyla (deterministik) verilir; sırayı karıştırmak
+        # LLM sağlayıcısının prompt önek cache'ini (prefix cache) boşa çıkarır
         state = {
             "query": question,
             "retrieved_documents": [
@@ -133,19 +304,35 @@ def process_question(vector_store, qa_agent, question: str) -> Dict[str, Any]:
                     "metadata": doc.metadata
                 } for doc in documents
             ],
-            "detected_language": detected_language
+            "detected_language": detected_language,
+            "prepared_prompt": prepared_prompt
         }
         
+        if stream and hasattr(qa_agent, "stream"):
+            result = {
+                "answer": "",
+                "sources": documents,
+                "language": detected_language,
+                "document_count": len(documents)
+            }
+            result["answer_stream"] = _stream_answer(qa_agent, state, result, semantic_cache, query_embedding)
+            return result
+        
         # QA Agent'ı çalıştır
         result_state = qa_agent.execute(state)
         
-        return {
+        result = {
             "answer": result_state.get("qa_response", "Yanıt oluşturulamadı."),
             "sources": documents,
             "language": detected_language,
             "document_count": len(documents)
         }
         
+        if query_embedding is not None and "qa_response" in result_state:
+            semantic_cache.store(query_embedding, result)
+        
+        return result
+        
     except Exception as e:
         return {
             "answer": f"Hata oluştu: {e}",
@@ -157,13 +344,11 @@ def process_question(vector_store, qa_agent, question: str) -> Dict[str, Any]:
 def main():
     """Ana uygulama"""
     
-    # Başlık
-    st.markdown("""
-    <div class="main-header">
-        <h1>🚀 AMIF Grant Assistant</h1>
-        <p>Akıllı Hibe Danışman Sistemi</p>
-    </div>
-    """, unsafe_allow_html=True)
+    # CSS + başlık (her rerun'da yeniden gönderilmeli, aksi halde sayfadan kalkar)
+    st.html(_PAGE_CHROME_HTML)
+    
+    # workflows kayıtları için tek konsol handler'ı (tekrar çağrılarda etkisiz)
+    configure_logging()
     
     # Sistem başlatma
     vector_store, qa_agent, total_documents = initialize_system()
@@ -172,54 +357,28 @@ def main():
         st.error("❌ Sistem başlatılamadı. Lütfen sayfayı yenileyin.")
         return
     
+    semantic_cache = get_semantic_cache()
+    # Yeniden ingest sonrası eski arama sonuçları kullanılmasın diye sürüme bağlı
+    example_prefetch = get_example_prefetch(get_index_version())
+    
     # Sidebar
     with st.sidebar:
         st.header("📊 Sistem Durumu")
         
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown(f"""
-            <div class="metric-card">
-                <h3>{total_documents:,}</h3>
-                <p>Toplam Belge</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown(f"""
-            <div class="metric-card">
-                <h3>8</h3>
-                <p>Kaynak Sayısı</p>
-            </div>
-            """, unsafe_allow_html=True)
+        # İki metrik kartı tek bir markdown mesajında
+        st.html(_METRIC_CARDS_TEMPLATE.format(total_documents=total_documents))
         
         st.markdown("---")
         
         st.header("💡 Örnek Sorular")
         
-        example_questions = [
-            "AMIF hibesi nedir?",
-            "What are the eligibility criteria?",
-            "Personel maliyetleri nasıl hesaplanır?",
-            "How to calculate daily rates?",
-            "Proje süresi ne kadar olabilir?",
-            "What is the maximum grant amount?",
-            "Başvuru süreci nasıl işler?",
-            "Required documentation for application?"
-        ]
-        
-        for question in example_questions:
+        for question in EXAMPLE_QUESTIONS:
             if st.button(question, key=f"example_{question}", use_container_width=True):
                 st.session_state.example_question = question
         
         st.markdown("---")
         st.markdown("### 🔧 Özellikler")
-        st.markdown("""
-        - 🌍 **Çok dilli**: Türkçe ve İngilizce
-        - 🎯 **Akıllı arama**: 8 kaynak ile detaylı yanıtlar
-        - 📄 **Sayfa referansları**: Her kaynak için sayfa numarası
-        - ⚡ **Hızlı yanıt**: ~2-3 saniye
-        """)
+        st.markdown(_FEATURES_MD)
     
     # Ana içerik alanı
     col1, col2 = st.columns([2, 1])
@@ -255,17 +414,22 @@ def main():
         # Soru işleme
         if ask_button and question.strip():
             with st.spinner("🔍 Aranıyor ve yanıt hazırlanıyor..."):
-                result = process_question(vector_store, qa_agent, question.strip())
+                result = process_question(vector_store, qa_agent, question.strip(), semantic_cache,
+                                          example_prefetch, stream=True)
             
             # Soruyu göster
-            st.markdown(f"""
+            st.html(f"""
             <div class="question-box">
-                <strong>❓ Soru:</strong> {question}
+                <strong>❓ Soru:</strong> {html.escape(question)}
             </div>
-            """, unsafe_allow_html=True)
+            """)
+            
+            # Yanıtı göster: ilk token gelir gelmez akıtılır, kutu akış bitince çizilir
+            answer_placeholder = st.empty()
+            if "answer_stream" in result:
+                answer_placeholder.write_stream(result.pop("answer_stream"))
             
-            # Yanıtı göster
-            st.markdown(f"""
+            answer_placeholder.markdown(f"""
             <div class="answer-box">
                 <strong>💡 Yanıt:</strong><br><br>
                 {result['answer']}
@@ -282,7 +446,7 @@ def main():
                 st.markdown(f"**{result['document_count']} kaynak bulundu:**")
                 
                 sources_html = format_sources(result['sources'])
-                st.markdown(sources_html, unsafe_allow_html=True)
+                st.html(sources_html)
             else:
                 st.warning("📭 Bu soru için kaynak bulunamadı.")
     
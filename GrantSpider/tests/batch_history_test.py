@@ -0,0 +1,71 @@
+"""
+Batch geçmişinde sorgu sonuçları atılmış job'ların raporlara etkisi
+"""
+
+from workflows.batch_processor import BatchAnalysisResult, BatchProcessor, BatchStatus, QueryResult
+from workflows.report_generator import ReportGenerator
+
+QUERIES_PER_JOB = 4
+SOURCES_PER_QUERY = 2
+
+def _make_result(index: int) -> BatchAnalysisResult:
+    results = [
+        QueryResult(
+            query_id=f"q{index}_{i}",
+            query=f"AMIF grant question {i}",
+            status=BatchStatus.COMPLETED,
+            response="answer",
+            sources=[{"source": "a.pdf"}] * SOURCES_PER_QUERY,
+            processing_time=0.1,
+            word_count=3
+        )
+        for i in range(QUERIES_PER_JOB)
+    ]
+    return BatchAnalysisResult(
+        request_id=f"job{index}",
+        status=BatchStatus.COMPLETED,
+        total_queries=QUERIES_PER_JOB,
+        successful_queries=QUERIES_PER_JOB,
+        failed_queries=0,
+        results=results,
+        total_processing_time=1.0
+    )
+
+def _processor(tmp_path, job_count: int) -> BatchProcessor:
+    # use_processes=True: graph/vector store kurulmaz, süreç havuzu ilk submit'e kadar açılmaz
+    processor = BatchProcessor(output_dir=str(tmp_path / "batch"), use_processes=True)
+    for index in range(job_count):
+        processor._append_history(_make_result(index))
+    return processor
+
+def test_old_jobs_are_stripped_and_marked(tmp_path):
+    job_count = BatchProcessor.FULL_RESULTS_HISTORY + 30
+    processor = _processor(tmp_path, job_count)
+    try:
+        history = processor.get_job_history(limit=job_count)
+        stripped = [r for r in history if r.results_stripped]
+        
+        assert len(stripped) == 30
+        assert all(not r.results and r.total_queries == QUERIES_PER_JOB for r in stripped)
+        assert not any(r.results_stripped for r in processor.get_job_history(limit=BatchProcessor.FULL_RESULTS_HISTORY))
+    finally:
+        processor.close()
+
+def test_report_skips_stripped_jobs(tmp_path):
+    job_count = BatchProcessor.FULL_RESULTS_HISTORY + 30
+    processor = _processor(tmp_path, job_count)
+    try:
+        history = processor.get_job_history(limit=job_count)
+    finally:
+        processor.close()
+    
+    report = ReportGenerator(output_dir=str(tmp_path / "reports")).generate_comprehensive_analytics_report(
+        history, cache=False
+    )
+    query_section = next(s for s in report.sections if s["title"] == "Query Analysis")
+    
+    # Özet toplamları ve sorgu metrikleri aynı batch'lerden gelir
+    expected_queries = BatchProcessor.FULL_RESULTS_HISTORY * QUERIES_PER_JOB
+    assert report.summary["total_queries"] == expected_queries
+    assert query_section["metrics"]["total_queries"] == expected_queries
+    assert report.summary["average_sources_per_query"] == SOURCES_PER_QUERY
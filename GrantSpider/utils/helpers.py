@@ -2,19 +2,71 @@
 Helper functions
 """
 
+import atexit
+import logging
 import os
-import uuid
-from typing import List, Dict, Any, Optional
+import queue
+import re
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
+from functools import lru_cache
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+# Runs of unicode letters (no digits or underscores)
+_TOKEN_RE = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+# Stop words (Turkish and English)
+_STOP_WORDS = frozenset({
+    've', 'ile', 'bu', 'bir', 'için', 'den', 'dan', 'de', 'da',
+    'ki', 'olan', 'olarak', 'sonra', 'kadar', 'daha',
+    'çok', 'az', 'gibi', 'ancak', 'fakat', 'ama', 'veya', 'ya',
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been'
+})
+
+_log_listener: Optional[QueueListener] = None
+
+def configure_logging(level: int = logging.INFO) -> QueueListener:
+    """
+    Sends workflow logs to stdout through a single listener thread
+    
+    Called once by the application entry points (repeat calls are no-ops).
+    Worker threads only enqueue records, they never contend on the stdout lock.
+    
+    Args:
+        level: Level of the "workflows" logger
+        
+    Returns:
+        The running QueueListener
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return _log_listener
+    
+    log_queue = queue.SimpleQueue()
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(logging.Formatter("%(message)s"))
+    
+    workflows_logger = logging.getLogger("workflows")
+    workflows_logger.addHandler(QueueHandler(log_queue))
+    workflows_logger.setLevel(level)
+    
+    _log_listener = QueueListener(log_queue, console_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+    return _log_listener
 
 def generate_session_id() -> str:
     """
     Generates unique session ID
     
     Returns:
-        Session ID in UUID format
+        Session ID as 32 hex characters (128 random bits, same entropy as uuid4)
     """
-    return str(uuid.uuid4())
+    return os.urandom(16).hex()
 
 def format_timestamp(timestamp: datetime = None) -> str:
     """
@@ -42,10 +94,7 @@ def truncate_text(text: str, max_length: int = 100) -> str:
     Returns:
         Truncated text
     """
-    if len(text) <= max_length:
-        return text
-    
-    return text[:max_length-3] + "..."
+    return text if len(text) <= max_length else f"{text[:max_length-3]}..."
 
 def clean_filename(filename: str) -> str:
     """
@@ -84,8 +133,7 @@ def calculate_similarity_percentage(score: float) -> str:
     Returns:
         String in percentage format
     """
-    percentage = score * 100
-    return f"{percentage:.1f}%"
+    return f"{score * 100:.1f}%"
 
 def extract_file_extension(filename: str) -> str:
     """
@@ -109,17 +157,12 @@ def format_file_size(size_bytes: int) -> str:
     Returns:
         Formatted file size
     """
-    if size_bytes == 0:
+    if size_bytes <= 0:
         return "0 B"
     
-    size_names = ["B", "KB", "MB", "GB"]
-    i = 0
-    
-    while size_bytes >= 1024 and i < len(size_names)-1:
-        size_bytes /= 1024.0
-        i += 1
-    
-    return f"{size_bytes:.1f} {size_names[i]}"
+    # Unit index straight from the bit length (1024 = 2**10), no division loop
+    i = min(max(int(size_bytes).bit_length() - 1, 0), 40) // 10
+    return f"{size_bytes / (1 << (10 * i)):.1f} {_SIZE_UNITS[i]}"
 
 def validate_query(query: str) -> bool:
     """
@@ -139,7 +182,8 @@ def validate_query(query: str) -> bool:
     
     return True
 
-def extract_keywords(text: str, min_length: int = 3) -> List[str]:
+@lru_cache(maxsize=1024)
+def extract_keywords(text: str, min_length: int = 3) -> Tuple[str, ...]:
     """
     Extracts keywords from text
     
@@ -148,29 +192,10 @@ def extract_keywords(text: str, min_length: int = 3) -> List[str]:
         min_length: Minimum word length
         
     Returns:
-        List of keywords
-    """
-    # Simple keyword extraction
-    words = text.lower().split()
-    
-    # Stop words (Turkish and English)
-    stop_words = {
-        've', 'ile', 'bu', 'bir', 'için', 'den', 'dan', 'de', 'da',
-        'ki', 'olan', 'olarak', 'olan', 'sonra', 'kadar', 'daha',
-        'çok', 'az', 'gibi', 'ancak', 'fakat', 'ama', 'veya', 'ya',
-        'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-        'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been'
-    }
-    
-    keywords = []
-    for word in words:
-        # Clean
-        word = word.strip('.,!?;:"()[]{}')
-        
-        # Check conditions
-        if (len(word) >= min_length and 
-            word.lower() not in stop_words and 
-            word.isalpha()):
-            keywords.append(word.lower())
-    
-    return list(set(keywords))  # Unique words 
\ No newline at end of file
+        Tuple of unique keywords (hashable so results can be cached)
+    """
+    # Lowercase once, tokenize with one findall and drop stop words with a C-level
+    # set difference; only the (deduplicated) survivors are looked at in Python
+    words = set(_TOKEN_RE.findall(text.lower()))
+    words -= _STOP_WORDS
+    return tuple(word for word in words if len(word) >= min_length)
\ No newline at end of file
@@ -0,0 +1,40 @@
+"""
+Embedding quantization helpers
+Symmetric per-vector int8 quantization: v ≈ q * scale with q in [-127, 127]
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+def quantize_i8(v: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Quantizes a float vector to int8 with a per-vector scale
+    
+    Args:
+        v: Float vector
+        
+    Returns:
+        (int8 vector, scale) tuple
+    """
+    v = np.asarray(v, dtype=np.float32)
+    scale = float(np.abs(v).max()) / 127.0 if v.size else 0.0
+    if scale == 0.0:
+        return np.zeros(v.shape, dtype=np.int8), 1.0
+    return np.round(v / scale).astype(np.int8), scale
+
+def dequantize_i8(q: np.ndarray, scale) -> np.ndarray:
+    """
+    Restores approximate float32 values from int8 data
+    
+    Args:
+        q: int8 vector or matrix
+        scale: Scale (scalar, or one per row for matrices)
+        
+    Returns:
+        float32 array
+    """
+    scale = np.asarray(scale, dtype=np.float32)
+    if q.ndim == 2 and scale.ndim == 1:
+        scale = scale[:, np.newaxis]
+    return q.astype(np.float32) * scale
@@ -0,0 +1,202 @@
+"""
+Redis hot cache for exact-repeat retrieval queries
+Keys are versioned so a re-index invalidates every cached result at once
+
+Values are stored as JSON (never pickle): anyone able to write to Redis must not
+be able to run code in the app.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from langchain_core.documents import Document
+
+from config.settings import settings
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+try:
+    from prometheus_client import Counter
+    _HIT_COUNTER = Counter("cache_hit_total", "Retrieval hot-cache hits")
+    _MISS_COUNTER = Counter("cache_miss_total", "Retrieval hot-cache misses")
+except ImportError:
+    _HIT_COUNTER = _MISS_COUNTER = None
+
+RETRIEVAL_TTL_SECONDS = 300
+VERSION_KEY = b"rag:version"
+# Random token rewritten on every re-index; readable without Redis and across processes
+INDEX_VERSION_FILE = "index_version"
+
+# In-process counters (mirrored to Prometheus when prometheus_client is installed)
+cache_stats = {"cache_hit_total": 0, "cache_miss_total": 0}
+
+_client = None
+_client_lock = threading.Lock()
+_client_checked = False
+
+def get_redis_client():
+    """
+    Returns the shared Redis client
+    
+    Returns:
+        Redis client, or None when REDIS_URL is unset, redis is not installed or the server is unreachable
+    """
+    global _client, _client_checked
+    
+    if _client_checked:
+        return _client
+    
+    with _client_lock:
+        if not _client_checked:
+            if settings.REDIS_URL and redis is not None:
+                try:
+                    client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=False)
+                    client.ping()
+                    _client = client
+                except Exception as e:
+                    print(f"⚠️  Redis hot cache disabled: {e}")
+            _client_checked = True
+    
+    return _client
+
+# Marks a serialized Document inside a JSON value
+_DOCUMENT_TAG = "__document__"
+
+def _encode_default(obj: Any) -> Dict[str, Any]:
+    if isinstance(obj, Document):
+        return {_DOCUMENT_TAG: True, "page_content": obj.page_content, "metadata": obj.metadata}
+    raise TypeError(f"Not JSON serializable: {type(obj).__name__}")
+
+def _decode_hook(obj: Dict[str, Any]) -> Any:
+    if obj.get(_DOCUMENT_TAG) is True:
+        return Document(page_content=obj["page_content"], metadata=obj["metadata"])
+    return obj
+
+def dumps_value(value: Any) -> bytes:
+    """
+    Serializes a cache value to JSON bytes (Documents are stored as content + metadata)
+    
+    Args:
+        value: JSON-compatible value, may contain Documents
+        
+    Returns:
+        UTF-8 encoded JSON
+    """
+    return json.dumps(value, default=_encode_default, ensure_ascii=False).encode("utf-8")
+
+def loads_value(raw: bytes) -> Any:
+    """
+    Parses a value written by dumps_value
+    
+    Args:
+        raw: UTF-8 encoded JSON
+        
+    Returns:
+        Decoded value with Documents rebuilt
+    """
+    return json.loads(raw, object_hook=_decode_hook)
+
+def _retrieval_key(client, query: str, k: int) -> bytes:
+    """Versioned cache key of a normalized query"""
+    version = client.get(VERSION_KEY) or b"0"
+    digest = hashlib.sha1(f"{k}:{query.strip().lower()}".encode("utf-8")).hexdigest()
+    return b"rag:v" + version + b":" + digest.encode("ascii")
+
+def _count(hit: bool):
+    """Update hit/miss counters"""
+    name = "cache_hit_total" if hit else "cache_miss_total"
+    cache_stats[name] += 1
+    counter = _HIT_COUNTER if hit else _MISS_COUNTER
+    if counter is not None:
+        counter.inc()
+
+def get_cached_documents(query: str, k: int) -> Optional[List[Any]]:
+    """
+    Looks up retrieval results of an exact (normalized) repeat query
+    
+    Args:
+        query: Search query
+        k: Number of results the query was made with
+        
+    Returns:
+        Cached documents, or None on a miss or when Redis is unavailable
+    """
+    client = get_redis_client()
+    if client is None:
+        return None
+    
+    try:
+        raw = client.get(_retrieval_key(client, query, k))
+    except Exception as e:
+        print(f"⚠️  Redis read failed: {e}")
+        return None
+    
+    documents = None
+    if raw is not None:
+        try:
+            documents = loads_value(raw)
+        except ValueError as e:
+            print(f"⚠️  Redis value could not be decoded: {e}")
+    
+    _count(documents is not None)
+    return documents
+
+def set_cached_documents(query: str, k: int, documents: List[Any]):
+    """
+    Stores retrieval results for exact repeats
+    
+    Args:
+        query: Search query
+        k: Number of results the query was made with
+        documents: Retrieved documents
+    """
+    client = get_redis_client()
+    if client is None or not documents:
+        return
+    
+    try:
+        client.setex(_retrieval_key(client, query, k), RETRIEVAL_TTL_SECONDS, dumps_value(documents))
+    except Exception as e:
+        print(f"⚠️  Redis write failed: {e}")
+
+def _index_version_path() -> Path:
+    return Path(settings.VECTOR_DB_PATH) / INDEX_VERSION_FILE
+
+def get_index_version() -> str:
+    """
+    Returns the current index version token
+    
+    Returns:
+        Token written by the last bump_index_version, "0" if the index was never bumped
+    """
+    try:
+        return _index_version_path().read_text(encoding="ascii").strip() or "0"
+    except OSError:
+        return "0"
+
+def bump_index_version():
+    """Invalidates all cached retrieval results and semantic answers (call after re-indexing)"""
+    path = _index_version_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(os.urandom(8).hex(), encoding="ascii")
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️  Index version update failed: {e}")
+    
+    client = get_redis_client()
+    if client is None:
+        return
+    
+    try:
+        client.incr(VERSION_KEY)
+    except Exception as e:
+        print(f"⚠️  Redis version bump failed: {e}")
@@ -0,0 +1,355 @@
+"""
+Semantic answer cache for the QA pipeline
+Reuses answers of previously asked questions whose embeddings are near-identical
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from utils.quantize import quantize_i8, dequantize_i8
+from utils.redis_cache import dumps_value, loads_value
+from utils.similarity import cosine_scores, cosine_scores_i8
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+class SemanticCache:
+    """
+    In-process LRU cache of QA results keyed by normalized query embeddings
+    
+    Embeddings are stored int8-quantized (4x less memory than float32). Scores
+    close to the threshold are re-checked against the float32 query so the
+    quantization error cannot flip a hit/miss decision.
+    
+    Entries are tied to the vector index version: answers cached before a
+    re-ingestion are dropped in memory, on disk and in Redis (by key prefix).
+    """
+    
+    REDIS_PREFIX = "sem:"
+    MATRIX_FILE = "semantic_cache.npy"
+    META_FILE = "semantic_cache_meta.pkl"
+    # Rows are padded to a multiple of 64 bytes so each starts on a cache line
+    ROW_ALIGN = 64
+    # Half-width of the band around the threshold that gets the float32 re-check
+    PROMOTION_MARGIN = 0.02
+    
+    def __init__(self, embed_fn: Callable[[str], List[float]], threshold: float = 0.95,
+                 max_entries: int = 1024, redis_url: Optional[str] = None, ttl_seconds: int = 900,
+                 persist_dir: Optional[str] = None, flush_every: int = 16,
+                 version_fn: Optional[Callable[[], str]] = None):
+        """
+        Initialize semantic cache
+        
+        Args:
+            embed_fn: Function returning the embedding of a text (same model as the vector store)
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Maximum number of cached answers, least recently used are evicted
+            redis_url: Optional Redis URL to share entries across processes
+            ttl_seconds: Expiry of entries persisted to Redis
+            persist_dir: Optional directory holding a memory-mapped copy of the cache
+            flush_every: Number of inserts between metadata flushes to persist_dir
+            version_fn: Optional function returning the current index version; entries
+                cached under another version are discarded
+        """
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version_fn = version_fn
+        self.index_version = version_fn() if version_fn is not None else "0"
+        
+        # Rows [0, size) of the matrix are valid, scales/entries/last_used are parallel to them.
+        # Only the first `dim` columns hold data, the rest is zero padding.
+        self.matrix: Optional[np.ndarray] = None
+        self.dim = 0
+        self.scales = np.ones(max_entries, dtype=np.float32)
+        self.entries: List[Dict[str, Any]] = []
+        self.last_used = np.zeros(max_entries, dtype=np.int64)
+        self.size = 0
+        self._tick = 0
+        
+        self.stats = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+        
+        self.persist_dir = persist_dir
+        self.flush_every = flush_every
+        self._unflushed = 0
+        if persist_dir:
+            os.makedirs(persist_dir, exist_ok=True)
+            self._load_from_disk()
+        
+        self._redis = None
+        if redis_url and redis is not None:
+            try:
+                self._redis = redis.Redis.from_url(redis_url, decode_responses=False)
+                self._load_from_redis()
+            except Exception as e:
+                print(f"⚠️  Semantic cache Redis disabled: {e}")
+                self._redis = None
+    
+    def embed(self, text: str) -> np.ndarray:
+        """
+        Embed and L2-normalize a text
+        
+        Args:
+            text: Text to embed
+        
+        Returns:
+            Normalized float32 embedding
+        """
+        return self.normalize(self.embed_fn(text))
+    
+    @staticmethod
+    def normalize(embedding) -> np.ndarray:
+        """
+        L2-normalize an embedding computed elsewhere
+        
+        Args:
+            embedding: Raw embedding
+            
+        Returns:
+            Normalized float32 embedding
+        """
+        vector = np.array(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+    
+    def lookup(self, embedding: np.ndarray) -> Optional[Dict[str, Any]]:
+        """
+        Find a cached result for a normalized query embedding
+        
+        Args:
+            embedding: Normalized query embedding
+        
+        Returns:
+            Cached result if a similar enough question was seen, else None
+        """
+        with self._lock:
+            self._check_version()
+            # Empty, or built with another embedding model: nothing comparable
+            if self.size == 0 or embedding.shape[0] != self.dim:
+                self.stats["misses"] += 1
+                return None
+            
+            query_i8 = self._padded(quantize_i8(embedding)[0])
+            scores = cosine_scores_i8(query_i8, self.matrix[:self.size])
+            best = int(np.argmax(scores))
+            score = float(scores[best])
+            
+            # Borderline: re-score the float32 query against the dequantized row
+            if abs(score - self.threshold) < self.PROMOTION_MARGIN:
+                row = dequantize_i8(self.matrix[best, :self.dim], self.scales[best])
+                score = float(cosine_scores(embedding, row[np.newaxis, :])[0])
+            
+            if score < self.threshold:
+                self.stats["misses"] += 1
+                return None
+            
+            self._tick += 1
+            self.last_used[best] = self._tick
+            self.stats["hits"] += 1
+            return self.entries[best]["result"]
+    
+    def store(self, embedding: np.ndarray, result: Dict[str, Any]):
+        """
+        Cache a result for a normalized query embedding
+        
+        Args:
+            embedding: Normalized query embedding
+            result: Result to reuse for similar questions
+        """
+        entry = {"result": result, "ts": time.time()}
+        
+        with self._lock:
+            self._check_version()
+            prefix = self._redis_prefix()
+            self._insert(embedding, entry)
+            self._unflushed += 1
+            if self.persist_dir and self._unflushed >= self.flush_every:
+                self._flush()
+        
+        if self._redis is not None:
+            try:
+                key = prefix + hashlib.sha1(embedding.tobytes()).hexdigest()
+                value = {"embedding": embedding.tolist(), "entry": entry}
+                self._redis.setex(key, self.ttl_seconds, dumps_value(value))
+            except Exception as e:
+                print(f"⚠️  Semantic cache Redis write failed: {e}")
+    
+    def _insert(self, embedding: np.ndarray, entry: Dict[str, Any]):
+        """Insert a row, evicting the least recently used one when full"""
+        if self.matrix is not None and embedding.shape[0] != self.dim:
+            # Embedding model changed: old rows cannot be compared with the new ones
+            self._reset()
+            self.matrix = None
+        if self.matrix is None:
+            self._allocate(embedding.shape[0])
+        
+        if self.size < self.max_entries:
+            row = self.size
+            self.size += 1
+            self.entries.append(entry)
+        else:
+            row = int(np.argmin(self.last_used))
+            self.entries[row] = entry
+        
+        quantized, self.scales[row] = quantize_i8(embedding)
+        self.matrix[row] = self._padded(quantized)
+        self._tick += 1
+        self.last_used[row] = self._tick
+    
+    def _padded(self, quantized: np.ndarray) -> np.ndarray:
+        """Zero-pad a quantized vector to the aligned row width"""
+        width = self.matrix.shape[1]
+        if quantized.shape[0] == width:
+            return quantized
+        padded = np.zeros(width, dtype=np.int8)
+        padded[:quantized.shape[0]] = quantized
+        return padded
+    
+    def _row_width(self, dim: int) -> int:
+        """Row width in bytes of a dim-wide vector after cache-line padding"""
+        return -(-dim // self.ROW_ALIGN) * self.ROW_ALIGN
+    
+    def _allocate(self, dim: int):
+        """Create the row matrix, file-backed when persist_dir is set"""
+        self.dim = dim
+        shape = (self.max_entries, self._row_width(dim))
+        
+        if self.persist_dir:
+            path = os.path.join(self.persist_dir, self.MATRIX_FILE)
+            self.matrix = np.lib.format.open_memmap(path, mode="w+", dtype=np.int8, shape=shape)
+        else:
+            self.matrix = np.zeros(shape, dtype=np.int8)
+    
+    def _load_from_disk(self):
+        """Map a previously persisted cache; pages are read lazily by the kernel"""
+        matrix_path = os.path.join(self.persist_dir, self.MATRIX_FILE)
+        meta_path = os.path.join(self.persist_dir, self.META_FILE)
+        if not (os.path.exists(matrix_path) and os.path.exists(meta_path)):
+            return
+        
+        try:
+            with open(meta_path, "rb") as f:
+                meta = pickle.load(f)
+            if meta.get("index_version", "0") != self.index_version:
+                print("⚠️  Persisted semantic cache belongs to an older index, ignoring it")
+                return
+            
+            dim, size = meta["dim"], meta["size"]
+            matrix = np.load(matrix_path, mmap_mode="r+")
+            layout_ok = (
+                isinstance(dim, int) and dim > 0
+                and 0 <= size <= self.max_entries
+                and len(meta["entries"]) == size
+                and matrix.dtype == np.int8
+                and matrix.shape == (self.max_entries, self._row_width(dim))
+            )
+            if not layout_ok:
+                print("⚠️  Persisted semantic cache has a different layout, ignoring it")
+                return
+            
+            self.matrix = matrix
+            self.dim = dim
+            self.size = size
+            self.entries = meta["entries"]
+            self.scales[:self.size] = meta["scales"]
+            self.last_used[:self.size] = meta["last_used"]
+            self._tick = int(self.last_used.max()) if self.size else 0
+        except Exception as e:
+            print(f"⚠️  Persisted semantic cache could not be loaded: {e}")
+    
+    def _flush(self):
+        """Write pending rows and metadata to persist_dir (caller holds the lock)"""
+        if self.matrix is None:
+            return
+        
+        if isinstance(self.matrix, np.memmap):
+            self.matrix.flush()
+        
+        meta = {
+            "index_version": self.index_version,
+            "dim": self.dim,
+            "size": self.size,
+            "entries": self.entries,
+            "scales": self.scales[:self.size].copy(),
+            "last_used": self.last_used[:self.size].copy(),
+        }
+        meta_path = os.path.join(self.persist_dir, self.META_FILE)
+        tmp_path = meta_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, meta_path)
+        self._unflushed = 0
+    
+    def flush(self):
+        """Persist the cache to persist_dir now"""
+        if not self.persist_dir:
+            return
+        with self._lock:
+            self._flush()
+    
+    def _load_from_redis(self):
+        """Warm the in-process cache with entries persisted by other processes"""
+        for key in self._redis.scan_iter(match=self._redis_prefix() + "*", count=256):
+            raw = self._redis.get(key)
+            if raw is None:
+                continue
+            try:
+                value = loads_value(raw)
+                embedding = np.asarray(value["embedding"], dtype=np.float32)
+                entry = value["entry"]
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"⚠️  Skipping undecodable semantic cache entry: {e}")
+                continue
+            self._insert(embedding, entry)
+    
+    def _redis_prefix(self) -> str:
+        """Redis key prefix of the current index version"""
+        return f"{self.REDIS_PREFIX}{self.index_version}:"
+    
+    def _check_version(self):
+        """Drop every entry if the index was rebuilt since they were cached (caller holds the lock)"""
+        if self.version_fn is None:
+            return
+        version = self.version_fn()
+        if version != self.index_version:
+            self.index_version = version
+            self._reset()
+    
+    def _reset(self):
+        """Empty the cache and persist the empty state (caller holds the lock)"""
+        self.entries = []
+        self.size = 0
+        self.last_used[:] = 0
+        self.scales[:] = 1.0
+        self._tick = 0
+        
+        if self.persist_dir:
+            if self.matrix is not None:
+                self._flush()
+            else:
+                meta_path = os.path.join(self.persist_dir, self.META_FILE)
+                if os.path.exists(meta_path):
+                    os.remove(meta_path)
+        self._unflushed = 0
+    
+    def clear(self):
+        """Drop all entries, including the copy in persist_dir"""
+        with self._lock:
+            self._reset()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            return {**self.stats, "size": self.size, "max_entries": self.max_entries}
@@ -0,0 +1,60 @@
+"""
+Vector similarity kernels
+Uses SimSIMD's SIMD cosine kernels when available, NumPy otherwise
+"""
+
+import numpy as np
+
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+def cosine_scores(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity of one query against every row of a matrix
+    
+    Args:
+        query: Query vector, shape [D]
+        matrix: Candidate vectors, shape [N, D]
+    
+    Returns:
+        Similarity scores, shape [N]
+    """
+    # SimSIMD requires C-contiguous buffers
+    query = np.ascontiguousarray(query, dtype=np.float32)
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    
+    if simsimd is not None:
+        # cdist returns cosine distances (1 - similarity)
+        distances = np.asarray(simsimd.cdist(query[np.newaxis, :], matrix, metric="cosine"))
+        return 1.0 - distances.reshape(-1)
+    
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    norms[norms == 0] = 1.0
+    return (matrix @ query) / norms
+
+def cosine_scores_i8(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity between int8-quantized vectors (per-vector scales cancel out)
+    
+    Args:
+        query: int8 query vector, shape [D]
+        matrix: int8 candidate vectors, shape [N, D]
+        
+    Returns:
+        Similarity scores, shape [N]
+    """
+    query = np.ascontiguousarray(query, dtype=np.int8)
+    matrix = np.ascontiguousarray(matrix, dtype=np.int8)
+    
+    if simsimd is not None:
+        distances = np.asarray(simsimd.cdist(query[np.newaxis, :], matrix, metric="cosine"))
+        return 1.0 - distances.reshape(-1)
+    
+    # Accumulate in int32 to avoid int8 overflow
+    query32 = query.astype(np.int32)
+    matrix32 = matrix.astype(np.int32)
+    norms = np.sqrt((matrix32 * matrix32).sum(axis=1) * float(query32 @ query32))
+    norms[norms == 0] = 1.0
+    return (matrix32 @ query32) / norms
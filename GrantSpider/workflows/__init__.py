@@ -8,6 +8,8 @@ This module manages GrantSpider's operational workflows:
 - Export/Import Functionality: Export/import functionality
 """
 
+from __future__ import annotations
+
 from .bulk_processor import (
     BulkDocumentProcessor,
     ProcessingJob,
@@ -19,10 +21,10 @@ from .bulk_processor import (
 __version__ = "1.0.0"
 __author__ = "GrantSpider Analytics Team"
 
-__all__ = [
+__all__ = (
     "BulkDocumentProcessor",
-    "ProcessingJob", 
+    "ProcessingJob",
     "ProcessingResult",
     "ProcessingStatus",
-    "ProcessingConfig"
-] 
\ No newline at end of file
+    "ProcessingConfig",
+) 
\ No newline at end of file
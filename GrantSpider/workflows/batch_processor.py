@@ -4,9 +4,18 @@ Toplu belge analizi, paralel sorgu işleme ve raporlama sistemi
 """
 
 import asyncio
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Any, Optional, Tuple, Union
-from dataclasses import dataclass, field, asdict
+import heapq
+import logging
+import os
+import sys
+from collections import Counter, deque
+from itertools import islice
+from operator import attrgetter
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Callable, List, Dict, Any, Mapping, Optional, Tuple, Union
+from dataclasses import dataclass, field, fields, replace
 from datetime import datetime, timedelta
 import json
 import uuid
@@ -14,11 +23,39 @@ from pathlib import Path
 import time
 from enum import Enum
 
+import numpy as np
+
 from graph.multi_agent_graph import MultiAgentGraph
 from memory.conversation_memory import EnhancedConversationMemory
 from utils.performance_monitor import performance_tracker
 from ingestion.vector_store import get_vector_store
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Kayıtlar normal şekilde yayılır; konsol çıktısı utils.helpers.configure_logging ile kurulur
+logger = logging.getLogger(__name__)
+
+# Python 3.10+ üzerinde çok sayıda oluşturulan sonuç nesneleri __dict__ yerine slot kullanır
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+def _field_encoder(cls) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Dataclass için sığ dict dönüştürücü üretir
+    
+    Alan adları sınıf tanımında bir kez okunur; asdict'in her çağrıda yaptığı
+    fields() yansıması ve iç içe derin kopya yapılmaz.
+    """
+    names = tuple(f.name for f in fields(cls))
+    getter = attrgetter(*names)
+    
+    def encode(obj) -> Dict[str, Any]:
+        return dict(zip(names, getter(obj)))
+    
+    return encode
+
 class BatchStatus(Enum):
     """Batch işlem durumları"""
     PENDING = "pending"
@@ -36,6 +73,12 @@ class BatchQuery:
     priority: int = 1  # 1=high, 2=medium, 3=low
     metadata: Dict[str, Any] = field(default_factory=dict)
     expected_grant_types: List[str] = field(default_factory=list)
+    # Özet istatistikler için bir kez hesaplanır (0 ise __post_init__ doldurur)
+    word_count: int = 0
+    
+    def __post_init__(self):
+        if not self.word_count:
+            self.word_count = len(self.query.split())
 
 @dataclass
 class BatchAnalysisRequest:
@@ -57,7 +100,7 @@ class BatchAnalysisRequest:
             "id": self.id,
             "name": self.name,
             "description": self.description,
-            "queries": [asdict(q) for q in self.queries],
+            "queries": [_encode_batch_query(q) for q in self.queries],
             "settings": self.settings,
             "created_at": self.created_at.isoformat(),
             "max_workers": self.max_workers,
@@ -66,7 +109,7 @@ class BatchAnalysisRequest:
             "output_format": self.output_format
         }
 
-@dataclass
+@dataclass(**_SLOTS)
 class QueryResult:
     """Sorgu sonucu"""
     query_id: str
@@ -76,9 +119,23 @@ class QueryResult:
     sources: List[Dict[str, Any]] = field(default_factory=list)
     processing_time: float = 0.0
     error_message: str = ""
-    metadata: Dict[str, Any] = field(default_factory=dict)
     cross_document_analysis: Dict[str, Any] = field(default_factory=dict)
-    timestamp: datetime = field(default_factory=datetime.now)
+    # Her sonuçta bulunan alanlar ayrı slot'larda; metadata yalnızca ek/dinamik bilgiler için
+    detected_language: str = "unknown"
+    retrieval_performed: bool = False
+    cross_document_performed: bool = False
+    document_count: int = 0
+    query_priority: int = 0
+    expected_grant_types: List[str] = field(default_factory=list)
+    word_count: int = 0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    # datetime yerine epoch nanosaniye: oluşturma ucuz, gerektiğinde timestamp ile datetime'a çevrilir
+    timestamp_ns: int = field(default_factory=time.time_ns)
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Sonuç zamanı (yerel saat)"""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
 
 @dataclass
 class BatchAnalysisResult:
@@ -94,6 +151,8 @@ class BatchAnalysisResult:
     total_processing_time: float = 0.0
     summary_stats: Dict[str, Any] = field(default_factory=dict)
     report_path: Optional[str] = None
+    # Geçmişte sorgu sonuçları bellekten atıldıysa True (toplam alanlar yine de dolu)
+    results_stripped: bool = False
     
     def to_dict(self) -> Dict[str, Any]:
         """Dictionary'ye dönüştür"""
@@ -103,7 +162,7 @@ class BatchAnalysisResult:
             "total_queries": self.total_queries,
             "successful_queries": self.successful_queries,
             "failed_queries": self.failed_queries,
-            "results": [asdict(r) for r in self.results],
+            "results": [_encode_query_result(r) for r in self.results],
             "started_at": self.started_at.isoformat() if self.started_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
             "total_processing_time": self.total_processing_time,
@@ -111,28 +170,135 @@ class BatchAnalysisResult:
             "report_path": self.report_path
         }
 
+def _run_query(graph: MultiAgentGraph, query: BatchQuery) -> QueryResult:
+    """
+    Sorguyu verilen graph ile işler (thread ve süreç worker'ları ortak kullanır)
+    
+    Args:
+        graph: Multi-agent graph
+        query: İşlenecek sorgu
+        
+    Returns:
+        Sorgu sonucu
+    """
+    start_time = time.time()
+    
+    try:
+        logger.info("🔍 Sorgu işleniyor: %s...", query.query[:50])
+        
+        # Multi-agent graph ile işle
+        result_state = graph.process_query(
+            query.query,
+            language=query.language or "tr"
+        )
+        
+        processing_time = time.time() - start_time
+        
+        # Sonucu formatla
+        query_result = QueryResult(
+            query_id=query.id,
+            query=query.query,
+            status=BatchStatus.COMPLETED,
+            response=result_state.get("cited_response", ""),
+            sources=result_state.get("sources", []),
+            processing_time=processing_time,
+            cross_document_analysis=result_state.get("cross_document_analysis", {}),
+            detected_language=result_state.get("detected_language", ""),
+            retrieval_performed=result_state.get("retrieval_performed", False),
+            cross_document_performed=result_state.get("cross_document_performed", False),
+            document_count=len(result_state.get("retrieved_documents", [])),
+            query_priority=query.priority,
+            expected_grant_types=query.expected_grant_types,
+            word_count=query.word_count
+        )
+        
+        return query_result
+        
+    except Exception as e:
+        processing_time = time.time() - start_time
+        
+        return QueryResult(
+            query_id=query.id,
+            query=query.query,
+            status=BatchStatus.FAILED,
+            error_message=str(e),
+            processing_time=processing_time,
+            query_priority=query.priority,
+            word_count=query.word_count
+        )
+
+_encode_batch_query = _field_encoder(BatchQuery)
+_encode_query_result = _field_encoder(QueryResult)
+
+# Süreç worker'larının graph'ı (ProcessPoolExecutor initializer'ı kurar)
+_worker_graph: Optional[MultiAgentGraph] = None
+
+def _init_worker():
+    """Süreç başına vector store ve multi-agent graph'ı bir kez kur"""
+    global _worker_graph
+    _worker_graph = MultiAgentGraph(get_vector_store())
+
+def _process_query_in_worker(query: BatchQuery) -> QueryResult:
+    """Süreç worker'ında tekil sorgu işleme"""
+    return _run_query(_worker_graph, query)
+
 class BatchProcessor:
     """Toplu analiz işlemcisi"""
     
-    def __init__(self, output_dir: str = "interfaces/data/batch_results"):
+    # Bellekte tutulan geçmiş job sayısı
+    JOB_HISTORY_LIMIT = 200
+    # Sorgu sonuçları yalnızca en son bu kadar job için bellekte kalır (tamamı raporda diskte).
+    # Rapor tüketicileri (ör. WorkflowScheduler) geçmişi en fazla bu kadar job ile ister.
+    FULL_RESULTS_HISTORY = 100
+    
+    def __init__(self, output_dir: str = "interfaces/data/batch_results", use_processes: bool = False):
+        """
+        Args:
+            output_dir: Batch raporlarının yazılacağı dizin
+            use_processes: Sorguları GIL'den bağımsız çalışan süreçlerde işle. Yalnızca
+                Python tarafında belirgin CPU işi varsa (profil ile doğrulanmış) faydalıdır;
+                sorgular çoğunlukla LLM/embedding API bekleyişi olduğundan varsayılan thread'dir.
+        """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
         self.multi_agent_graph = None
         self.vector_store = None
         self.active_jobs: Dict[str, BatchAnalysisResult] = {}
-        self.job_history: List[BatchAnalysisResult] = []
+        self.job_history: deque = deque(maxlen=self.JOB_HISTORY_LIMIT)
+        # active_jobs ve job_history'deki job'ların request_id indeksi
+        self._jobs_by_id: Dict[str, BatchAnalysisResult] = {}
+        
+        # Tüm batch'ler tek havuzu paylaşır; worker'lar ihtiyaç oldukça açılır ve tekrar kullanılır.
+        # Batch başına eşzamanlılık process_batch_async içindeki worker sayısı ile sınırlanır.
+        self.use_processes = use_processes
+        if use_processes:
+            # Her süreç graph'ı bir kez kurar; spawn, ana süreçteki thread'lerin fork edilmesini önler
+            self._executor = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 4,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max(8, (os.cpu_count() or 4) * 2),
+                thread_name_prefix="batch"
+            )
         
-        # Performance tracking
+        # Performance tracking (sayaçlar her batch'te artımlı güncellenir)
+        self._total_successful = 0
+        self._total_processing_time = 0.0
         self.performance_stats = {
             "total_jobs_processed": 0,
             "total_queries_processed": 0,
             "average_query_time": 0.0,
             "success_rate": 0.0
         }
+        self._performance_view = MappingProxyType(self.performance_stats)
         
         print("🔧 BatchProcessor başlatılıyor...")
-        self._initialize_systems()
+        if not use_processes:
+            self._initialize_systems()
     
     def _initialize_systems(self):
         """Sistemleri başlat"""
@@ -169,59 +335,83 @@ class BatchProcessor:
         )
         
         self.active_jobs[request.id] = result
+        self._jobs_by_id[request.id] = result
+        batch_start = time.perf_counter()
         
         try:
             print(f"🚀 Batch analiz başlatılıyor: {request.name}")
             print(f"📊 Toplam sorgu sayısı: {len(request.queries)}")
             
-            # Sorguları öncelik sırasına göre sırala
-            sorted_queries = sorted(request.queries, key=lambda x: x.priority)
+            # Öncelik kuyruğu: sıralı liste yerine heap; eşit önceliklerde giriş sırası korunur
+            pending = [(query.priority, i, query) for i, query in enumerate(request.queries)]
+            heapq.heapify(pending)
             
-            # ThreadPoolExecutor ile paralel işleme
-            with ThreadPoolExecutor(max_workers=request.max_workers) as executor:
-                # Future'ları submit et
-                future_to_query = {
-                    executor.submit(
-                        self._process_single_query, 
-                        query, 
-                        request.timeout_per_query
-                    ): query 
-                    for query in sorted_queries
-                }
+            # Sonuçlar giriş sırasındaki yerlerine yazılır; liste baştan tam boyutta
+            result.results = [None] * len(request.queries)
+            
+            loop = asyncio.get_running_loop()
+            
+            async def run_one(index: int, query: BatchQuery):
+                try:
+                    if self.use_processes:
+                        pending_result = loop.run_in_executor(self._executor, _process_query_in_worker, query)
+                    else:
+                        pending_result = loop.run_in_executor(
+                            self._executor,
+                            self._process_single_query,
+                            query,
+                            request.timeout_per_query
+                        )
+                    query_result = await asyncio.wait_for(
+                        pending_result,
+                        timeout=request.timeout_per_query + 10
+                    )
+                except Exception as e:
+                    # Hata durumu
+                    error_result = QueryResult(
+                        query_id=query.id,
+                        query=query.query,
+                        status=BatchStatus.FAILED,
+                        error_message=str(e) or type(e).__name__,
+                        query_priority=query.priority,
+                        word_count=query.word_count
+                    )
+                    result.results[index] = error_result
+                    result.failed_queries += 1
+                    
+                    logger.warning("❌ Sorgu hatası: %s... - %s", query.id[:8], e)
+                    return
                 
-                # Sonuçları topla
-                for future in as_completed(future_to_query):
-                    query = future_to_query[future]
+                # Sonuçlar event loop thread'inde toplandığı için kilit gerekmez
+                result.results[index] = query_result
+                
+                if query_result.status == BatchStatus.COMPLETED:
+                    result.successful_queries += 1
+                else:
+                    result.failed_queries += 1
                     
-                    try:
-                        query_result = future.result(timeout=request.timeout_per_query + 10)
-                        result.results.append(query_result)
-                        
-                        if query_result.status == BatchStatus.COMPLETED:
-                            result.successful_queries += 1
-                        else:
-                            result.failed_queries += 1
-                            
-                        print(f"✅ Sorgu tamamlandı: {query.id[:8]}... ({result.successful_queries + result.failed_queries}/{result.total_queries})")
-                        
-                    except Exception as e:
-                        # Hata durumu
-                        error_result = QueryResult(
-                            query_id=query.id,
-                            query=query.query,
-                            status=BatchStatus.FAILED,
-                            error_message=str(e),
-                            timestamp=datetime.now()
-                        )
-                        result.results.append(error_result)
-                        result.failed_queries += 1
-                        
-                        print(f"❌ Sorgu hatası: {query.id[:8]}... - {str(e)}")
+                logger.info("✅ Sorgu tamamlandı: %s... (%d/%d)", query.id[:8],
+                            result.successful_queries + result.failed_queries, result.total_queries)
+            
+            async def worker():
+                # Her worker boşaldıkça heap'ten en öncelikli sorguyu alır; iptal edilen
+                # job için yeni sorgu başlatılmaz
+                while pending and result.status != BatchStatus.CANCELLED:
+                    _, index, query = heapq.heappop(pending)
+                    await run_one(index, query)
+            
+            # Aynı anda en fazla max_workers sorgu çalışır (ve bellekte bekler); event loop
+            # bu sırada diğer coroutine'lere açık kalır
+            await asyncio.gather(*(worker() for _ in range(max(1, request.max_workers))))
             
             # Batch tamamlandı
-            result.status = BatchStatus.COMPLETED
+            if result.status != BatchStatus.CANCELLED:
+                result.status = BatchStatus.COMPLETED
+            else:
+                # İptal edilen job'da başlatılmamış sorguların yerleri boş kalır
+                result.results = [r for r in result.results if r is not None]
             result.completed_at = datetime.now()
-            result.total_processing_time = (result.completed_at - result.started_at).total_seconds()
+            result.total_processing_time = time.perf_counter() - batch_start
             
             # Özet istatistikleri hesapla
             result.summary_stats = self._calculate_summary_stats(result)
@@ -231,7 +421,7 @@ class BatchProcessor:
                 result.report_path = await self._generate_batch_report(request, result)
             
             # Job'ı history'ye ekle
-            self.job_history.append(result)
+            self._append_history(result)
             if request.id in self.active_jobs:
                 del self.active_jobs[request.id]
             
@@ -260,101 +450,77 @@ class BatchProcessor:
         Returns:
             Sorgu sonucu
         """
-        start_time = time.time()
+        return _run_query(self.multi_agent_graph, query)
+    
+    def _append_history(self, result: BatchAnalysisResult):
+        """Job'ı geçmişe ekle; eski job'ların ağır sorgu sonuçlarını bellekten at"""
+        if len(self.job_history) == self.job_history.maxlen:
+            evicted = self.job_history[0]
+            if self._jobs_by_id.get(evicted.request_id) is evicted:
+                del self._jobs_by_id[evicted.request_id]
         
-        try:
-            print(f"🔍 Sorgu işleniyor: {query.query[:50]}...")
-            
-            # Multi-agent graph ile işle
-            result_state = self.multi_agent_graph.process_query(
-                query.query,
-                language=query.language or "tr"
-            )
-            
-            processing_time = time.time() - start_time
-            
-            # Sonucu formatla
-            query_result = QueryResult(
-                query_id=query.id,
-                query=query.query,
-                status=BatchStatus.COMPLETED,
-                response=result_state.get("cited_response", ""),
-                sources=result_state.get("sources", []),
-                processing_time=processing_time,
-                metadata={
-                    "detected_language": result_state.get("detected_language", ""),
-                    "retrieval_performed": result_state.get("retrieval_performed", False),
-                    "cross_document_performed": result_state.get("cross_document_performed", False),
-                    "document_count": len(result_state.get("retrieved_documents", [])),
-                    "query_priority": query.priority,
-                    "expected_grant_types": query.expected_grant_types
-                },
-                cross_document_analysis=result_state.get("cross_document_analysis", {}),
-                timestamp=datetime.now()
-            )
-            
-            return query_result
-            
-        except Exception as e:
-            processing_time = time.time() - start_time
-            
-            return QueryResult(
-                query_id=query.id,
-                query=query.query,
-                status=BatchStatus.FAILED,
-                error_message=str(e),
-                processing_time=processing_time,
-                timestamp=datetime.now()
-            )
+        self.job_history.append(result)
+        self._jobs_by_id[result.request_id] = result
+        
+        index = len(self.job_history) - self.FULL_RESULTS_HISTORY - 1
+        if index >= 0 and self.job_history[index].results:
+            # Özet alanlar kalır; sonuçlar üzerinde çalışan çağıranların kopyası etkilenmez
+            light = replace(self.job_history[index], results=[], results_stripped=True)
+            self.job_history[index] = light
+            if light.request_id in self._jobs_by_id:
+                self._jobs_by_id[light.request_id] = light
     
     def _calculate_summary_stats(self, result: BatchAnalysisResult) -> Dict[str, Any]:
         """Özet istatistiklerini hesapla"""
         if not result.results:
             return {}
         
-        # Processing time stats
-        processing_times = [r.processing_time for r in result.results if r.processing_time > 0]
-        avg_processing_time = sum(processing_times) / len(processing_times) if processing_times else 0
-        
-        # Source stats
-        total_sources = sum(len(r.sources) for r in result.results)
-        avg_sources_per_query = total_sources / len(result.results)
-        
-        # Language distribution
-        languages = {}
-        for r in result.results:
-            lang = r.metadata.get("detected_language", "unknown")
-            languages[lang] = languages.get(lang, 0) + 1
-        
-        # Grant types analysis
+        n = len(result.results)
+        processing_times = np.empty(n, dtype=np.float64)
+        source_counts = np.empty(n, dtype=np.int64)
+        word_counts = np.empty(n, dtype=np.int64)
+        document_counts = np.empty(n, dtype=np.int64)
+        languages = Counter()
         grant_types_found = set()
-        for r in result.results:
+        cross_document_count = 0
+        
+        # Tek geçişte skaler alanlar dizilere alınır, hesaplar NumPy'da yapılır
+        for i, r in enumerate(result.results):
+            processing_times[i] = r.processing_time
+            source_counts[i] = len(r.sources)
+            word_counts[i] = r.word_count or len(r.query.split())
+            document_counts[i] = r.document_count
+            languages[r.detected_language] += 1
+            if r.cross_document_performed:
+                cross_document_count += 1
+            
+            # Grant types analysis
             cross_doc = r.cross_document_analysis
             if cross_doc and "grant_groups" in cross_doc:
                 grant_types_found.update(cross_doc["grant_groups"].keys())
         
-        # Complexity analysis
-        complexity_distribution = {"simple": 0, "medium": 0, "complex": 0}
-        for r in result.results:
-            word_count = len(r.query.split())
-            if word_count < 5:
-                complexity_distribution["simple"] += 1
-            elif word_count < 15:
-                complexity_distribution["medium"] += 1
-            else:
-                complexity_distribution["complex"] += 1
+        # Processing time stats
+        positive_times = processing_times[processing_times > 0]
+        avg_processing_time = float(positive_times.mean()) if positive_times.size else 0
+        
+        # Source stats
+        total_sources = int(source_counts.sum())
+        avg_sources_per_query = total_sources / n
+        
+        # Complexity analysis: <5 simple, <15 medium, gerisi complex
+        simple, medium, complex_ = np.bincount(np.digitize(word_counts, (5, 15)), minlength=3)
+        complexity_distribution = {"simple": int(simple), "medium": int(medium), "complex": int(complex_)}
         
         return {
             "success_rate": (result.successful_queries / result.total_queries) * 100,
             "average_processing_time": avg_processing_time,
             "total_sources_found": total_sources,
             "average_sources_per_query": avg_sources_per_query,
-            "language_distribution": languages,
+            "language_distribution": dict(languages),
             "grant_types_analyzed": list(grant_types_found),
             "query_complexity_distribution": complexity_distribution,
-            "cross_document_analysis_performed": sum(1 for r in result.results 
-                                                   if r.metadata.get("cross_document_performed", False)),
-            "total_documents_processed": sum(r.metadata.get("document_count", 0) for r in result.results)
+            "cross_document_analysis_performed": cross_document_count,
+            "total_documents_processed": int(document_counts.sum())
         }
     
     async def _generate_batch_report(self, request: BatchAnalysisRequest, result: BatchAnalysisResult) -> str:
@@ -365,17 +531,20 @@ class BatchProcessor:
             report_filename = f"batch_report_{request.id[:8]}_{timestamp}.json"
             report_path = self.output_dir / report_filename
             
-            # Rapor verisi
-            report_data = {
-                "batch_request": request.to_dict(),
-                "batch_result": result.to_dict(),
-                "generated_at": datetime.now().isoformat(),
-                "generator": "BatchProcessor v1.0"
-            }
-            
-            # JSON raporu kaydet
-            with open(report_path, 'w', encoding='utf-8') as f:
-                json.dump(report_data, f, indent=2, ensure_ascii=False, default=str)
+            if orjson is not None:
+                self._write_report_stream(report_path, request, result)
+            else:
+                # Rapor verisi
+                report_data = {
+                    "batch_request": request.to_dict(),
+                    "batch_result": result.to_dict(),
+                    "generated_at": datetime.now().isoformat(),
+                    "generator": "BatchProcessor v1.0"
+                }
+                
+                # JSON raporu kaydet
+                with open(report_path, 'w', encoding='utf-8') as f:
+                    json.dump(report_data, f, indent=2, ensure_ascii=False, default=str)
             
             print(f"📊 Batch raporu oluşturuldu: {report_path}")
             return str(report_path)
@@ -384,29 +553,48 @@ class BatchProcessor:
             print(f"⚠️ Rapor oluşturma hatası: {e}")
             return ""
     
+    def _write_report_stream(self, report_path: Path, request: BatchAnalysisRequest,
+                             result: BatchAnalysisResult):
+        """
+        Raporu sonuç sonuç diske yazar
+        
+        JSON zarfı elle yazılır ve her QueryResult ayrı kodlanır; böylece bellekte
+        tüm raporun kopyası yerine en fazla bir sonucun kodlanmış hali bulunur.
+        orjson dataclass, enum ve datetime'ı doğrudan kodlar (asdict kopyası yok).
+        """
+        options = orjson.OPT_NON_STR_KEYS
+        header = {f.name: getattr(result, f.name) for f in fields(result) if f.name != "results"}
+        
+        with open(report_path, 'wb', buffering=1 << 20) as f:
+            f.write(b'{"batch_request":')
+            f.write(orjson.dumps(request, option=options, default=str))
+            f.write(b',\n"batch_result":')
+            # Başlık objesinin kapanış parantezi yerine sonuç dizisi eklenir
+            f.write(orjson.dumps(header, option=options, default=str)[:-1])
+            f.write(b',"results":[')
+            for i, query_result in enumerate(result.results):
+                if i:
+                    f.write(b',')
+                f.write(b'\n')
+                f.write(orjson.dumps(query_result, option=options, default=str))
+            f.write(b'\n]},\n"generated_at":')
+            f.write(orjson.dumps(datetime.now()))
+            f.write(b',\n"generator":"BatchProcessor v1.0"}\n')
+    
     def _update_performance_stats(self, result: BatchAnalysisResult):
         """Performance istatistiklerini güncelle"""
         self.performance_stats["total_jobs_processed"] += 1
         self.performance_stats["total_queries_processed"] += result.total_queries
         
-        # Average query time güncelle
-        total_time = sum(r.processing_time for r in result.results if r.processing_time > 0)
-        if result.total_queries > 0:
-            current_avg = self.performance_stats["average_query_time"]
-            new_avg_component = total_time / result.total_queries
-            
-            total_jobs = self.performance_stats["total_jobs_processed"]
-            self.performance_stats["average_query_time"] = (
-                (current_avg * (total_jobs - 1) + new_avg_component) / total_jobs
-            )
+        # Geçmiş yeniden taranmaz; yalnızca bu batch'in katkısı sayaçlara eklenir
+        # Başarılı sorgular batch sırasında zaten sayıldı
+        self._total_successful += result.successful_queries
+        self._total_processing_time += sum(r.processing_time for r in result.results if r.processing_time > 0)
         
-        # Success rate güncelle
-        total_successful = sum(len([r for r in job.results if r.status == BatchStatus.COMPLETED]) 
-                             for job in self.job_history)
         total_processed = self.performance_stats["total_queries_processed"]
-        
         if total_processed > 0:
-            self.performance_stats["success_rate"] = (total_successful / total_processed) * 100
+            self.performance_stats["average_query_time"] = self._total_processing_time / total_processed
+            self.performance_stats["success_rate"] = (self._total_successful / total_processed) * 100
     
     def create_batch_request(self, 
                            name: str,
@@ -452,16 +640,7 @@ class BatchProcessor:
     
     def get_job_status(self, job_id: str) -> Optional[BatchAnalysisResult]:
         """Job durumunu al"""
-        # Aktif job'ları kontrol et
-        if job_id in self.active_jobs:
-            return self.active_jobs[job_id]
-        
-        # History'de ara
-        for job in self.job_history:
-            if job.request_id == job_id:
-                return job
-        
-        return None
+        return self._jobs_by_id.get(job_id)
     
     def get_active_jobs(self) -> List[BatchAnalysisResult]:
         """Aktif job'ları döndür"""
@@ -469,11 +648,16 @@ class BatchProcessor:
     
     def get_job_history(self, limit: int = 50) -> List[BatchAnalysisResult]:
         """Job geçmişini döndür"""
-        return self.job_history[-limit:]
+        start = max(0, len(self.job_history) - limit)
+        return list(islice(self.job_history, start, None))
+    
+    def get_performance_stats(self) -> Mapping[str, Any]:
+        """Performance istatistiklerini döndür (kopyasız, salt okunur canlı görünüm)"""
+        return self._performance_view
     
-    def get_performance_stats(self) -> Dict[str, Any]:
-        """Performance istatistiklerini döndür"""
-        return self.performance_stats.copy()
+    def close(self):
+        """Paylaşılan thread havuzunu kapat"""
+        self._executor.shutdown(wait=False)
     
     def cancel_job(self, job_id: str) -> bool:
         """Job'ı iptal et"""
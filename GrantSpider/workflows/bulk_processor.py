@@ -6,20 +6,39 @@ It can process large numbers of PDF files in parallel,
 tracks progress and provides error management.
 """
 
+from __future__ import annotations
+
 import os
 import asyncio
 import logging
 import hashlib
-import threading
+import inspect
+import mmap
+import multiprocessing
+import sqlite3
+import statistics
+import sys
+from collections import Counter
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import List, Dict, Optional, Callable, Any, Union
+from typing import List, Dict, Optional, Callable, Any, Iterator
 import json
 import time
-from queue import Queue, Empty
+
+import numpy as np
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # GrantSpider imports
 try:
@@ -46,6 +65,115 @@ except ImportError as e:
             return {}
 
 
+# Python 3.10+: jobs are created per file, slots drop the per-instance __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Per-process PDFProcessor used by pool workers (set by _init_worker in each worker process)
+_WORKER_PDF: Optional[PDFProcessor] = None
+
+
+def _init_worker():
+    """Process pool initializer: build the PDFProcessor once per worker process"""
+    global _WORKER_PDF
+    _WORKER_PDF = PDFProcessor()
+
+
+def _open_pdf_mapping(file_path: str) -> Optional[mmap.mmap]:
+    """
+    Read-only memory map of a file (None for empty files, which cannot be mapped)
+    
+    The mapping serves pages straight from the OS page cache, so hashing and
+    parsing share one read of the file without copying it into Python bytes.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mapping, "madvise"):
+        # Front-to-back access: let the kernel read ahead aggressively
+        mapping.madvise(mmap.MADV_SEQUENTIAL)
+    return mapping
+
+
+def _hash_mapping(mapping: Optional[mmap.mmap]) -> str:
+    """blake2b-128 of a mapped file (hashlib releases the GIL for large buffers)"""
+    hasher = hashlib.blake2b(digest_size=16)
+    if mapping is not None:
+        hasher.update(mapping)
+    return hasher.hexdigest()
+
+
+def _hash_file(file_path: str) -> str:
+    """Content hash of a file (blake2b-128 over a memory map)"""
+    try:
+        mapping = _open_pdf_mapping(file_path)
+        try:
+            return _hash_mapping(mapping)
+        finally:
+            if mapping is not None:
+                mapping.close()
+    except Exception:
+        return "unknown"
+
+
+def _load_documents(file_path: str, mapping: Optional[mmap.mmap]) -> list:
+    """Parse with the worker's PDFProcessor, from the mapping when it accepts bytes"""
+    load_from_bytes = getattr(_WORKER_PDF, "load_from_bytes", None)
+    if load_from_bytes is not None and mapping is not None:
+        with memoryview(mapping) as view:
+            documents = load_from_bytes(view)
+    else:
+        documents = _WORKER_PDF.load_and_process_pdf(file_path)
+    
+    if inspect.isawaitable(documents):
+        documents = asyncio.run(documents)
+    return documents or []
+
+
+def _parse_pdf_worker(file_path: str, compute_hash: bool = False) -> tuple:
+    """
+    Parse a PDF inside an executor worker
+    
+    Args:
+        file_path: PDF file path
+        compute_hash: Also hash the file (runs in parallel with other workers)
+        
+    Returns:
+        (serialisable documents, total characters, file hash or None) tuple;
+        LangChain Document objects are converted here so nothing heavy is pickled back
+    """
+    # Thread pools have no per-process initializer; their threads share one processor
+    if _WORKER_PDF is None:
+        _init_worker()
+    
+    # One mapping feeds both the hasher and (if supported) the parser
+    needs_mapping = compute_hash or hasattr(_WORKER_PDF, "load_from_bytes")
+    mapping = _open_pdf_mapping(file_path) if needs_mapping else None
+    try:
+        file_hash = _hash_mapping(mapping) if compute_hash else None
+        documents = _load_documents(file_path, mapping)
+    finally:
+        if mapping is not None:
+            mapping.close()
+    
+    total_characters = sum(len(str(doc)) for doc in documents)
+    return [doc.dict() if hasattr(doc, 'dict') else str(doc) for doc in documents], total_characters, file_hash
+
+
+def _elapsed(start_ns: int) -> float:
+    """Seconds since a time.monotonic_ns() reading"""
+    return (time.monotonic_ns() - start_ns) / 1e9
+
+
+def _json_default(obj: Any) -> Any:
+    """JSON encoder fallback for datetime and Enum values"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
 class ProcessingStatus(Enum):
     """Document processing statuses"""
     PENDING = "pending"
@@ -64,7 +192,7 @@ class ProcessingMode(Enum):
     ADAPTIVE = "adaptive"  # Automatic best mode selection
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ProcessingConfig:
     """Bulk processing configuration"""
     max_workers: int = 4
@@ -73,31 +201,43 @@ class ProcessingConfig:
     retry_attempts: int = 3
     retry_delay: float = 2.0
     timeout_per_document: int = 300  # 5 minutes
-    memory_limit_mb: int = 1024
+    memory_limit_mb: int = 1024  # Total size (MiB) of PDFs in flight at once
     enable_progress_tracking: bool = True
     save_intermediate_results: bool = True
     output_directory: Optional[str] = None
     error_handling_strategy: str = "continue"  # continue, stop, retry
+    compute_file_hash: bool = False  # Hash each file (in the parse worker) for job metadata
+    use_hash_cache: bool = False  # Reuse results of files already processed (keyed by content hash)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ProcessingJob:
     """Single document processing job"""
     job_id: str
     file_path: str
     status: ProcessingStatus = ProcessingStatus.PENDING
-    created_at: datetime = field(default_factory=datetime.now)
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
+    # datetime yerine epoch nanosaniye (time.time_ns); gerektiğinde property'lerle datetime'a çevrilir
+    started_at_ns: Optional[int] = None
+    completed_at_ns: Optional[int] = None
     error_message: Optional[str] = None
-    retry_count: int = 0
+    error_type: Optional[str] = None  # Exception class name, for error_summary
     file_size: int = 0
     file_hash: Optional[str] = None
     processing_time: float = 0.0
     result_data: Optional[Dict[str, Any]] = None
+    
+    @property
+    def started_at(self) -> Optional[datetime]:
+        """İşlemenin başladığı zaman (yerel saat)"""
+        return datetime.fromtimestamp(self.started_at_ns / 1e9) if self.started_at_ns is not None else None
+    
+    @property
+    def completed_at(self) -> Optional[datetime]:
+        """İşlemenin bittiği zaman (yerel saat)"""
+        return datetime.fromtimestamp(self.completed_at_ns / 1e9) if self.completed_at_ns is not None else None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ProcessingResult:
     """Bulk processing result report"""
     batch_id: str
@@ -115,6 +255,121 @@ class ProcessingResult:
     performance_metrics: Dict[str, Any]
 
 
+if msgspec is not None:
+    # Saved result file schema; msgspec encodes these straight to JSON, no intermediate dicts
+    class _JobOut(msgspec.Struct):
+        job_id: str
+        file_path: str
+        status: ProcessingStatus
+        processing_time: float
+        file_size: int
+        error_message: Optional[str]
+        error_type: Optional[str]
+        result_data: Optional[Dict[str, Any]]
+    
+    class _SummaryOut(msgspec.Struct):
+        total_files: int
+        successful_files: int
+        failed_files: int
+        cancelled_files: int
+        total_processing_time: float
+        average_processing_time: float
+        throughput_files_per_second: float
+        started_at: datetime
+        completed_at: datetime
+    
+    class _ResultOut(msgspec.Struct):
+        batch_id: str
+        summary: _SummaryOut
+        jobs_file: str
+        error_summary: Dict[str, int]
+        performance_metrics: Dict[str, Any]
+    
+    _RESULT_ENCODER = msgspec.json.Encoder(enc_hook=_json_default)
+    
+    def _encode_job_msgspec(job: ProcessingJob) -> bytes:
+        """Encode one job of a bulk result"""
+        return _RESULT_ENCODER.encode(_JobOut(
+            job_id=job.job_id,
+            file_path=job.file_path,
+            status=job.status,
+            processing_time=job.processing_time,
+            file_size=job.file_size,
+            error_message=job.error_message,
+            error_type=job.error_type,
+            result_data=job.result_data
+        ))
+    
+    def _encode_result_msgspec(result: ProcessingResult, jobs_file: str) -> bytes:
+        """Encode a bulk result into the saved JSON layout"""
+        return _RESULT_ENCODER.encode(_ResultOut(
+            batch_id=result.batch_id,
+            summary=_SummaryOut(
+                total_files=result.total_files,
+                successful_files=result.successful_files,
+                failed_files=result.failed_files,
+                cancelled_files=result.cancelled_files,
+                total_processing_time=result.total_processing_time,
+                average_processing_time=result.average_processing_time,
+                throughput_files_per_second=result.throughput_files_per_second,
+                started_at=result.started_at,
+                completed_at=result.completed_at
+            ),
+            jobs_file=jobs_file,
+            error_summary=result.error_summary,
+            performance_metrics=result.performance_metrics
+        ))
+
+
+
+def _encode_job_line(job: ProcessingJob) -> bytes:
+    """One line of a batch's jobs JSONL file"""
+    if msgspec is not None:
+        return _encode_job_msgspec(job) + b"\n"
+    
+    job_data = {
+        'job_id': job.job_id,
+        'file_path': job.file_path,
+        'status': job.status,
+        'processing_time': job.processing_time,
+        'file_size': job.file_size,
+        'error_message': job.error_message,
+        'error_type': job.error_type,
+        'result_data': job.result_data
+    }
+    if orjson is not None:
+        return orjson.dumps(job_data, default=_json_default, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(job_data, ensure_ascii=False, default=_json_default).encode('utf-8') + b"\n"
+
+
+
+class _MemoryBudget:
+    """
+    Weighted asyncio semaphore: each job holds as many permits as its size in MiB
+    
+    Only used from the event loop thread; create it inside the running loop.
+    """
+    
+    def __init__(self, capacity_mb: int):
+        self.capacity = max(1, capacity_mb)
+        self._available = self.capacity
+        self._condition = asyncio.Condition()
+    
+    def weight(self, file_size: int) -> int:
+        """Permits for a file (rounded up to MiB, a single file never exceeds the whole budget)"""
+        return max(1, min(self.capacity, (file_size + (1 << 20) - 1) >> 20))
+    
+    async def acquire(self, permits: int):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._available >= permits)
+            self._available -= permits
+    
+    async def release(self, permits: int):
+        async with self._condition:
+            self._available += permits
+            self._condition.notify_all()
+
+
 class BulkDocumentProcessor:
     """
     Bulk document processing system
@@ -139,22 +394,92 @@ class BulkDocumentProcessor:
         self.metrics_engine = PerformanceMetricsEngine()
         
         # Processing state
-        self.active_jobs: Dict[str, ProcessingJob] = {}
-        self.job_queue = Queue()
-        self.result_queue = Queue()
+        self.active_jobs_count = 0
         self.is_processing = False
         self.should_stop = False
         
+        # get_statistics state: batch summaries read from the results index so far
+        self._index_entries: Dict[str, Dict[str, Any]] = {}
+        self._index_offset = 0
+        
         # Progress tracking
         self.progress_callbacks: List[Callable] = []
+        self._last_progress_ts = 0.0
         self.current_batch_id: Optional[str] = None
         
+        # Parse executors, created on first use; _select_executor picks one per batch
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._executor = None
+        
         # Setup directories
         self._setup_directories()
         
+        # Content-hash result cache (shared across batches and runs)
+        self._cache_db: Optional[sqlite3.Connection] = None
+        if self.config.use_hash_cache:
+            self._cache_db = self._open_hash_cache()
+        
         # Start metrics monitoring
         self.metrics_engine.start_monitoring()
     
+    # ADAPTIVE mode: batches of mostly small PDFs are I/O-bound and go to threads
+    ADAPTIVE_SMALL_FILE_BYTES = 256 * 1024
+    
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.config.max_workers,
+                thread_name_prefix="bulk"
+            )
+        return self._thread_pool
+    
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            # spawn: the parent has running threads (metrics monitoring), fork would copy their locks
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.config.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+        return self._process_pool
+    
+    def _select_executor(self, jobs: List[ProcessingJob]):
+        """
+        Pick the parse executor for a batch
+        
+        Processes sidestep the GIL for CPU-bound parsing of large PDFs; for many
+        small files their startup and pickling costs outweigh that, so threads win.
+        """
+        mode = self.config.processing_mode
+        if mode == ProcessingMode.ADAPTIVE:
+            median_size = statistics.median(job.file_size for job in jobs)
+            use_threads = (median_size < self.ADAPTIVE_SMALL_FILE_BYTES
+                           and len(jobs) > self.config.max_workers)
+            self.logger.info(
+                f"Adaptive mode: median file size {median_size / 1024:.0f} KB, "
+                f"using {'threads' if use_threads else 'processes'}"
+            )
+        else:
+            use_threads = mode != ProcessingMode.PARALLEL_PROCESSES
+        
+        self._executor = self._get_thread_pool() if use_threads else self._get_process_pool()
+    
+    def close(self):
+        """Shut down the parse executors and the hash cache"""
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=False)
+        if self._cache_db is not None:
+            self._cache_db.close()
+            self._cache_db = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+    
     def _setup_directories(self):
         """Gerekli klasörleri oluştur"""
         if self.config.output_directory:
@@ -177,7 +502,30 @@ class BulkDocumentProcessor:
         """
         self.progress_callbacks.append(callback)
     
-    def _notify_progress(self, batch_id: str, progress: float, info: Dict):
+    # Progress callback'leri en fazla bu aralıkla (saniye) çağrılır; son güncelleme her zaman gider
+    PROGRESS_INTERVAL = 0.1
+    
+    def _notify_progress(self, batch_id: str, completed: int, total: int, current_file: str):
+        """Progress callback'lerini kısıtlanmış aralıklarla çağır"""
+        if not self.progress_callbacks:
+            return
+        
+        now = time.monotonic()
+        if completed < total and now - self._last_progress_ts < self.PROGRESS_INTERVAL:
+            return
+        self._last_progress_ts = now
+        
+        info = {
+            'completed': completed,
+            'total': total,
+            'current_file': current_file
+        }
+        # Callback'ler işi bitiren görevin içinde değil, event loop'un sonraki turunda çalışır
+        asyncio.get_running_loop().call_soon(
+            self._dispatch_progress, batch_id, (completed / total) * 100, info
+        )
+    
+    def _dispatch_progress(self, batch_id: str, progress: float, info: Dict):
         """Progress callback'lerini çağır"""
         for callback in self.progress_callbacks:
             try:
@@ -185,35 +533,67 @@ class BulkDocumentProcessor:
             except Exception as e:
                 self.logger.error(f"Progress callback error: {e}")
     
-    def _calculate_file_hash(self, file_path: str) -> str:
-        """Dosya hash'i hesapla"""
-        hasher = hashlib.md5()
+    HASH_CACHE_FILE = "hash_cache.sqlite"
+    
+    def _open_hash_cache(self) -> Optional[sqlite3.Connection]:
+        """Open (or create) the content-hash result cache in results_dir"""
+        try:
+            db = sqlite3.connect(str(self.results_dir / self.HASH_CACHE_FILE), check_same_thread=False)
+            # WAL: several processors can read while one writes
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS cache(hash TEXT PRIMARY KEY, result BLOB, mtime REAL)")
+            db.commit()
+            return db
+        except sqlite3.Error as e:
+            self.logger.warning(f"Hash cache disabled: {e}")
+            return None
+    
+    def _get_cached_result(self, file_hash: str) -> Optional[Dict[str, Any]]:
+        """Result data of a previously processed file with the same content, if any"""
         try:
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hasher.update(chunk)
-            return hasher.hexdigest()
-        except Exception:
-            return "unknown"
-    
-    def _create_processing_job(self, file_path: str, batch_id: str) -> ProcessingJob:
-        """İşleme işi oluştur"""
+            row = self._cache_db.execute("SELECT result FROM cache WHERE hash=?", (file_hash,)).fetchone()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Hash cache lookup failed: {e}")
+            return None
+        if row is None:
+            return None
+        return orjson.loads(row[0]) if orjson is not None else json.loads(row[0])
+    
+    def _store_cached_result(self, file_hash: str, result_data: Dict[str, Any]):
+        """Remember the result data of a successfully processed file"""
+        payload = orjson.dumps(result_data) if orjson is not None else json.dumps(result_data).encode()
+        try:
+            self._cache_db.execute(
+                "INSERT OR REPLACE INTO cache(hash, result, mtime) VALUES (?, ?, ?)",
+                (file_hash, payload, time.time())
+            )
+            self._cache_db.commit()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Hash cache write failed: {e}")
+    
+    def _calculate_file_hash(self, file_path: str) -> Optional[str]:
+        """Dosya hash'i hesapla (config.compute_file_hash kapalıysa None)"""
+        if not self.config.compute_file_hash:
+            return None
+        return _hash_file(file_path)
+    
+    def _create_processing_job(self, file_path: str, batch_id: str,
+                               file_size: Optional[int] = None) -> ProcessingJob:
+        """İşleme işi oluştur (file_size zaten stat edildiyse tekrar sorgulanmaz)"""
         job_id = f"{batch_id}_{Path(file_path).stem}_{int(time.time())}"
         
-        # File info
-        file_size = 0
-        file_hash = None
-        try:
-            file_size = os.path.getsize(file_path)
-            file_hash = self._calculate_file_hash(file_path)
-        except Exception as e:
-            self.logger.warning(f"File info error for {file_path}: {e}")
+        # File info (hash, if enabled, is computed later in the parse worker)
+        if file_size is None:
+            file_size = 0
+            try:
+                file_size = os.stat(file_path).st_size
+            except Exception as e:
+                self.logger.warning(f"File info error for {file_path}: {e}")
         
         return ProcessingJob(
             job_id=job_id,
             file_path=file_path,
-            file_size=file_size,
-            file_hash=file_hash
+            file_size=file_size
         )
     
     async def process_single_document(self, job: ProcessingJob) -> ProcessingJob:
@@ -226,8 +606,20 @@ class BulkDocumentProcessor:
         Returns:
             Güncellenmiş job objesi
         """
-        start_time = time.time()
-        job.started_at = datetime.now()
+        start_ns = time.monotonic_ns()
+        parsed = await self._parse_document(job, start_ns)
+        if parsed is not None:
+            await self._save_document(job, parsed, start_ns)
+        return job
+    
+    async def _parse_document(self, job: ProcessingJob, start_ns: int) -> Optional[tuple]:
+        """
+        Parse aşaması (CPU): PDF'i executor'da işle
+        
+        Returns:
+            (documents, total_characters) tuple'ı; job burada bittiyse (cache isabeti/hata) None
+        """
+        job.started_at_ns = time.time_ns()
         job.status = ProcessingStatus.PROCESSING
         
         try:
@@ -237,18 +629,50 @@ class BulkDocumentProcessor:
             if not os.path.exists(job.file_path):
                 raise FileNotFoundError(f"File not found: {job.file_path}")
             
-            # PDF'i işle
-            documents = await self.pdf_processor.load_and_process_pdf(job.file_path)
+            loop = asyncio.get_running_loop()
+            
+            # Aynı içerik daha önce işlendiyse sonucu cache'ten al
+            if self._cache_db is not None:
+                job.file_hash = await loop.run_in_executor(self._executor, _hash_file, job.file_path)
+                cached = self._get_cached_result(job.file_hash)
+                if cached is not None:
+                    job.result_data = cached
+                    job.status = ProcessingStatus.COMPLETED
+                    job.completed_at_ns = time.time_ns()
+                    job.processing_time = _elapsed(start_ns)
+                    self.logger.info(f"Reused cached result for: {job.file_path}")
+                    self.metrics_engine.record_metric("document_cache_hit", 1)
+                    return None
+            
+            # PDF'i worker'da işle (event loop bloklanmaz)
+            compute_hash = self.config.compute_file_hash and job.file_hash is None
+            documents, total_characters, file_hash = await loop.run_in_executor(
+                self._executor, _parse_pdf_worker, job.file_path, compute_hash
+            )
+            if file_hash is not None:
+                job.file_hash = file_hash
             
             if not documents:
                 raise ValueError("No content extracted from PDF")
             
-            # State manager'a kaydet
+            return documents, total_characters
+            
+        except Exception as e:
+            self._fail_job(job, e, start_ns)
+            return None
+    
+    async def _save_document(self, job: ProcessingJob, parsed: tuple, start_ns: int):
+        """Save aşaması (I/O): parse edilen dokümanları state manager'a yaz ve job'ı tamamla"""
+        documents, total_characters = parsed
+        
+        try:
+            # State manager'a kaydet (tamamlanma zamanı tek saat okumasıyla alınır)
+            job.completed_at_ns = time.time_ns()
             batch_data = {
                 'job_id': job.job_id,
                 'file_path': job.file_path,
-                'documents': [doc.dict() if hasattr(doc, 'dict') else str(doc) for doc in documents],
-                'processed_at': datetime.now().isoformat(),
+                'documents': documents,
+                'processed_at': job.completed_at.isoformat(),
                 'file_size': job.file_size,
                 'file_hash': job.file_hash
             }
@@ -258,13 +682,15 @@ class BulkDocumentProcessor:
             # Sonuç verilerini kaydet
             job.result_data = {
                 'document_count': len(documents),
-                'total_characters': sum(len(str(doc)) for doc in documents),
+                'total_characters': total_characters,
                 'extraction_successful': True
             }
             
             job.status = ProcessingStatus.COMPLETED
-            job.completed_at = datetime.now()
-            job.processing_time = time.time() - start_time
+            job.processing_time = _elapsed(start_ns)
+            
+            if self._cache_db is not None and job.file_hash not in (None, "unknown"):
+                self._store_cached_result(job.file_hash, job.result_data)
             
             self.logger.info(f"Successfully processed: {job.file_path} in {job.processing_time:.2f}s")
             
@@ -273,17 +699,37 @@ class BulkDocumentProcessor:
             self.metrics_engine.record_metric("processing_time", job.processing_time)
             
         except Exception as e:
-            job.status = ProcessingStatus.FAILED
-            job.error_message = str(e)
-            job.processing_time = time.time() - start_time
-            
-            self.logger.error(f"Failed to process {job.file_path}: {e}")
-            
-            # Metrics kaydet
-            self.metrics_engine.record_metric("document_failed", 1)
-            self.metrics_engine.record_metric("error_rate", 1)
+            self._fail_job(job, e, start_ns)
+    
+    def _fail_job(self, job: ProcessingJob, error: Exception, start_ns: int):
+        """Job'ı başarısız olarak işaretle"""
+        job.status = ProcessingStatus.FAILED
+        job.error_message = str(error)
+        job.error_type = type(error).__name__
+        job.processing_time = _elapsed(start_ns)
         
-        return job
+        self.logger.error(f"Failed to process {job.file_path}: {error}")
+        
+        # Metrics kaydet
+        self.metrics_engine.record_metric("document_failed", 1)
+        self.metrics_engine.record_metric("error_rate", 1)
+    
+    # Aynı anda bekleyen stat çağrısı sayısı
+    STAT_CONCURRENCY = 64
+    
+    async def _stat_files(self, paths: List[str]) -> List[Optional[int]]:
+        """Dosya boyutlarını eşzamanlı stat ile al (olmayan dosyalar için None)"""
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.STAT_CONCURRENCY)
+        
+        async def _size(path: str) -> Optional[int]:
+            async with semaphore:
+                try:
+                    return (await loop.run_in_executor(None, os.stat, path)).st_size
+                except OSError:
+                    return None
+        
+        return await asyncio.gather(*(_size(path) for path in paths))
     
     async def process_documents_bulk(
         self,
@@ -305,73 +751,141 @@ class BulkDocumentProcessor:
         self.current_batch_id = batch_id
         
         start_time = datetime.now()
+        batch_start_ns = time.monotonic_ns()
+        self._last_progress_ts = 0.0
         self.logger.info(f"Starting bulk processing for batch: {batch_id}")
         
-        # Dosyaları filtrele (sadece mevcut PDF'ler)
-        valid_files = []
-        for file_path in file_paths:
-            if os.path.exists(file_path) and file_path.lower().endswith('.pdf'):
-                valid_files.append(file_path)
-            else:
-                self.logger.warning(f"Skipping invalid file: {file_path}")
+        # Dosyaları filtrele (sadece mevcut PDF'ler); tek stat hem varlığı hem boyutu verir
+        pdf_paths = [file_path for file_path in file_paths if file_path.rpartition('.')[2].lower() == 'pdf']
+        sizes = await self._stat_files(pdf_paths)
+        
+        # Processing jobs tek geçişte oluşturulur (stat edilemeyen dosyalar atlanır)
+        jobs = [
+            self._create_processing_job(file_path, batch_id, file_size)
+            for file_path, file_size in zip(pdf_paths, sizes)
+            if file_size is not None
+        ]
         
-        if not valid_files:
+        skipped = len(file_paths) - len(jobs)
+        if skipped:
+            self.logger.warning(f"Skipped {skipped} invalid files")
+        
+        if not jobs:
             raise ValueError("No valid PDF files found to process")
         
-        # Processing jobs oluştur
-        jobs = [self._create_processing_job(file_path, batch_id) for file_path in valid_files]
+        self._select_executor(jobs)
         
         # İşleme başlat
         self.is_processing = True
         self.should_stop = False
         
-        processed_jobs = []
         total_jobs = len(jobs)
+        completed_count = 0
+        sequential = self.config.processing_mode == ProcessingMode.SEQUENTIAL
+        parser_count = 1 if sequential else self.config.max_workers
+        saver_count = 1 if sequential else max(2, parser_count // 2)
+        
+        # Parse (CPU) ve save (I/O) aşamaları sınırlı kuyruklarla birbirine bağlanır;
+        # bir dokümanın kaydı sürerken parser'lar sıradaki dokümanlara geçer
+        parse_q: asyncio.Queue = asyncio.Queue(maxsize=2 * parser_count)
+        save_q: asyncio.Queue = asyncio.Queue(maxsize=2 * parser_count)
+        
+        # Parse'tan kayda kadar bellekte tutulan PDF boyutu memory_limit_mb ile sınırlanır
+        memory_budget = _MemoryBudget(self.config.memory_limit_mb)
+        
+        # Biten her job hemen diske yazılır: yazıcı belleği N'den bağımsız, yarım kalan batch'ler de korunur
+        jobs_file = open(self._jobs_temp_path(batch_id), 'wb')
+        
+        def _finish(job: ProcessingJob):
+            nonlocal completed_count
+            
+            jobs_file.write(_encode_job_line(job))
+            if job.status == ProcessingStatus.CANCELLED:
+                return
+            
+            # Progress update (tüm görevler event loop thread'inde çalışır, sayaç kilitsiz güvenli)
+            self.active_jobs_count -= 1
+            completed_count += 1
+            self._notify_progress(batch_id, completed_count, total_jobs, job.file_path)
+        
+        async def _parse_worker():
+            while True:
+                job = await parse_q.get()
+                try:
+                    # Durdurma sinyali sıradaki job'lar için kontrol edilir
+                    if self.should_stop:
+                        job.status = ProcessingStatus.CANCELLED
+                        _finish(job)
+                        continue
+                    
+                    permits = memory_budget.weight(job.file_size)
+                    await memory_budget.acquire(permits)
+                    
+                    self.active_jobs_count += 1
+                    start_ns = time.monotonic_ns()
+                    parsed = await self._parse_document(job, start_ns)
+                    if parsed is None:
+                        await memory_budget.release(permits)
+                        _finish(job)
+                    else:
+                        await save_q.put((job, parsed, start_ns, permits))
+                finally:
+                    parse_q.task_done()
+        
+        async def _save_worker():
+            while True:
+                job, parsed, start_ns, permits = await save_q.get()
+                try:
+                    await self._save_document(job, parsed, start_ns)
+                    await memory_budget.release(permits)
+                    _finish(job)
+                finally:
+                    save_q.task_done()
+        
+        workers = [asyncio.create_task(_parse_worker()) for _ in range(parser_count)]
+        workers += [asyncio.create_task(_save_worker()) for _ in range(saver_count)]
         
         try:
-            # Sequential processing for simplicity
-            for i, job in enumerate(jobs):
-                if self.should_stop:
-                    job.status = ProcessingStatus.CANCELLED
-                    processed_jobs.append(job)
-                    continue
-                
-                processed_job = await self.process_single_document(job)
-                processed_jobs.append(processed_job)
-                
-                # Progress update
-                progress = ((i + 1) / total_jobs) * 100
-                self._notify_progress(batch_id, progress, {
-                    'completed': i + 1,
-                    'total': total_jobs,
-                    'current_file': job.file_path
-                })
+            for job in jobs:
+                await parse_q.put(job)
+            
+            # Önce tüm parse'lar, sonra onların kayıtları biter
+            await parse_q.join()
+            await save_q.join()
+            
+            # Job'lar yerinde güncellenir; liste giriş sırasını korur
+            processed_jobs = jobs
+            jobs_file.close()
             
             end_time = datetime.now()
-            total_time = (end_time - start_time).total_seconds()
+            total_time = _elapsed(batch_start_ns)
             
-            # Sonuçları analiz et
-            successful_jobs = [job for job in processed_jobs if job.status == ProcessingStatus.COMPLETED]
-            failed_jobs = [job for job in processed_jobs if job.status == ProcessingStatus.FAILED]
-            cancelled_jobs = [job for job in processed_jobs if job.status == ProcessingStatus.CANCELLED]
+            # Sonuçları analiz et: skaler alanlar tek geçişte dizilere alınır
+            statuses = np.array([job.status.value for job in processed_jobs])
+            times = np.fromiter((job.processing_time for job in processed_jobs),
+                                dtype=np.float64, count=len(processed_jobs))
+            successful_mask = statuses == ProcessingStatus.COMPLETED.value
+            failed_mask = statuses == ProcessingStatus.FAILED.value
+            successful_count = int(np.count_nonzero(successful_mask))
+            failed_count = int(np.count_nonzero(failed_mask))
+            cancelled_count = int(np.count_nonzero(statuses == ProcessingStatus.CANCELLED.value))
             
             # Error summary
-            error_summary = {}
-            for job in failed_jobs:
-                error_type = type(Exception(job.error_message)).__name__ if job.error_message else "Unknown"
-                error_summary[error_type] = error_summary.get(error_type, 0) + 1
+            error_summary = dict(Counter(
+                processed_jobs[index].error_type or "Unknown" for index in np.flatnonzero(failed_mask)
+            ))
             
             # Performance metrics
-            avg_processing_time = sum(job.processing_time for job in successful_jobs) / len(successful_jobs) if successful_jobs else 0
-            throughput = len(successful_jobs) / total_time if total_time > 0 else 0
+            avg_processing_time = float(times[successful_mask].mean()) if successful_count else 0
+            throughput = successful_count / total_time if total_time > 0 else 0
             
             # Sonuç objesi oluştur
             result = ProcessingResult(
                 batch_id=batch_id,
                 total_files=len(jobs),
-                successful_files=len(successful_jobs),
-                failed_files=len(failed_jobs),
-                cancelled_files=len(cancelled_jobs),
+                successful_files=successful_count,
+                failed_files=failed_count,
+                cancelled_files=cancelled_count,
                 total_processing_time=total_time,
                 average_processing_time=avg_processing_time,
                 throughput_files_per_second=throughput,
@@ -385,57 +899,96 @@ class BulkDocumentProcessor:
             # Sonuçları kaydet
             await self._save_bulk_result(result)
             
-            self.logger.info(f"Bulk processing completed: {len(successful_jobs)}/{len(jobs)} successful")
+            self.logger.info(f"Bulk processing completed: {successful_count}/{len(jobs)} successful")
             
             return result
             
         finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            jobs_file.close()
             self.is_processing = False
             self.current_batch_id = None
     
     async def _save_bulk_result(self, result: ProcessingResult):
         """Bulk işleme sonucunu kaydet"""
         try:
-            # JSON olarak kaydet
+            # JSON olarak kaydet; job'lar işleme sırasında yazılan JSONL dosyasında kalır
             result_file = self.results_dir / f"{result.batch_id}_result.json"
+            jobs_path = self._jobs_path(result.batch_id)
+            os.replace(self._jobs_temp_path(result.batch_id), jobs_path)
             
-            result_data = {
-                'batch_id': result.batch_id,
-                'summary': {
-                    'total_files': result.total_files,
-                    'successful_files': result.successful_files,
-                    'failed_files': result.failed_files,
-                    'cancelled_files': result.cancelled_files,
-                    'total_processing_time': result.total_processing_time,
-                    'average_processing_time': result.average_processing_time,
-                    'throughput_files_per_second': result.throughput_files_per_second,
-                    'started_at': result.started_at.isoformat(),
-                    'completed_at': result.completed_at.isoformat()
-                },
-                'jobs': [
-                    {
-                        'job_id': job.job_id,
-                        'file_path': job.file_path,
-                        'status': job.status.value,
-                        'processing_time': job.processing_time,
-                        'file_size': job.file_size,
-                        'error_message': job.error_message,
-                        'result_data': job.result_data
-                    }
-                    for job in result.jobs
-                ],
-                'error_summary': result.error_summary,
-                'performance_metrics': result.performance_metrics
-            }
+            if msgspec is not None:
+                payload = _encode_result_msgspec(result, jobs_path.name)
+            else:
+                result_data = {
+                    'batch_id': result.batch_id,
+                    'summary': {
+                        'total_files': result.total_files,
+                        'successful_files': result.successful_files,
+                        'failed_files': result.failed_files,
+                        'cancelled_files': result.cancelled_files,
+                        'total_processing_time': result.total_processing_time,
+                        'average_processing_time': result.average_processing_time,
+                        'throughput_files_per_second': result.throughput_files_per_second,
+                        'started_at': result.started_at,
+                        'completed_at': result.completed_at
+                    },
+                    'jobs_file': jobs_path.name,
+                    'error_summary': result.error_summary,
+                    'performance_metrics': result.performance_metrics
+                }
+                
+                # orjson encodes datetime/Enum natively and returns bytes: one write call
+                if orjson is not None:
+                    payload = orjson.dumps(result_data, option=orjson.OPT_INDENT_2, default=_json_default)
+                else:
+                    payload = json.dumps(result_data, indent=2, ensure_ascii=False, default=_json_default).encode('utf-8')
+            
+            result_file.write_bytes(payload)
             
-            with open(result_file, 'w', encoding='utf-8') as f:
-                json.dump(result_data, f, indent=2, ensure_ascii=False)
+            self._append_index(self._summarize_result(result))
             
             self.logger.info(f"Bulk result saved: {result_file}")
             
         except Exception as e:
             self.logger.error(f"Failed to save bulk result: {e}")
     
+    def _jobs_temp_path(self, batch_id: str) -> Path:
+        """Jobs JSONL of a batch while it is being processed"""
+        return self.temp_dir / f"{batch_id}.jobs.jsonl"
+    
+    def _jobs_path(self, batch_id: str) -> Path:
+        """Jobs JSONL of a saved batch (next to its _result.json)"""
+        return self.results_dir / f"{batch_id}_jobs.jsonl"
+    
+    def iter_batch_jobs(self, batch_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Bir batch'in job kayıtlarını dosyadan satır satır oku
+        
+        Args:
+            batch_id: Batch ID
+            
+        Yields:
+            Job dict'leri (yarım kalmış batch'lerde o ana kadar bitenler)
+        """
+        loads = orjson.loads if orjson is not None else json.loads
+        
+        for path in (self._jobs_path(batch_id), self._jobs_temp_path(batch_id)):
+            if path.exists():
+                with open(path, 'rb') as f:
+                    for line in f:
+                        # Son satır yazılırken kesilmiş olabilir
+                        if line.endswith(b"\n"):
+                            yield loads(line)
+                return
+        
+        # Eski formatta job'lar sonuç dosyasının içinde
+        result_file = self.results_dir / f"{batch_id}_result.json"
+        if result_file.exists():
+            yield from loads(result_file.read_bytes()).get('jobs', [])
+    
     def stop_processing(self):
         """İşlemeyi durdur"""
         self.should_stop = True
@@ -446,7 +999,7 @@ class BulkDocumentProcessor:
         return {
             'is_processing': self.is_processing,
             'current_batch_id': self.current_batch_id,
-            'active_jobs_count': len(self.active_jobs),
+            'active_jobs_count': self.active_jobs_count,
             'should_stop': self.should_stop,
             'config': {
                 'max_workers': self.config.max_workers,
@@ -455,6 +1008,77 @@ class BulkDocumentProcessor:
             }
         }
     
+    # Append-only index of batch summaries, one JSON object per line
+    INDEX_FILE = "_index.jsonl"
+    
+    @staticmethod
+    def _summarize_result(result: ProcessingResult) -> Dict[str, Any]:
+        """get_statistics'in kullandığı batch özeti"""
+        return {
+            'batch_id': result.batch_id,
+            'total_files': result.total_files,
+            'successful_files': result.successful_files,
+            'failed_files': result.failed_files,
+            'processing_time': result.total_processing_time,
+            'completed_at': result.completed_at.isoformat()
+        }
+    
+    def _append_index(self, *summaries: Dict[str, Any]):
+        """Batch özetlerini index dosyasının sonuna ekle"""
+        if orjson is not None:
+            lines = b"".join(orjson.dumps(summary) + b"\n" for summary in summaries)
+        else:
+            lines = "".join(json.dumps(summary, ensure_ascii=False) + "\n" for summary in summaries).encode('utf-8')
+        with open(self.results_dir / self.INDEX_FILE, 'ab') as f:
+            f.write(lines)
+    
+    def _rebuild_index(self):
+        """Index yoksa mevcut *_result.json dosyalarından bir kez oluştur"""
+        summaries = []
+        for result_file in self.results_dir.glob("*_result.json"):
+            try:
+                raw = result_file.read_bytes()
+                result_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+                summaries.append({
+                    'batch_id': result_data['batch_id'],
+                    'total_files': result_data['summary']['total_files'],
+                    'successful_files': result_data['summary']['successful_files'],
+                    'failed_files': result_data['summary']['failed_files'],
+                    'processing_time': result_data['summary']['total_processing_time'],
+                    'completed_at': result_data['summary']['completed_at']
+                })
+            except Exception as e:
+                self.logger.warning(f"Skipping unreadable result file {result_file}: {e}")
+        
+        self._append_index(*summaries)
+    
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Index'te son okumadan bu yana eklenen satırları oku
+        
+        Returns:
+            batch_id -> batch özeti (aynı batch tekrar kaydedildiyse son satır geçerli)
+        """
+        index_file = self.results_dir / self.INDEX_FILE
+        if not index_file.exists():
+            self._index_entries.clear()
+            self._index_offset = 0
+            self._rebuild_index()
+        
+        with open(index_file, 'rb') as f:
+            f.seek(self._index_offset)
+            data = f.read()
+        
+        # Yazımı sürmekte olan son (yarım) satır bir sonraki çağrıya kalır
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if line:
+                summary = orjson.loads(line) if orjson is not None else json.loads(line)
+                self._index_entries[summary['batch_id']] = summary
+        self._index_offset += end
+        
+        return self._index_entries
+    
     def get_statistics(self) -> Dict[str, Any]:
         """
         İşleme istatistiklerini getir
@@ -473,40 +1097,33 @@ class BulkDocumentProcessor:
         }
         
         try:
-            # Sonuç dosyalarını oku
-            result_files = list(self.results_dir.glob("*_result.json"))
+            # Özetler index dosyasından artımlı okunur; sonuç dosyaları tek tek açılmaz
+            summaries = list(self._read_index().values())
             
-            total_processing_time = 0
-            processing_times = []
+            processing_times = [summary['processing_time'] for summary in summaries]
+            total_processing_time = sum(processing_times)
             
-            for result_file in result_files:
-                with open(result_file, 'r', encoding='utf-8') as f:
-                    result_data = json.load(f)
-                
+            for summary in summaries:
                 stats['total_batches'] += 1
-                stats['total_processed_files'] += result_data['summary']['total_files']
-                stats['total_successful_files'] += result_data['summary']['successful_files']
-                stats['total_failed_files'] += result_data['summary']['failed_files']
-                
-                batch_time = result_data['summary']['total_processing_time']
-                total_processing_time += batch_time
-                processing_times.append(batch_time)
-                
-                # Son 5 batch'i ekle
-                if len(stats['recent_batches']) < 5:
-                    stats['recent_batches'].append({
-                        'batch_id': result_data['batch_id'],
-                        'total_files': result_data['summary']['total_files'],
-                        'successful_files': result_data['summary']['successful_files'],
-                        'processing_time': batch_time,
-                        'completed_at': result_data['summary']['completed_at']
-                    })
+                stats['total_processed_files'] += summary['total_files']
+                stats['total_successful_files'] += summary['successful_files']
+                stats['total_failed_files'] += summary['failed_files']
             
-            stats['total_processing_time'] = total_processing_time
-            stats['average_processing_time'] = sum(processing_times) / len(processing_times) if processing_times else 0
+            # Son 5 batch
+            recent = sorted(summaries, key=lambda x: x['completed_at'], reverse=True)[:5]
+            stats['recent_batches'] = [
+                {
+                    'batch_id': summary['batch_id'],
+                    'total_files': summary['total_files'],
+                    'successful_files': summary['successful_files'],
+                    'processing_time': summary['processing_time'],
+                    'completed_at': summary['completed_at']
+                }
+                for summary in recent
+            ]
             
-            # Son batch'leri tarih sırasına göre sırala
-            stats['recent_batches'].sort(key=lambda x: x['completed_at'], reverse=True)
+            stats['total_processing_time'] = total_processing_time
+            stats['average_processing_time'] = total_processing_time / len(processing_times) if processing_times else 0
             
         except Exception as e:
             self.logger.error(f"Error calculating statistics: {e}")
@@ -0,0 +1,185 @@
+"""
+Report Chart Rendering
+ReportGenerator grafiklerini çizen, yalnızca primitive argüman alan fonksiyonlar
+
+Fonksiyonlar modül seviyesinde olduğu için süreç havuzunda paralel çalıştırılabilir.
+"""
+
+import io
+import os
+import threading
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import matplotlib
+# GUI'siz backend: dosyaya çizim için pencere sistemi gerekmez
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import seaborn as sns
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# (render fonksiyonunun adı, keyword argümanları) - kwargs her zaman hedef 'path'i içerir.
+# Ad ile taşınır ki spec üreten kod bu modülü (ve matplotlib'i) import etmek zorunda kalmasın.
+ChartSpec = Tuple[str, Dict[str, Any]]
+
+def apply_chart_style():
+    """Rapor grafik stilini uygula (ana süreçte ve her worker'da bir kez)"""
+    plt.style.use('seaborn-v0_8')
+    sns.set_palette("husl")
+
+def render_chart(spec: ChartSpec) -> str:
+    """Bir grafik spec'ini çiz ve dosya yolunu döndür"""
+    name, kwargs = spec
+    _RENDERERS[name](**kwargs)
+    return kwargs["path"]
+
+# Thread (worker süreçlerinde süreç) başına tek Figure; her grafikte temizlenip yeniden kullanılır
+_local = threading.local()
+
+def _figure(figsize: Tuple[int, int]) -> Figure:
+    """Yeniden kullanılan Figure'ı temizleyip istenen boyuta getir"""
+    fig = getattr(_local, "figure", None)
+    if fig is None:
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        _local.figure = fig
+    else:
+        fig.clear()
+    fig.set_size_inches(figsize)
+    return fig
+
+def _save(fig: Figure, path: str, dpi: int):
+    # PNG önce belleğe çizilir, dosyaya tek write ile yazılır
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, buffer.getbuffer())
+    finally:
+        os.close(fd)
+
+def _draw_bar(ax, labels: Sequence[str], values: Sequence[float], title: str, xlabel: str,
+              ylabel: str, color: Any = 'skyblue', rotate_labels: bool = False):
+    ax.bar(labels, values, color=color, alpha=0.7)
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    if rotate_labels:
+        ax.tick_params(axis='x', labelrotation=45)
+
+def _draw_success_histogram(ax, success_rates: Sequence[float]):
+    average = sum(success_rates) / len(success_rates)
+    
+    ax.hist(success_rates, bins=10, color='lightgreen', alpha=0.7, edgecolor='black')
+    ax.set_title('Success Rate Distribution', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Success Rate (%)')
+    ax.set_ylabel('Number of Batches')
+    ax.axvline(average, color='red', linestyle='--', label=f'Average: {average:.1f}%')
+    ax.legend()
+
+def _draw_pie(ax, labels: Sequence[str], values: Sequence[float], title: str):
+    ax.pie(values, labels=labels, autopct='%1.1f%%', startangle=90)
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.axis('equal')
+
+def _draw_trend(ax, timestamps: List[Any], values: List[float], title: str, ylabel: str,
+                marker: str, color: Any = None):
+    ax.plot(timestamps, values, marker=marker, color=color, linewidth=2, markersize=6)
+    ax.set_title(title, fontweight='bold')
+    ax.set_ylabel(ylabel)
+    ax.grid(True, alpha=0.3)
+
+def _trend_panels(timestamps: List[Any], success_rates: List[float], processing_times: List[float],
+                  query_counts: List[int], efficiency: List[float]) -> List[Tuple[Callable[..., None], Dict[str, Any]]]:
+    """Trend grafiğinin dört paneli: başarı, süre, hacim ve verimlilik (başarı / süre)"""
+    return [
+        (_draw_trend, {"timestamps": timestamps, "values": success_rates, "title": 'Success Rate Trend',
+                       "ylabel": 'Success Rate (%)', "marker": 'o'}),
+        (_draw_trend, {"timestamps": timestamps, "values": processing_times, "title": 'Processing Time Trend',
+                       "ylabel": 'Processing Time (seconds)', "marker": 's', "color": 'orange'}),
+        (_draw_trend, {"timestamps": timestamps, "values": query_counts, "title": 'Query Volume Trend',
+                       "ylabel": 'Number of Queries', "marker": '^', "color": 'green'}),
+        (_draw_trend, {"timestamps": timestamps, "values": efficiency, "title": 'Efficiency Trend (Success/Time)',
+                       "ylabel": 'Efficiency Score', "marker": 'D', "color": 'purple'}),
+    ]
+
+def render_bar(path: str, labels: Sequence[str], values: Sequence[float], title: str,
+               xlabel: str, ylabel: str, dpi: int, figsize: Tuple[int, int] = (10, 6),
+               color: Any = 'skyblue', rotate_labels: bool = False):
+    """Çubuk grafik"""
+    fig = _figure(figsize)
+    _draw_bar(fig.add_subplot(111), labels, values, title, xlabel, ylabel, color, rotate_labels)
+    if rotate_labels:
+        fig.tight_layout()
+    _save(fig, path, dpi)
+
+def render_success_histogram(path: str, success_rates: Sequence[float], dpi: int):
+    """Başarı oranı dağılımı, ortalama çizgisiyle"""
+    fig = _figure((10, 6))
+    _draw_success_histogram(fig.add_subplot(111), success_rates)
+    fig.tight_layout()
+    _save(fig, path, dpi)
+
+def render_pie(path: str, labels: Sequence[str], values: Sequence[float], title: str,
+               dpi: int, figsize: Tuple[int, int] = (8, 6)):
+    """Pasta grafik"""
+    fig = _figure(figsize)
+    _draw_pie(fig.add_subplot(111), labels, values, title)
+    _save(fig, path, dpi)
+
+def render_trends(path: str, timestamps: List[Any], success_rates: List[float],
+                  processing_times: List[float], query_counts: List[int],
+                  efficiency: List[float], dpi: int):
+    """Başarı, süre, hacim ve verimlilik trendleri (2x2)"""
+    fig = _figure((15, 10))
+    panels = _trend_panels(timestamps, success_rates, processing_times, query_counts, efficiency)
+    for ax, (draw, kwargs) in zip(fig.subplots(2, 2).flat, panels):
+        draw(ax, **kwargs)
+    
+    fig.tight_layout()
+    _save(fig, path, dpi)
+
+def render_dashboard(path: str, charts: List[ChartSpec], dpi: int, columns: int = 3):
+    """
+    Tüm grafik spec'lerini tek bir çok panelli figürde çiz (tek PNG)
+    
+    Args:
+        path: Çıktı dosyası
+        charts: Tek dosya modunda çizilecek spec'ler (path/dpi/figsize yok sayılır)
+        dpi: Çözünürlük
+        columns: Satır başına panel sayısı
+    """
+    panels = []
+    for name, kwargs in charts:
+        kwargs = {k: v for k, v in kwargs.items() if k not in ("path", "dpi", "figsize")}
+        if name == "render_trends":
+            panels.extend(_trend_panels(**kwargs))
+        else:
+            panels.append((_DRAWERS[name], kwargs))
+    
+    rows = max(1, -(-len(panels) // columns))
+    fig = _figure((6 * columns, 5 * rows))
+    axes = list(fig.subplots(rows, columns, squeeze=False).flat)
+    for ax, (draw, kwargs) in zip(axes, panels):
+        draw(ax, **kwargs)
+    # Kullanılmayan hücreler görünmez
+    for ax in axes[len(panels):]:
+        ax.set_visible(False)
+    
+    fig.tight_layout()
+    _save(fig, path, dpi)
+
+_RENDERERS: Dict[str, Callable[..., None]] = {
+    "render_bar": render_bar,
+    "render_success_histogram": render_success_histogram,
+    "render_pie": render_pie,
+    "render_trends": render_trends,
+    "render_dashboard": render_dashboard,
+}
+
+# Dashboard modunda tek eksene çizilen spec'ler
+_DRAWERS: Dict[str, Callable[..., None]] = {
+    "render_bar": _draw_bar,
+    "render_success_histogram": _draw_success_histogram,
+    "render_pie": _draw_pie,
+}
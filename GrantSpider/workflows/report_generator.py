@@ -3,20 +3,74 @@ Advanced Report Generator
 Gelişmiş rapor üretimi, analitik ve görselleştirme sistemi
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import json
 import csv
+import hashlib
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-import matplotlib.pyplot as plt
-import pandas as pd
-from collections import defaultdict, Counter
-import seaborn as sns
+import numpy as np
+from collections import defaultdict
 
 from workflows.batch_processor import BatchAnalysisResult, QueryResult
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# pandas ve grafik modülü (matplotlib/seaborn) ilk rapor üretiminde import edilir;
+# ReportGenerator'ı yalnızca oluşturan modüller bu maliyeti ödemez
+if TYPE_CHECKING:
+    import pandas as pd
+    from workflows.report_charts import ChartSpec
+
+# slots=True yalnızca Python 3.10+ dataclass'larında var
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+def _grant_type_matcher(patterns: Dict[str, List[int]]) -> Callable[[str], Set[int]]:
+    """
+    Küçük harfli metinde geçen desenlerin indekslerini döndüren eşleştirici
+    
+    pyahocorasick varsa tüm desenler tek bir otomat taramasında bulunur,
+    yoksa her desen için substring araması yapılır.
+    
+    Args:
+        patterns: Küçük harfli desen -> grant tipi indeksleri
+        
+    Returns:
+        Metin alıp eşleşen indeks kümesini döndüren fonksiyon
+    """
+    # Boş desen her metinde geçer; otomata eklenemediği için substring yoluna düşer
+    if ahocorasick is not None and patterns and "" not in patterns:
+        automaton = ahocorasick.Automaton()
+        for pattern, indices in patterns.items():
+            automaton.add_word(pattern, indices)
+        automaton.make_automaton()
+        
+        def match(text: str) -> Set[int]:
+            found = set()
+            for _, indices in automaton.iter(text):
+                found.update(indices)
+            return found
+        
+        return match
+    
+    items = list(patterns.items())
+    return lambda text: {index for pattern, indices in items if pattern in text for index in indices}
 
-@dataclass
+@dataclass(**_SLOTS)
 class AnalyticsReport:
     """Analytics raporu veri sınıfı"""
     report_id: str
@@ -25,10 +79,27 @@ class AnalyticsReport:
     generated_at: datetime
     data_period: Dict[str, datetime]  # start_date, end_date
     summary: Dict[str, Any]
-    sections: List[Dict[str, Any]] = field(default_factory=list)
+    # Bölümler kolon kolon tutulur: i. bölüm = (section_titles[i], section_descriptions[i], section_metrics[i])
+    section_titles: List[str] = field(default_factory=list)
+    section_descriptions: List[str] = field(default_factory=list)
+    section_metrics: List[Dict[str, Any]] = field(default_factory=list)
     visualizations: List[str] = field(default_factory=list)  # file paths
     export_formats: List[str] = field(default_factory=list)  # json, csv, pdf
     
+    def add_section(self, section: Dict[str, Any]):
+        """Bölüm sözlüğünü kolonlara ekle"""
+        self.section_titles.append(section["title"])
+        self.section_descriptions.append(section["description"])
+        self.section_metrics.append(section["metrics"])
+    
+    @property
+    def sections(self) -> List[Dict[str, Any]]:
+        """Bölümlerin eski (bölüm başına sözlük) görünümü"""
+        return [
+            {"title": title, "description": description, "metrics": metrics}
+            for title, description, metrics in zip(self.section_titles, self.section_descriptions, self.section_metrics)
+        ]
+    
     def to_dict(self) -> Dict[str, Any]:
         """Dictionary'ye dönüştür"""
         return {
@@ -36,79 +107,109 @@ class AnalyticsReport:
             "title": self.title,
             "description": self.description,
             "generated_at": self.generated_at.isoformat(),
-            "data_period": {k: v.isoformat() for k, v in self.data_period.items()},
+            "data_period": {
+                "start_date": self.data_period["start_date"].isoformat(),
+                "end_date": self.data_period["end_date"].isoformat()
+            },
             "summary": self.summary,
             "sections": self.sections,
             "visualizations": self.visualizations,
             "export_formats": self.export_formats
         }
 
+@dataclass(**_SLOTS)
+class AggregatedMetrics:
+    """Rapor bölümlerinin paylaştığı, sonuçlar üzerinde tek geçişte toplanan kolonlar"""
+    batch_count: int
+    batches: pd.DataFrame  # Batch başına bir satır
+    query_times: np.ndarray
+    source_counts: np.ndarray
+    word_counts: np.ndarray
+    response_lengths: np.ndarray  # Yalnızca boş olmayan yanıtlar
+    languages: pd.Series  # Dil başına sorgu sayısı (ilk görülme sırası)
+    grant_types: pd.Series  # Grant tipi başına grant_groups sayılarının toplamı (ilk görülme sırası)
+    cross_doc_grant_types: pd.Series  # Grant tipi başına birden fazla dokümanla analiz edilen sonuç sayısı
+    grant_group_results: int  # grant_groups içeren sonuç sayısı
+
 class ReportGenerator:
     """Gelişmiş rapor üretici sınıfı"""
     
-    def __init__(self, output_dir: str = "interfaces/data/reports"):
+    # Pasta grafiklerde ayrı dilim olarak gösterilen en sık değer sayısı (kalanı "Other")
+    PIE_SLICES = 10
+    
+    def __init__(self, output_dir: str = "interfaces/data/reports", high_res: bool = False,
+                 chart_workers: int = 1):
+        """
+        Args:
+            output_dir: Rapor ve grafiklerin yazılacağı klasör
+            high_res: Grafikleri 300 dpi çiz (varsayılan 150 dpi, ~4 kat daha az piksel)
+            chart_workers: Grafikleri paralel çizen süreç sayısı (varsayılan 1 = bu süreçte sıralı;
+                           >1 spawn havuzu açar, çağıran betiğin __main__ korumalı olması gerekir)
+        """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Görselleştirme ayarları
-        plt.style.use('seaborn-v0_8')
-        sns.set_palette("husl")
+        # Görselleştirme ayarları (grafik stili ilk çizimde uygulanır)
+        self._chart_style_applied = False
+        self.chart_dpi = 300 if high_res else 150
+        self.chart_workers = max(1, chart_workers or 1)
+        self._chart_pool: Optional[ProcessPoolExecutor] = None
         
         print("📊 ReportGenerator başlatılıyor...")
     
     def generate_comprehensive_analytics_report(self, 
                                               batch_results: List[BatchAnalysisResult],
-                                              time_period: Optional[Tuple[datetime, datetime]] = None) -> AnalyticsReport:
+                                              time_period: Optional[Tuple[datetime, datetime]] = None,
+                                              cache: bool = True,
+                                              combined: bool = False) -> AnalyticsReport:
         """
         Kapsamlı analitik rapor üret
         
         Args:
             batch_results: Batch analiz sonuçları
             time_period: Analiz edilecek zaman aralığı
+            cache: Aynı girdiler için daha önce üretilmiş raporu yeniden kullan
+                   (girdiler yerinde değiştirildiyse False verin)
+            combined: Grafikleri ayrı dosyalar yerine tek bir çok panelli dashboard PNG'sine çiz
             
         Returns:
             Analitik rapor
         """
-        report_id = f"analytics_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        cache_path = None
+        if cache:
+            cache_path = self.output_dir / f"cache_{self._report_cache_key(batch_results, time_period, combined, self.chart_dpi)}.json"
+            cached = self._load_cached_report(cache_path)
+            if cached is not None:
+                print(f"♻️ Önbellekteki analitik rapor kullanılıyor: {cached.report_id}")
+                return cached
+        
+        # Sorgu sonuçları bellekten atılmış batch'ler toplamlarla sorgu metriklerini tutarsız kılar
+        stripped = sum(1 for r in batch_results if r.results_stripped)
+        if stripped:
+            print(f"⚠️ Sorgu sonuçları bellekte olmayan {stripped} batch rapora dahil edilmedi")
+            batch_results = [r for r in batch_results if not r.results_stripped]
+        
+        # Zaman damgası olmayan batch'ler için tek bir "şimdi" kullanılır
+        now = datetime.now()
+        report_id = f"analytics_{now.strftime('%Y%m%d_%H%M%S')}"
         
         # Zaman aralığını belirle
         if time_period:
             start_date, end_date = time_period
             filtered_results = [r for r in batch_results 
-                              if start_date <= (r.started_at or datetime.now()) <= end_date]
+                              if start_date <= (r.started_at or now) <= end_date]
         else:
             filtered_results = batch_results
-            start_date = min((r.started_at or datetime.now()) for r in filtered_results) if filtered_results else datetime.now()
-            end_date = max((r.completed_at or datetime.now()) for r in filtered_results) if filtered_results else datetime.now()
+            start_date = min((r.started_at or now) for r in filtered_results) if filtered_results else now
+            end_date = max((r.completed_at or now) for r in filtered_results) if filtered_results else now
         
         print(f"📈 Analitik rapor oluşturuluyor: {len(filtered_results)} batch sonucu analiz ediliyor")
         
-        # Ana analiz
-        summary = self._generate_summary_analytics(filtered_results)
+        # Tüm bölümlerin ihtiyaç duyduğu kolonlar tek geçişte toplanır
+        metrics = self._collect_all(filtered_results)
         
-        # Rapor bölümleri
-        sections = []
-        visualizations = []
-        
-        # 1. Genel performans analizi
-        performance_section, perf_charts = self._generate_performance_section(filtered_results, report_id)
-        sections.append(performance_section)
-        visualizations.extend(perf_charts)
-        
-        # 2. Grant analizi
-        grant_section, grant_charts = self._generate_grant_analysis_section(filtered_results, report_id)
-        sections.append(grant_section)
-        visualizations.extend(grant_charts)
-        
-        # 3. Sorgu analizi
-        query_section, query_charts = self._generate_query_analysis_section(filtered_results, report_id)
-        sections.append(query_section)
-        visualizations.extend(query_charts)
-        
-        # 4. Trend analizi
-        trend_section, trend_charts = self._generate_trend_analysis_section(filtered_results, report_id)
-        sections.append(trend_section)
-        visualizations.extend(trend_charts)
+        # Ana analiz
+        summary = self._generate_summary_analytics(metrics)
         
         # Rapor nesnesi oluştur
         report = AnalyticsReport(
@@ -117,59 +218,272 @@ class ReportGenerator:
             description=f"Analysis of {len(filtered_results)} batch operations from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}",
             generated_at=datetime.now(),
             data_period={"start_date": start_date, "end_date": end_date},
-            summary=summary,
-            sections=sections,
-            visualizations=visualizations
+            summary=summary
         )
         
+        # Rapor bölümleri (grafikler önce spec olarak toplanır, sonra birlikte çizilir)
+        chart_specs = []
+        for generate_section in (
+            self._generate_performance_section,       # 1. Genel performans analizi
+            self._generate_grant_analysis_section,    # 2. Grant analizi
+            self._generate_query_analysis_section,    # 3. Sorgu analizi
+            self._generate_trend_analysis_section     # 4. Trend analizi
+        ):
+            section, section_charts = generate_section(metrics, report_id)
+            report.add_section(section)
+            chart_specs.extend(section_charts)
+        
+        if combined and chart_specs:
+            chart_specs = [("render_dashboard", {
+                "path": str(self.output_dir / f"{report_id}_dashboard.png"),
+                "charts": chart_specs,
+                "dpi": self.chart_dpi
+            })]
+        report.visualizations = self._render_charts(chart_specs)
+        
         # Raporu kaydet
         self._save_report(report)
         
+        # Çizilemeyen grafik varsa eksik rapor önbelleğe alınmaz
+        if cache_path is not None and len(report.visualizations) == len(chart_specs):
+            try:
+                self._dump_report_json(report, cache_path)
+            except Exception as e:
+                print(f"⚠️ Rapor önbelleği yazılamadı: {e}")
+        
         print(f"✅ Analitik rapor oluşturuldu: {report.report_id}")
         return report
     
-    def _generate_summary_analytics(self, batch_results: List[BatchAnalysisResult]) -> Dict[str, Any]:
-        """Özet analitikler üret"""
-        if not batch_results:
-            return {}
-        
-        # Toplam metrikler
-        total_batches = len(batch_results)
-        total_queries = sum(r.total_queries for r in batch_results)
-        total_successful = sum(r.successful_queries for r in batch_results)
-        total_failed = sum(r.failed_queries for r in batch_results)
+    @staticmethod
+    def _report_cache_key(batch_results: List[BatchAnalysisResult],
+                          time_period: Optional[Tuple[datetime, datetime]],
+                          combined: bool = False, chart_dpi: int = 150) -> str:
+        """
+        Rapor girdilerinin ucuz parmak izi
         
-        # Timing analizi
-        processing_times = []
+        Yalnızca batch başına skaler alanlar hashlenir, sonuç içerikleri okunmaz.
+        """
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(repr((time_period, combined, chart_dpi)).encode())
         for batch in batch_results:
-            if batch.total_processing_time > 0:
-                processing_times.append(batch.total_processing_time)
+            hasher.update(repr((
+                batch.request_id, batch.status.value, batch.total_queries, batch.successful_queries,
+                batch.failed_queries, batch.total_processing_time, len(batch.results),
+                batch.started_at, batch.completed_at
+            )).encode())
+        return hasher.hexdigest()
+    
+    @staticmethod
+    def _load_cached_report(cache_path: Path) -> Optional[AnalyticsReport]:
+        """Önbellekteki raporu yükle (yoksa/okunamazsa None)"""
+        if not cache_path.exists():
+            return None
+        
+        try:
+            if orjson is not None:
+                data = orjson.loads(cache_path.read_bytes())
+            else:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            
+            report = AnalyticsReport(
+                report_id=data["report_id"],
+                title=data["title"],
+                description=data["description"],
+                generated_at=datetime.fromisoformat(data["generated_at"]),
+                data_period={k: datetime.fromisoformat(v) for k, v in data["data_period"].items()},
+                summary=data["summary"],
+                visualizations=data["visualizations"],
+                export_formats=data["export_formats"]
+            )
+            # Grafik dosyaları silinmişse önbellek geçersiz
+            if not all(Path(path).exists() for path in report.visualizations):
+                return None
+            for section in data["sections"]:
+                report.add_section(section)
+            return report
+        except Exception as e:
+            print(f"⚠️ Rapor önbelleği okunamadı: {e}")
+            return None
+    
+    def invalidate_cache(self):
+        """Önbelleğe alınmış tüm raporları sil"""
+        for cache_file in self.output_dir.glob("cache_*.json"):
+            try:
+                cache_file.unlink()
+            except OSError as e:
+                print(f"⚠️ Önbellek dosyası silinemedi {cache_file}: {e}")
+    
+    def _collect_all(self, batch_results: List[BatchAnalysisResult]) -> AggregatedMetrics:
+        """
+        Batch ve sorgu sonuçlarını tek geçişte rapor kolonlarına dönüştür
+        
+        Args:
+            batch_results: Batch analiz sonuçları
+            
+        Returns:
+            Bölüm üreticilerinin paylaştığı toplu metrikler
+        """
+        import pandas as pd
         
-        avg_batch_time = sum(processing_times) / len(processing_times) if processing_times else 0
+        batches = pd.DataFrame(
+            [(b.total_queries, b.successful_queries, b.failed_queries, b.total_processing_time, b.started_at)
+             for b in batch_results],
+            columns=["total_queries", "successful_queries", "failed_queries", "total_processing_time", "started_at"]
+        )
         
-        # Query-level timing
         query_times = []
+        source_counts = []
+        word_counts = []
+        response_lengths = []
+        languages = []
+        grant_type_names = []
+        grant_type_counts = []
+        grant_group_results = 0
+        
         for batch in batch_results:
             for result in batch.results:
-                if result.processing_time > 0:
-                    query_times.append(result.processing_time)
+                query_times.append(result.processing_time)
+                source_counts.append(len(result.sources))
+                # BatchQuery'de bir kez sayılan değer; eski kayıtlarda yoksa yeniden sayılır
+                word_counts.append(result.word_count or len(result.query.split()))
+                languages.append(result.detected_language)
+                if result.response:
+                    response_lengths.append(len(result.response))
+                
+                cross_doc = result.cross_document_analysis
+                if cross_doc and "grant_groups" in cross_doc:
+                    grant_group_results += 1
+                    grant_groups = cross_doc["grant_groups"]
+                    grant_type_names.extend(grant_groups.keys())
+                    grant_type_counts.extend(grant_groups.values())
+        
+        # (grant_type, count) satırları pandas groupby ile toplanır; sort=False ilk görülme sırasını korur
+        grant_df = pd.DataFrame({"grant_type": grant_type_names, "count": grant_type_counts})
+        grant_types = grant_df.groupby("grant_type", sort=False)["count"].sum()
+        # count > 1: cross-document analysis yapıldı
+        cross_doc_grant_types = grant_df[grant_df["count"] > 1].groupby("grant_type", sort=False).size()
+        
+        return AggregatedMetrics(
+            batch_count=len(batch_results),
+            batches=batches,
+            query_times=np.asarray(query_times, dtype=np.float64),
+            source_counts=np.asarray(source_counts, dtype=np.int64),
+            word_counts=np.asarray(word_counts, dtype=np.int64),
+            response_lengths=np.asarray(response_lengths, dtype=np.int64),
+            languages=pd.Series(languages, dtype=object).value_counts(sort=False),
+            grant_types=grant_types,
+            cross_doc_grant_types=cross_doc_grant_types,
+            grant_group_results=grant_group_results
+        )
+    
+    def _render_charts(self, specs: List[ChartSpec]) -> List[str]:
+        """
+        Grafik spec'lerini çiz (birden fazlaysa süreç havuzunda paralel)
+        
+        Returns:
+            Çizilen grafik dosyalarının yolları, spec sırasıyla
+        """
+        from workflows.report_charts import apply_chart_style, render_chart
+        
+        if len(specs) <= 1 or self.chart_workers <= 1:
+            self._apply_chart_style()
+            return [render_chart(spec) for spec in specs]
+        
+        if self._chart_pool is None:
+            # spawn: Streamlit ve metrik thread'leri çalışırken fork güvenli değil
+            self._chart_pool = ProcessPoolExecutor(
+                max_workers=self.chart_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=apply_chart_style
+            )
+        
+        paths: List[Optional[str]] = [None] * len(specs)
+        broken: List[int] = []
+        futures = {self._chart_pool.submit(render_chart, spec): index for index, spec in enumerate(specs)}
+        for future in as_completed(futures):
+            try:
+                paths[futures[future]] = future.result()
+            except BrokenProcessPool:
+                broken.append(futures[future])
+            except Exception as e:
+                print(f"⚠️ Grafik oluşturma hatası: {e}")
+        
+        if broken:
+            # Worker'lar başlatılamadı (ör. __main__ koruması olmayan betik): bu süreçte sıralı çiz
+            print("⚠️ Grafik süreç havuzu kullanılamıyor, grafikler sıralı çiziliyor")
+            self.close()
+            self.chart_workers = 1
+            self._apply_chart_style()
+            for index in sorted(broken):
+                try:
+                    paths[index] = render_chart(specs[index])
+                except Exception as e:
+                    print(f"⚠️ Grafik oluşturma hatası: {e}")
+        
+        return [path for path in paths if path is not None]
+    
+    def _apply_chart_style(self):
+        """Grafik stilini bu süreçte bir kez uygula"""
+        if not self._chart_style_applied:
+            from workflows.report_charts import apply_chart_style
+            apply_chart_style()
+            self._chart_style_applied = True
+    
+    def close(self):
+        """Grafik süreç havuzunu kapat"""
+        if self._chart_pool is not None:
+            self._chart_pool.shutdown(wait=False)
+            self._chart_pool = None
+    
+    @classmethod
+    def _pie_slices(cls, counts: pd.Series) -> Tuple[List[str], List[int]]:
+        """
+        Pasta grafik dilimleri: sıklığa göre azalan, PIE_SLICES'tan fazlası "Other" altında
+        
+        Args:
+            counts: Etiket başına sayılar
+            
+        Returns:
+            (etiketler, değerler)
+        """
+        ordered = counts.sort_values(ascending=False, kind="stable")
+        labels = ordered.index[:cls.PIE_SLICES].tolist()
+        values = ordered.iloc[:cls.PIE_SLICES].tolist()
+        if len(ordered) > cls.PIE_SLICES:
+            labels.append("Other")
+            values.append(int(ordered.iloc[cls.PIE_SLICES:].sum()))
+        return labels, values
+    
+    def _generate_summary_analytics(self, metrics: AggregatedMetrics) -> Dict[str, Any]:
+        """Özet analitikler üret"""
+        if not metrics.batch_count:
+            return {}
+        
+        batch_df = metrics.batches
         
-        avg_query_time = sum(query_times) / len(query_times) if query_times else 0
+        # Toplam metrikler
+        total_batches = metrics.batch_count
+        totals = batch_df[["total_queries", "successful_queries", "failed_queries"]].sum()
+        total_queries = int(totals["total_queries"])
+        total_successful = int(totals["successful_queries"])
+        total_failed = int(totals["failed_queries"])
+        
+        # Timing analizi (batch ve sorgu seviyesi, yalnızca ölçülmüş süreler)
+        batch_times = batch_df["total_processing_time"]
+        batch_times = batch_times[batch_times > 0]
+        avg_batch_time = float(batch_times.mean()) if len(batch_times) else 0
+        
+        query_times = metrics.query_times[metrics.query_times > 0]
+        avg_query_time = float(query_times.mean()) if query_times.size else 0
         
         # Success rate
         success_rate = (total_successful / total_queries) * 100 if total_queries > 0 else 0
         
         # Grant analysis
-        grant_types_found = set()
-        cross_doc_count = 0
-        total_sources = 0
-        
-        for batch in batch_results:
-            for result in batch.results:
-                if result.cross_document_analysis and "grant_groups" in result.cross_document_analysis:
-                    grant_types_found.update(result.cross_document_analysis["grant_groups"].keys())
-                    cross_doc_count += 1
-                total_sources += len(result.sources)
+        grant_types_found = metrics.grant_types.index.tolist()
+        cross_doc_count = metrics.grant_group_results
+        total_sources = int(metrics.source_counts.sum())
         
         return {
             "total_batches": total_batches,
@@ -180,131 +494,115 @@ class ReportGenerator:
             "average_batch_processing_time": round(avg_batch_time, 2),
             "average_query_processing_time": round(avg_query_time, 2),
             "unique_grant_types_analyzed": len(grant_types_found),
-            "grant_types_list": list(grant_types_found),
+            "grant_types_list": grant_types_found,
             "cross_document_analyses_performed": cross_doc_count,
             "total_sources_found": total_sources,
             "average_sources_per_query": round(total_sources / total_queries, 2) if total_queries > 0 else 0
         }
     
-    def _generate_performance_section(self, batch_results: List[BatchAnalysisResult], report_id: str) -> Tuple[Dict[str, Any], List[str]]:
+    def _generate_performance_section(self, metrics: AggregatedMetrics, report_id: str) -> Tuple[Dict[str, Any], List[ChartSpec]]:
         """Performans analizi bölümü"""
         charts = []
         
-        # Processing time distribution chart
-        processing_times = []
-        batch_names = []
+        batch_df = metrics.batches
         
-        for i, batch in enumerate(batch_results):
-            if batch.total_processing_time > 0:
-                processing_times.append(batch.total_processing_time)
-                batch_names.append(f"Batch {i+1}")
+        # Processing time distribution chart
+        all_times = batch_df["total_processing_time"].to_numpy(dtype=np.float64)
+        timed = np.flatnonzero(all_times > 0)
+        processing_times = all_times[timed]
+        batch_names = [f"Batch {i+1}" for i in timed]
         
-        if processing_times:
+        if processing_times.size:
             # Processing time chart
-            plt.figure(figsize=(12, 6))
-            plt.bar(batch_names, processing_times, color='skyblue', alpha=0.7)
-            plt.title('Batch Processing Times', fontsize=14, fontweight='bold')
-            plt.xlabel('Batch')
-            plt.ylabel('Processing Time (seconds)')
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            
-            chart_path = self.output_dir / f"{report_id}_processing_times.png"
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            charts.append(str(chart_path))
+            charts.append(("render_bar", {
+                "path": str(self.output_dir / f"{report_id}_processing_times.png"),
+                "labels": batch_names,
+                "values": processing_times.tolist(),
+                "title": 'Batch Processing Times',
+                "xlabel": 'Batch',
+                "ylabel": 'Processing Time (seconds)',
+                "figsize": (12, 6),
+                "color": 'skyblue',
+                "rotate_labels": True,
+                "dpi": self.chart_dpi
+            }))
         
         # Success rate chart
-        success_rates = []
-        for batch in batch_results:
-            if batch.total_queries > 0:
-                rate = (batch.successful_queries / batch.total_queries) * 100
-                success_rates.append(rate)
-        
-        if success_rates:
-            plt.figure(figsize=(10, 6))
-            plt.hist(success_rates, bins=10, color='lightgreen', alpha=0.7, edgecolor='black')
-            plt.title('Success Rate Distribution', fontsize=14, fontweight='bold')
-            plt.xlabel('Success Rate (%)')
-            plt.ylabel('Number of Batches')
-            plt.axvline(sum(success_rates)/len(success_rates), color='red', linestyle='--', label=f'Average: {sum(success_rates)/len(success_rates):.1f}%')
-            plt.legend()
-            plt.tight_layout()
-            
-            chart_path = self.output_dir / f"{report_id}_success_rates.png"
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            charts.append(str(chart_path))
+        with_queries = batch_df[batch_df["total_queries"] > 0]
+        success_rates = (with_queries["successful_queries"] / with_queries["total_queries"] * 100).to_numpy()
+        
+        if success_rates.size:
+            charts.append(("render_success_histogram", {
+                "path": str(self.output_dir / f"{report_id}_success_rates.png"),
+                "success_rates": success_rates.tolist(),
+                "dpi": self.chart_dpi
+            }))
+        
+        # Süre istatistikleri dizi üzerinde birer kez hesaplanır (min/max tekrar taranmaz)
+        fastest = slowest = average_time = consistency = 0
+        if processing_times.size:
+            fastest = float(processing_times.min())
+            slowest = float(processing_times.max())
+            average_time = round(float(processing_times.mean()), 2)
+            consistency = round(1 - (slowest - fastest) / slowest, 2)
         
         # Performance section data
         section_data = {
             "title": "Performance Analysis",
             "description": "Analysis of system performance metrics",
             "metrics": {
-                "average_success_rate": round(sum(success_rates) / len(success_rates), 2) if success_rates else 0,
-                "average_processing_time": round(sum(processing_times) / len(processing_times), 2) if processing_times else 0,
-                "fastest_batch": min(processing_times) if processing_times else 0,
-                "slowest_batch": max(processing_times) if processing_times else 0,
-                "performance_consistency": round(1 - (max(processing_times) - min(processing_times)) / max(processing_times), 2) if processing_times else 0
+                "average_success_rate": round(float(success_rates.mean()), 2) if success_rates.size else 0,
+                "average_processing_time": average_time,
+                "fastest_batch": fastest,
+                "slowest_batch": slowest,
+                "performance_consistency": consistency
             }
         }
         
         return section_data, charts
     
-    def _generate_grant_analysis_section(self, batch_results: List[BatchAnalysisResult], report_id: str) -> Tuple[Dict[str, Any], List[str]]:
+    def _generate_grant_analysis_section(self, metrics: AggregatedMetrics, report_id: str) -> Tuple[Dict[str, Any], List[ChartSpec]]:
         """Grant analizi bölümü"""
         charts = []
         
         # Grant type frequency analysis
-        grant_type_counts = Counter()
-        cross_doc_counts = Counter()
-        
-        for batch in batch_results:
-            for result in batch.results:
-                cross_doc = result.cross_document_analysis
-                if cross_doc and "grant_groups" in cross_doc:
-                    for grant_type, count in cross_doc["grant_groups"].items():
-                        grant_type_counts[grant_type] += count
-                        if count > 1:  # Cross-document analysis yapıldı
-                            cross_doc_counts[grant_type] += 1
+        grant_type_counts = metrics.grant_types
+        cross_doc_counts = metrics.cross_doc_grant_types
         
         # Grant type distribution chart
-        if grant_type_counts:
-            plt.figure(figsize=(12, 8))
-            grant_types = list(grant_type_counts.keys())
-            counts = list(grant_type_counts.values())
+        if not grant_type_counts.empty:
+            grant_types, counts = self._pie_slices(grant_type_counts)
             
             # Grant type names'i kısalt
             short_names = [gt.split('-')[-1] if len(gt) > 20 else gt for gt in grant_types]
             
-            plt.pie(counts, labels=short_names, autopct='%1.1f%%', startangle=90)
-            plt.title('Grant Types Distribution', fontsize=14, fontweight='bold')
-            plt.axis('equal')
-            
-            chart_path = self.output_dir / f"{report_id}_grant_distribution.png"
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            charts.append(str(chart_path))
+            charts.append(("render_pie", {
+                "path": str(self.output_dir / f"{report_id}_grant_distribution.png"),
+                "labels": short_names,
+                "values": counts,
+                "title": 'Grant Types Distribution',
+                "figsize": (12, 8),
+                "dpi": self.chart_dpi
+            }))
             
             # Cross-document analysis chart
-            if cross_doc_counts:
-                plt.figure(figsize=(10, 6))
-                cd_types = list(cross_doc_counts.keys())
-                cd_counts = list(cross_doc_counts.values())
+            if not cross_doc_counts.empty:
+                cd_types = cross_doc_counts.index.tolist()
+                cd_counts = cross_doc_counts.tolist()
                 
                 cd_short_names = [gt.split('-')[-1] if len(gt) > 20 else gt for gt in cd_types]
                 
-                plt.bar(cd_short_names, cd_counts, color='orange', alpha=0.7)
-                plt.title('Cross-Document Analysis by Grant Type', fontsize=14, fontweight='bold')
-                plt.xlabel('Grant Type')
-                plt.ylabel('Cross-Document Analyses')
-                plt.xticks(rotation=45)
-                plt.tight_layout()
-                
-                chart_path = self.output_dir / f"{report_id}_cross_document_analysis.png"
-                plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-                plt.close()
-                charts.append(str(chart_path))
+                charts.append(("render_bar", {
+                    "path": str(self.output_dir / f"{report_id}_cross_document_analysis.png"),
+                    "labels": cd_short_names,
+                    "values": cd_counts,
+                    "title": 'Cross-Document Analysis by Grant Type',
+                    "xlabel": 'Grant Type',
+                    "ylabel": 'Cross-Document Analyses',
+                    "color": 'orange',
+                    "rotate_labels": True,
+                    "dpi": self.chart_dpi
+                }))
         
         # Grant analysis section
         section_data = {
@@ -312,160 +610,129 @@ class ReportGenerator:
             "description": "Analysis of grant types and cross-document relationships",
             "metrics": {
                 "total_grant_types_found": len(grant_type_counts),
-                "most_analyzed_grant_type": max(grant_type_counts, key=grant_type_counts.get) if grant_type_counts else "N/A",
-                "cross_document_analyses": sum(cross_doc_counts.values()),
-                "grant_type_distribution": dict(grant_type_counts)
+                "most_analyzed_grant_type": grant_type_counts.idxmax() if not grant_type_counts.empty else "N/A",
+                "cross_document_analyses": int(cross_doc_counts.sum()),
+                "grant_type_distribution": dict(zip(grant_type_counts.index.tolist(), grant_type_counts.tolist()))
             }
         }
         
         return section_data, charts
     
-    def _generate_query_analysis_section(self, batch_results: List[BatchAnalysisResult], report_id: str) -> Tuple[Dict[str, Any], List[str]]:
+    def _generate_query_analysis_section(self, metrics: AggregatedMetrics, report_id: str) -> Tuple[Dict[str, Any], List[ChartSpec]]:
         """Sorgu analizi bölümü"""
         charts = []
         
-        # Query complexity analysis
-        complexity_counts = Counter()
-        language_counts = Counter()
-        response_lengths = []
+        # Query complexity analysis: <5 kelime Simple, <15 Medium, üstü Complex (tek bincount)
+        level_counts = np.bincount(np.digitize(metrics.word_counts, (5, 15)), minlength=3)
+        complexity_counts = {
+            level: int(count)
+            for level, count in zip(("Simple", "Medium", "Complex"), level_counts)
+            if count
+        }
         
-        for batch in batch_results:
-            for result in batch.results:
-                # Query complexity
-                word_count = len(result.query.split())
-                if word_count < 5:
-                    complexity = "Simple"
-                elif word_count < 15:
-                    complexity = "Medium"
-                else:
-                    complexity = "Complex"
-                complexity_counts[complexity] += 1
-                
-                # Language
-                lang = result.metadata.get("detected_language", "unknown")
-                language_counts[lang] += 1
-                
-                # Response length
-                if result.response:
-                    response_lengths.append(len(result.response))
+        language_counts = metrics.languages
+        response_lengths = metrics.response_lengths
         
         # Query complexity chart
         if complexity_counts:
-            plt.figure(figsize=(8, 6))
             complexities = list(complexity_counts.keys())
             counts = list(complexity_counts.values())
             colors = ['lightgreen', 'yellow', 'orange']
             
-            plt.bar(complexities, counts, color=colors[:len(complexities)], alpha=0.7)
-            plt.title('Query Complexity Distribution', fontsize=14, fontweight='bold')
-            plt.xlabel('Complexity Level')
-            plt.ylabel('Number of Queries')
-            
-            chart_path = self.output_dir / f"{report_id}_query_complexity.png"
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            charts.append(str(chart_path))
+            charts.append(("render_bar", {
+                "path": str(self.output_dir / f"{report_id}_query_complexity.png"),
+                "labels": complexities,
+                "values": counts,
+                "title": 'Query Complexity Distribution',
+                "xlabel": 'Complexity Level',
+                "ylabel": 'Number of Queries',
+                "figsize": (8, 6),
+                "color": colors[:len(complexities)],
+                "dpi": self.chart_dpi
+            }))
         
         # Language distribution
-        if language_counts:
-            plt.figure(figsize=(8, 6))
-            languages = list(language_counts.keys())
-            counts = list(language_counts.values())
-            
-            plt.pie(counts, labels=languages, autopct='%1.1f%%', startangle=90)
-            plt.title('Query Language Distribution', fontsize=14, fontweight='bold')
-            plt.axis('equal')
-            
-            chart_path = self.output_dir / f"{report_id}_language_distribution.png"
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            charts.append(str(chart_path))
+        languages = language_counts.index.tolist()
+        language_totals = language_counts.tolist()
+        if languages:
+            pie_labels, pie_values = self._pie_slices(language_counts)
+            charts.append(("render_pie", {
+                "path": str(self.output_dir / f"{report_id}_language_distribution.png"),
+                "labels": pie_labels,
+                "values": pie_values,
+                "title": 'Query Language Distribution',
+                "dpi": self.chart_dpi
+            }))
         
         # Query analysis section
         section_data = {
             "title": "Query Analysis", 
             "description": "Analysis of user queries and response patterns",
             "metrics": {
-                "total_queries": sum(complexity_counts.values()),
-                "average_response_length": round(sum(response_lengths) / len(response_lengths), 2) if response_lengths else 0,
+                "total_queries": int(level_counts.sum()),
+                "average_response_length": round(float(response_lengths.mean()), 2) if response_lengths.size else 0,
                 "complexity_distribution": dict(complexity_counts),
-                "language_distribution": dict(language_counts),
-                "longest_response": max(response_lengths) if response_lengths else 0,
-                "shortest_response": min(response_lengths) if response_lengths else 0
+                "language_distribution": dict(zip(languages, language_totals)),
+                "longest_response": int(response_lengths.max()) if response_lengths.size else 0,
+                "shortest_response": int(response_lengths.min()) if response_lengths.size else 0
             }
         }
         
         return section_data, charts
     
-    def _generate_trend_analysis_section(self, batch_results: List[BatchAnalysisResult], report_id: str) -> Tuple[Dict[str, Any], List[str]]:
+    def _generate_trend_analysis_section(self, metrics: AggregatedMetrics, report_id: str) -> Tuple[Dict[str, Any], List[ChartSpec]]:
         """Trend analizi bölümü"""
         charts = []
         
+        timestamps = []
+        success_rates = np.empty(0)
+        analysis_period_days = 0
+        
         # Time-based analysis
-        if batch_results:
-            # Sort by time
-            sorted_batches = sorted(batch_results, key=lambda x: x.started_at or datetime.now())
+        if metrics.batch_count:
+            # Sort by time: tarihli satırların sırası tek bir stable argsort ile bulunur,
+            # kolonlar bu sırayla alınır (başlangıç zamanı olmayan batch'ler trende girmez)
+            batches = metrics.batches
+            dated = np.flatnonzero(batches["started_at"].notna().to_numpy())
+            order = dated[np.argsort(batches["started_at"].to_numpy()[dated], kind="stable")]
             
             # Extract time series data
-            timestamps = []
-            success_rates = []
-            processing_times = []
-            query_counts = []
-            
-            for batch in sorted_batches:
-                if batch.started_at:
-                    timestamps.append(batch.started_at)
-                    if batch.total_queries > 0:
-                        success_rates.append((batch.successful_queries / batch.total_queries) * 100)
-                    else:
-                        success_rates.append(0)
-                    processing_times.append(batch.total_processing_time)
-                    query_counts.append(batch.total_queries)
+            started_at = batches["started_at"].take(order)
+            timestamps = [ts.to_pydatetime() for ts in started_at]
+            total_queries = batches["total_queries"].to_numpy()[order]
+            success_rates = np.where(
+                total_queries > 0,
+                batches["successful_queries"].to_numpy()[order] / np.maximum(total_queries, 1) * 100,
+                0
+            )
+            processing_times = batches["total_processing_time"].to_numpy(dtype=np.float64)[order]
             
             if len(timestamps) > 1:
-                # Trend charts
-                fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10))
+                analysis_period_days = (started_at.max() - started_at.min()).days
                 
-                # Success rate trend
-                ax1.plot(timestamps, success_rates, marker='o', linewidth=2, markersize=6)
-                ax1.set_title('Success Rate Trend', fontweight='bold')
-                ax1.set_ylabel('Success Rate (%)')
-                ax1.grid(True, alpha=0.3)
-                
-                # Processing time trend
-                ax2.plot(timestamps, processing_times, marker='s', color='orange', linewidth=2, markersize=6)
-                ax2.set_title('Processing Time Trend', fontweight='bold')
-                ax2.set_ylabel('Processing Time (seconds)')
-                ax2.grid(True, alpha=0.3)
-                
-                # Query count trend
-                ax3.plot(timestamps, query_counts, marker='^', color='green', linewidth=2, markersize=6)
-                ax3.set_title('Query Volume Trend', fontweight='bold')
-                ax3.set_ylabel('Number of Queries')
-                ax3.grid(True, alpha=0.3)
-                
-                # Combined efficiency (success rate / processing time)
-                efficiency = [sr / pt if pt > 0 else 0 for sr, pt in zip(success_rates, processing_times)]
-                ax4.plot(timestamps, efficiency, marker='D', color='purple', linewidth=2, markersize=6)
-                ax4.set_title('Efficiency Trend (Success/Time)', fontweight='bold')
-                ax4.set_ylabel('Efficiency Score')
-                ax4.grid(True, alpha=0.3)
-                
-                plt.tight_layout()
-                chart_path = self.output_dir / f"{report_id}_trends.png"
-                plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-                plt.close()
-                charts.append(str(chart_path))
+                # Trend charts; combined efficiency = success rate / processing time (süre 0 ise 0)
+                efficiency = np.divide(success_rates, processing_times,
+                                       out=np.zeros_like(success_rates), where=processing_times > 0)
+                charts.append(("render_trends", {
+                    "path": str(self.output_dir / f"{report_id}_trends.png"),
+                    "timestamps": timestamps,
+                    "success_rates": success_rates.tolist(),
+                    "processing_times": processing_times.tolist(),
+                    "query_counts": total_queries.tolist(),
+                    "efficiency": efficiency.tolist(),
+                    "dpi": self.chart_dpi
+                }))
         
         # Trend analysis section
         section_data = {
             "title": "Trend Analysis",
             "description": "Time-based trends and performance evolution",
             "metrics": {
-                "analysis_period_days": (max(timestamps) - min(timestamps)).days if len(timestamps) > 1 else 0,
-                "trend_direction": "improving" if len(success_rates) > 1 and success_rates[-1] > success_rates[0] else "stable",
-                "peak_performance_date": timestamps[success_rates.index(max(success_rates))].isoformat() if success_rates else None,
-                "total_batches_analyzed": len(batch_results)
+                "analysis_period_days": analysis_period_days,
+                "trend_direction": "improving" if success_rates.size > 1 and success_rates[-1] > success_rates[0] else "stable",
+                # argmax: eşit tepe değerlerinde ilk batch
+                "peak_performance_date": timestamps[int(np.argmax(success_rates))].isoformat() if success_rates.size else None,
+                "total_batches_analyzed": metrics.batch_count
             }
         }
         
@@ -476,14 +743,15 @@ class ReportGenerator:
         try:
             # JSON raporu
             json_path = self.output_dir / f"{report.report_id}.json"
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(report.to_dict(), f, indent=2, ensure_ascii=False, default=str)
+            self._dump_report_json(report, json_path)
             report.export_formats.append(str(json_path))
             
-            # CSV export (summary data)
+            # CSV export (summary data): başlık satırı + tek değer satırı
             csv_path = self.output_dir / f"{report.report_id}_summary.csv"
-            summary_df = pd.DataFrame([report.summary])
-            summary_df.to_csv(csv_path, index=False)
+            with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=list(report.summary), lineterminator='\n')
+                writer.writeheader()
+                writer.writerow(report.summary)
             report.export_formats.append(str(csv_path))
             
             print(f"📄 Rapor kaydedildi: {json_path}")
@@ -491,6 +759,54 @@ class ReportGenerator:
         except Exception as e:
             print(f"⚠️ Rapor kaydetme hatası: {e}")
     
+    @classmethod
+    def _dump_report_json(cls, report: AnalyticsReport, path: Path):
+        """
+        Raporu JSON dosyasına yaz
+        
+        orjson varsa rapor C tarafında tek seferde UTF-8 olarak kodlanır (NumPy değerleri dahil);
+        yoksa alan alan json ile yazılır.
+        """
+        if orjson is not None:
+            path.write_bytes(orjson.dumps(
+                report.to_dict(),
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+                default=str
+            ))
+            return
+        
+        with open(path, 'w', encoding='utf-8') as f:
+            cls._write_report_json(report, f)
+    
+    @staticmethod
+    def _write_report_json(report: AnalyticsReport, f):
+        """
+        Raporu alan alan dosyaya yaz (to_dict ile tüm raporu bir kez daha kurmadan)
+        
+        Bölümler tek tek kodlanıp yazılır; çıktı to_dict + json.dump ile aynı yapıdadır.
+        """
+        def encode(value) -> str:
+            # Üst seviye alanların içeriği bir seviye içeride
+            return json.dumps(value, indent=2, ensure_ascii=False, default=str).replace("\n", "\n  ")
+        
+        f.write('{\n')
+        f.write(f'  "report_id": {encode(report.report_id)},\n')
+        f.write(f'  "title": {encode(report.title)},\n')
+        f.write(f'  "description": {encode(report.description)},\n')
+        f.write(f'  "generated_at": {encode(report.generated_at.isoformat())},\n')
+        f.write(f'  "data_period": {encode({"start_date": report.data_period["start_date"].isoformat(), "end_date": report.data_period["end_date"].isoformat()})},\n')
+        f.write(f'  "summary": {encode(report.summary)},\n')
+        
+        f.write('  "sections": [')
+        for index, section in enumerate(report.sections):
+            f.write(',\n    ' if index else '\n    ')
+            f.write(encode(section).replace("\n", "\n  "))
+        f.write('\n  ],\n' if report.section_titles else '],\n')
+        
+        f.write(f'  "visualizations": {encode(report.visualizations)},\n')
+        f.write(f'  "export_formats": {encode(report.export_formats)}\n')
+        f.write('}')
+    
     def generate_grant_comparison_report(self, 
                                        batch_results: List[BatchAnalysisResult],
                                        grant_types: List[str]) -> Dict[str, Any]:
@@ -504,41 +820,54 @@ class ReportGenerator:
         Returns:
             Karşılaştırma raporu
         """
-        comparison_data = {}
+        # Sorgular bir kez küçük harfe çevrilir ve tüm grant tipleri tek taramada aranır
+        patterns: Dict[str, List[int]] = {}
+        for index, grant_type in enumerate(grant_types):
+            patterns.setdefault(grant_type.lower(), []).append(index)
+        match_grant_types = _grant_type_matcher(patterns)
+        
+        relevant_queries = [0] * len(grant_types)
+        total_sources = [0] * len(grant_types)
+        successful_queries = [0] * len(grant_types)
+        cross_document_analyses = [0] * len(grant_types)
         
-        for grant_type in grant_types:
+        for batch in batch_results:
+            for result in batch.results:
+                # Grant type mention kontrolü
+                matched = match_grant_types(result.query.lower())
+                if not matched:
+                    continue
+                
+                source_count = len(result.sources)
+                completed = result.status.value == "completed"
+                cross_doc = result.cross_document_analysis
+                grant_groups = cross_doc["grant_groups"] if cross_doc and "grant_groups" in cross_doc else None
+                
+                for index in matched:
+                    relevant_queries[index] += 1
+                    total_sources[index] += source_count
+                    if completed:
+                        successful_queries[index] += 1
+                    
+                    # Cross-document analysis
+                    if grant_groups is not None and any(grant_types[index] in gt for gt in grant_groups.keys()):
+                        cross_document_analyses[index] += 1
+        
+        comparison_data = {}
+        for index, grant_type in enumerate(grant_types):
             grant_metrics = {
                 "total_mentions": 0,
-                "cross_document_analyses": 0,
+                "cross_document_analyses": cross_document_analyses[index],
                 "average_sources_per_query": 0,
                 "common_topics": [],
                 "success_rate": 0
             }
             
-            total_sources = 0
-            relevant_queries = 0
-            successful_queries = 0
-            
-            for batch in batch_results:
-                for result in batch.results:
-                    # Grant type mention kontrolü
-                    if grant_type.lower() in result.query.lower():
-                        relevant_queries += 1
-                        total_sources += len(result.sources)
-                        
-                        if result.status.value == "completed":
-                            successful_queries += 1
-                        
-                        # Cross-document analysis
-                        cross_doc = result.cross_document_analysis
-                        if cross_doc and "grant_groups" in cross_doc:
-                            if any(grant_type in gt for gt in cross_doc["grant_groups"].keys()):
-                                grant_metrics["cross_document_analyses"] += 1
-            
-            if relevant_queries > 0:
-                grant_metrics["total_mentions"] = relevant_queries
-                grant_metrics["average_sources_per_query"] = total_sources / relevant_queries
-                grant_metrics["success_rate"] = (successful_queries / relevant_queries) * 100
+            relevant = relevant_queries[index]
+            if relevant > 0:
+                grant_metrics["total_mentions"] = relevant
+                grant_metrics["average_sources_per_query"] = total_sources[index] / relevant
+                grant_metrics["success_rate"] = (successful_queries[index] / relevant) * 100
             
             comparison_data[grant_type] = grant_metrics
         
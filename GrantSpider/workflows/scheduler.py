@@ -6,17 +6,38 @@ Otomatik batch işleme, zamanlanmış görevler ve iş yükü yönetimi sistemi
 import asyncio
 import schedule
 import threading
-import time
-from typing import Dict, Any, List, Optional, Callable
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count, islice
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Callable, Set
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
+import copy
 import json
+import logging
+import os
+import shutil
+import sys
 from pathlib import Path
 
 from workflows.batch_processor import BatchProcessor, BatchAnalysisRequest
 from workflows.report_generator import ReportGenerator
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Scheduler kayıtları; konsol handler'ı başlangıçta utils.helpers.configure_logging ile kurulur
+logger = logging.getLogger(__name__)
+
+# slots=True Python 3.10+ gerektirir
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 class ScheduleType(Enum):
     """Zamanlama türleri"""
     ONCE = "once"
@@ -25,7 +46,7 @@ class ScheduleType(Enum):
     MONTHLY = "monthly"
     INTERVAL = "interval"
 
-@dataclass
+@dataclass(**_SLOTS)
 class ScheduledTask:
     """Zamanlanmış görev"""
     id: str
@@ -60,9 +81,68 @@ class ScheduledTask:
             "failure_count": self.failure_count
         }
 
+# Önceden tanımlı görev şablonları; create_task_from_template yalnızca özelleştirirken kopyalar
+_TASK_TEMPLATES: Mapping[str, Dict[str, Any]] = MappingProxyType({
+    "daily_analytics": {
+        "name": "Daily Analytics Report",
+        "task_type": "report_generation", 
+        "schedule_type": ScheduleType.DAILY,
+        "schedule_config": {"time": "09:00"},
+        "task_config": {
+            "report_type": "analytics",
+            "time_period": "last_24_hours"
+        }
+    },
+    "weekly_grant_analysis": {
+        "name": "Weekly Grant Analysis",
+        "task_type": "batch_analysis",
+        "schedule_type": ScheduleType.WEEKLY,
+        "schedule_config": {"day": "monday", "time": "08:00"},
+        "task_config": {
+            "queries": [
+                "AMIF grants for women",
+                "AMIF grants for children", 
+                "AMIF health grants",
+                "AMIF digital grants"
+            ],
+            "analysis_type": "comparative"
+        }
+    },
+    "monthly_performance_review": {
+        "name": "Monthly Performance Review",
+        "task_type": "report_generation",
+        "schedule_type": ScheduleType.MONTHLY,
+        "schedule_config": {"day": 1, "time": "10:00"},
+        "task_config": {
+            "report_type": "comprehensive_analytics",
+            "time_period": "last_30_days",
+            "include_trends": True
+        }
+    }
+})
+
 class WorkflowScheduler:
     """Workflow zamanlayıcı sınıfı"""
     
+    TASKS_FILE = "scheduled_tasks.json"
+    # Görev geçmişi satır başına bir JSON kayıt olarak eklenir; her çalıştırmada tüm geçmiş yeniden yazılmaz
+    HISTORY_FILE = "task_history.jsonl"
+    # Bellekte tutulan en yeni geçmiş kaydı sayısı (dosyada tamamı kalır)
+    HISTORY_LIMIT = 10_000
+    
+    # Rapor görevlerinin time_period değerleri (gün); bilinmeyen değer = tüm geçmiş
+    REPORT_PERIOD_DAYS = {"last_24_hours": 1, "last_7_days": 7, "last_30_days": 30}
+    
+    # Aynı anda çalışabilecek görev sayısı
+    TASK_WORKERS = 4
+    
+    # Döngü tek seferde en fazla bu kadar bekler (yeni eklenen job'lar en geç bu sürede fark edilir)
+    MAX_IDLE_SECONDS = 30
+    
+    # Döngü hatasından sonraki bekleme (saniye): MIN_FAIL_DELAY'den başlar, her hatada ikiye katlanır
+    MIN_FAIL_DELAY = 1.0
+    MAX_FAIL_DELAY = 60.0
+    
     def __init__(self, 
                  batch_processor: Optional[BatchProcessor] = None,
                  report_generator: Optional[ReportGenerator] = None,
@@ -79,83 +159,111 @@ class WorkflowScheduler:
         self.scheduled_tasks: Dict[str, ScheduledTask] = {}
         self.scheduler_thread: Optional[threading.Thread] = None
         self.is_running = False
+        # scheduled_tasks, görev sayaçları, task_history, kayıt dosyaları ve schedule job listesi
+        # bu kilitle korunur (görevler havuz thread'lerinde çalışır); görevin kendisi kilitsiz çalışır
+        self._lock = threading.RLock()
+        # Döngünün beklemesini stop_scheduler'da hemen sonlandırır
+        self._stop_event = threading.Event()
+        
+        # Batch analizleri için ayrı thread'de sürekli çalışan tek event loop (ilk kullanımda açılır)
+        self._aio_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._aio_thread: Optional[threading.Thread] = None
+        self._aio_lock = threading.Lock()
+        
+        # Görevler scheduler thread'ini bloklamadan bu havuzda çalışır (start_scheduler'da açılır);
+        # önceki çalıştırması bitmemiş görev tekrar gönderilmez
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight: Set[str] = set()
+        self._in_flight_lock = threading.Lock()
         
         # Görev geçmişi
-        self.task_history: List[Dict[str, Any]] = []
-        
-        # Önceden tanımlı görev şablonları
-        self.task_templates = {
-            "daily_analytics": {
-                "name": "Daily Analytics Report",
-                "task_type": "report_generation", 
-                "schedule_type": ScheduleType.DAILY,
-                "schedule_config": {"time": "09:00"},
-                "task_config": {
-                    "report_type": "analytics",
-                    "time_period": "last_24_hours"
-                }
-            },
-            "weekly_grant_analysis": {
-                "name": "Weekly Grant Analysis",
-                "task_type": "batch_analysis",
-                "schedule_type": ScheduleType.WEEKLY,
-                "schedule_config": {"day": "monday", "time": "08:00"},
-                "task_config": {
-                    "queries": [
-                        "AMIF grants for women",
-                        "AMIF grants for children", 
-                        "AMIF health grants",
-                        "AMIF digital grants"
-                    ],
-                    "analysis_type": "comparative"
-                }
-            },
-            "monthly_performance_review": {
-                "name": "Monthly Performance Review",
-                "task_type": "report_generation",
-                "schedule_type": ScheduleType.MONTHLY,
-                "schedule_config": {"day": 1, "time": "10:00"},
-                "task_config": {
-                    "report_type": "comprehensive_analytics",
-                    "time_period": "last_30_days",
-                    "include_trends": True
-                }
-            }
-        }
+        self.task_history: deque = deque(maxlen=self.HISTORY_LIMIT)
         
-        print("📅 WorkflowScheduler başlatılıyor...")
+        # Rapor görevleri için başlangıç zamanına göre sıralı batch indeksi (bkz. _results_since)
+        self._history_index: Optional[tuple] = None
+        
+        # Görev ID son ekleri; silinen görevlerden sonra da tekrar etmez (yüklemede en büyük ekten devam eder)
+        self._id_counter = count()
+        
+        # Önceden tanımlı görev şablonları (tüm örneklerde ortak, salt okunur)
+        self.task_templates = _TASK_TEMPLATES
+        
+        logger.info("📅 WorkflowScheduler başlatılıyor...")
         self._load_scheduled_tasks()
     
     def start_scheduler(self):
         """Scheduler'ı başlat"""
         if self.is_running:
-            print("⚠️ Scheduler zaten çalışıyor")
+            logger.warning("⚠️ Scheduler zaten çalışıyor")
             return
         
         self.is_running = True
+        self._stop_event.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.TASK_WORKERS, thread_name_prefix="sched")
         self.scheduler_thread = threading.Thread(target=self._run_scheduler, daemon=True)
         self.scheduler_thread.start()
         
-        print("🚀 Workflow Scheduler başlatıldı")
-        print(f"📊 Aktif görev sayısı: {len([t for t in self.scheduled_tasks.values() if t.is_active])}")
+        logger.info("🚀 Workflow Scheduler başlatıldı")
+        logger.info("📊 Aktif görev sayısı: %d", sum(1 for t in self.scheduled_tasks.values() if t.is_active))
     
     def stop_scheduler(self):
         """Scheduler'ı durdur"""
         self.is_running = False
+        self._stop_event.set()
         if self.scheduler_thread and self.scheduler_thread.is_alive():
             self.scheduler_thread.join(timeout=5)
+        if self._executor is not None:
+            # Çalışan görevlerin bitmesi beklenir
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._stop_aio_loop()
+        
+        logger.info("⏹️ Workflow Scheduler durduruldu")
+    
+    def _get_aio_loop(self) -> asyncio.AbstractEventLoop:
+        """Paylaşılan event loop'u döndür, gerekirse thread'iyle birlikte başlat"""
+        with self._aio_lock:
+            if self._aio_loop is None:
+                self._aio_loop = asyncio.new_event_loop()
+                self._aio_thread = threading.Thread(target=self._aio_loop.run_forever, daemon=True)
+                self._aio_thread.start()
+            return self._aio_loop
+    
+    def _stop_aio_loop(self):
+        """Paylaşılan event loop'u durdur ve kapat"""
+        with self._aio_lock:
+            loop, thread = self._aio_loop, self._aio_thread
+            self._aio_loop = self._aio_thread = None
+        if loop is None:
+            return
         
-        print("⏹️ Workflow Scheduler durduruldu")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        if not loop.is_running():
+            loop.close()
     
     def _run_scheduler(self):
         """Scheduler ana döngüsü"""
+        fail_delay = self.MIN_FAIL_DELAY
         while self.is_running:
             try:
-                schedule.run_pending()
-                time.sleep(30)  # 30 saniyede bir kontrol et
+                with self._lock:
+                    schedule.run_pending()
+                fail_delay = self.MIN_FAIL_DELAY
+                
+                # Bir sonraki job'a kadar uyu (job yoksa ya da uzaksa en fazla MAX_IDLE_SECONDS)
+                idle = schedule.idle_seconds()
+                if idle is None:
+                    idle = self.MAX_IDLE_SECONDS
+                if idle > 0 and self._stop_event.wait(min(idle, self.MAX_IDLE_SECONDS)):
+                    break
             except Exception as e:
-                print(f"❌ Scheduler hatası: {e}")
-                time.sleep(60)  # Hata durumunda 1 dakika bekle
+                logger.error("❌ Scheduler hatası: %s", e, exc_info=True)
+                # Art arda hatalarda bekleme ikiye katlanır (en fazla MAX_FAIL_DELAY);
+                # durdurma isteği beklemeyi keser
+                if self._stop_event.wait(fail_delay):
+                    break
+                fail_delay = min(fail_delay * 2, self.MAX_FAIL_DELAY)
     
     def add_scheduled_task(self, 
                           name: str,
@@ -176,7 +284,7 @@ class WorkflowScheduler:
         Returns:
             Görev ID'si
         """
-        task_id = f"task_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{len(self.scheduled_tasks)}"
+        task_id = f"task_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{next(self._id_counter)}"
         
         task = ScheduledTask(
             id=task_id,
@@ -187,62 +295,114 @@ class WorkflowScheduler:
             task_config=task_config
         )
         
-        # Schedule'a ekle
-        self._schedule_task(task)
-        
-        self.scheduled_tasks[task_id] = task
-        self._save_scheduled_tasks()
+        with self._lock:
+            # Schedule'a ekle
+            self._schedule_task(task)
+            
+            self.scheduled_tasks[task_id] = task
+            self._save_scheduled_tasks()
         
-        print(f"✅ Zamanlanmış görev eklendi: {name} ({task_id})")
+        logger.info("✅ Zamanlanmış görev eklendi: %s (%s)", name, task_id)
         return task_id
     
     def _schedule_task(self, task: ScheduledTask):
-        """Görevi schedule'a ekle"""
-        task_func = lambda: self._execute_task(task.id)
+        """Görevi schedule'a ekle (job'lar görev ID'si ile etiketlenir, tek tek kaldırılabilir)"""
+        task_func = lambda: self._submit_task(task.id)
         
         if task.schedule_type == ScheduleType.DAILY:
             time_str = task.schedule_config.get("time", "09:00")
-            schedule.every().day.at(time_str).do(task_func)
+            schedule.every().day.at(time_str).do(task_func).tag(task.id)
             
         elif task.schedule_type == ScheduleType.WEEKLY:
             day = task.schedule_config.get("day", "monday")
             time_str = task.schedule_config.get("time", "09:00")
-            getattr(schedule.every(), day).at(time_str).do(task_func)
+            getattr(schedule.every(), day).at(time_str).do(task_func).tag(task.id)
             
         elif task.schedule_type == ScheduleType.MONTHLY:
-            # Basit monthly implementasyonu (her ayın 1'i)
-            day = task.schedule_config.get("day", 1)
-            time_str = task.schedule_config.get("time", "09:00")
-            # Monthly için özel kontrol gerekli
-            schedule.every().day.at(time_str).do(self._check_monthly_task, task.id, day)
+            self._schedule_monthly_task(task.id, task.schedule_config)
             
         elif task.schedule_type == ScheduleType.INTERVAL:
             interval_minutes = task.schedule_config.get("interval_minutes", 60)
-            schedule.every(interval_minutes).minutes.do(task_func)
+            schedule.every(interval_minutes).minutes.do(task_func).tag(task.id)
     
-    def _check_monthly_task(self, task_id: str, target_day: int):
-        """Monthly görevler için özel kontrol"""
-        current_day = datetime.now().day
-        if current_day == target_day:
+    def _schedule_monthly_task(self, task_id: str, schedule_config: Dict[str, Any]):
+        """
+        Aylık görevi bir sonraki çalışma anına kur
+        
+        schedule kütüphanesinde aylık birim yok; job tek sefer çalışıp kendini
+        sonraki aya yeniden kurar, böylece ayda yalnızca bir kez uyanır.
+        """
+        day = schedule_config.get("day", 1)
+        time_str = schedule_config.get("time", "09:00")
+        next_run = self._next_monthly_run(day, time_str)
+        
+        job = schedule.every().day.at(time_str).do(self._run_monthly_task, task_id, schedule_config).tag(task_id)
+        job.next_run = next_run
+    
+    def _run_monthly_task(self, task_id: str, schedule_config: Dict[str, Any]):
+        """Aylık görevi çalıştır ve sonraki ay için yeniden kur"""
+        self._submit_task(task_id)
+        self._schedule_monthly_task(task_id, schedule_config)
+        return schedule.CancelJob
+    
+    @staticmethod
+    def _next_monthly_run(day: int, time_str: str) -> datetime:
+        """Ayın 'day' gününe denk gelen ilk gelecek zaman (o günü olmayan aylar atlanır)"""
+        if not isinstance(day, int) or not 1 <= day <= 31:
+            raise ValueError(f"Geçersiz aylık gün: {day} (1-31 olmalı)")
+        
+        hour, minute = (int(part) for part in time_str.split(":")[:2])
+        now = datetime.now()
+        year, month = now.year, now.month
+        # Geçerli her gün en geç 13 ay içinde (bu ay dahil) bir kez denk gelir
+        for _ in range(13):
+            try:
+                candidate = datetime(year, month, day, hour, minute)
+                if candidate > now:
+                    return candidate
+            except ValueError:
+                pass
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        raise ValueError(f"Aylık görev zamanı bulunamadı: gün={day}, saat={time_str}")
+    
+    def _submit_task(self, task_id: str):
+        """Görevi iş havuzuna gönder (havuz yoksa aynı thread'de çalıştır)"""
+        with self._in_flight_lock:
+            if task_id in self._in_flight:
+                logger.info("⏭️ Görev hâlâ çalışıyor, atlandı: %s", task_id)
+                return
+            self._in_flight.add(task_id)
+        
+        executor = self._executor
+        if executor is None:
+            self._run_in_flight(task_id)
+        else:
+            executor.submit(self._run_in_flight, task_id)
+    
+    def _run_in_flight(self, task_id: str):
+        try:
             self._execute_task(task_id)
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.discard(task_id)
     
     def _execute_task(self, task_id: str):
         """Görevi çalıştır"""
-        if task_id not in self.scheduled_tasks:
-            print(f"⚠️ Görev bulunamadı: {task_id}")
-            return
-        
-        task = self.scheduled_tasks[task_id]
-        
-        if not task.is_active:
-            print(f"⏭️ Görev deaktif: {task.name}")
-            return
-        
-        print(f"▶️ Görev çalıştırılıyor: {task.name}")
+        with self._lock:
+            task = self.scheduled_tasks.get(task_id)
+            if task is None:
+                logger.warning("⚠️ Görev bulunamadı: %s", task_id)
+                return
+            
+            if not task.is_active:
+                logger.info("⏭️ Görev deaktif: %s", task.name)
+                return
+            
+            start_time = datetime.now()
+            task.run_count += 1
+            task.last_run = start_time
         
-        start_time = datetime.now()
-        task.run_count += 1
-        task.last_run = start_time
+        logger.info("▶️ Görev çalıştırılıyor: %s", task.name)
         
         try:
             if task.task_type == "batch_analysis":
@@ -254,31 +414,35 @@ class WorkflowScheduler:
             else:
                 raise ValueError(f"Bilinmeyen görev türü: {task.task_type}")
             
-            task.success_count += 1
             status = "success"
             error_message = None
             
         except Exception as e:
-            task.failure_count += 1
             status = "failed"
             error_message = str(e)
-            print(f"❌ Görev hatası: {task.name} - {e}")
+            logger.error("❌ Görev hatası: %s - %s", task.name, e, exc_info=True)
         
-        # Görev geçmişine ekle
         execution_time = (datetime.now() - start_time).total_seconds()
-        self.task_history.append({
-            "task_id": task_id,
-            "task_name": task.name,
-            "executed_at": start_time.isoformat(),
-            "execution_time": execution_time,
-            "status": status,
-            "error_message": error_message
-        })
-        
-        # Dosyaya kaydet
-        self._save_scheduled_tasks()
+        with self._lock:
+            if status == "success":
+                task.success_count += 1
+            else:
+                task.failure_count += 1
+            
+            # Görev geçmişine ekle
+            self._append_task_history({
+                "task_id": task_id,
+                "task_name": task.name,
+                "executed_at": start_time.isoformat(),
+                "execution_time": execution_time,
+                "status": status,
+                "error_message": error_message
+            })
+            
+            # Görev sayaçlarını kaydet
+            self._save_scheduled_tasks()
         
-        print(f"✅ Görev tamamlandı: {task.name} ({execution_time:.2f}s)")
+        logger.info("✅ Görev tamamlandı: %s (%.2fs)", task.name, execution_time)
     
     def _execute_batch_analysis_task(self, task: ScheduledTask):
         """Batch analiz görevini çalıştır"""
@@ -296,16 +460,13 @@ class WorkflowScheduler:
             max_workers=config.get("max_workers", 2)
         )
         
-        # Asenkron olarak çalıştır (sync wrapper)
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            result = loop.run_until_complete(
-                self.batch_processor.process_batch_async(batch_request)
-            )
-            print(f"📊 Batch analiz tamamlandı: {result.successful_queries}/{result.total_queries} başarılı")
-        finally:
-            loop.close()
+        # Paylaşılan event loop'ta çalıştır, sonucu bekle (sync wrapper)
+        future = asyncio.run_coroutine_threadsafe(
+            self.batch_processor.process_batch_async(batch_request),
+            self._get_aio_loop()
+        )
+        result = future.result()
+        logger.info("📊 Batch analiz tamamlandı: %d/%d başarılı", result.successful_queries, result.total_queries)
     
     def _execute_report_generation_task(self, task: ScheduledTask):
         """Rapor üretim görevini çalıştır"""
@@ -313,26 +474,17 @@ class WorkflowScheduler:
         report_type = config.get("report_type", "analytics")
         
         # Batch sonuçlarını al
-        batch_results = self.batch_processor.get_job_history(limit=100)
+        # Sorgu sonuçları bellekte duran job'larla sınırlı (daha eskilerinin sonuçları atılmıştır)
+        batch_results = self.batch_processor.get_job_history(limit=self.batch_processor.FULL_RESULTS_HISTORY)
         
         if not batch_results:
-            print("⚠️ Rapor için veri bulunamadı")
+            logger.warning("⚠️ Rapor için veri bulunamadı")
             return
         
         # Zaman aralığını belirle
-        time_period = config.get("time_period", "all")
-        if time_period == "last_24_hours":
-            start_date = datetime.now() - timedelta(days=1)
-            filtered_results = [r for r in batch_results 
-                              if (r.started_at or datetime.now()) >= start_date]
-        elif time_period == "last_7_days":
-            start_date = datetime.now() - timedelta(days=7)
-            filtered_results = [r for r in batch_results 
-                              if (r.started_at or datetime.now()) >= start_date]
-        elif time_period == "last_30_days":
-            start_date = datetime.now() - timedelta(days=30)
-            filtered_results = [r for r in batch_results 
-                              if (r.started_at or datetime.now()) >= start_date]
+        period_days = self.REPORT_PERIOD_DAYS.get(config.get("time_period", "all"))
+        if period_days:
+            filtered_results = self._results_since(batch_results, datetime.now() - timedelta(days=period_days))
         else:
             filtered_results = batch_results
         
@@ -340,9 +492,28 @@ class WorkflowScheduler:
             report = self.report_generator.generate_comprehensive_analytics_report(
                 filtered_results
             )
-            print(f"📈 Analitik rapor oluşturuldu: {report.report_id}")
+            logger.info("📈 Analitik rapor oluşturuldu: %s", report.report_id)
         else:
-            print(f"⚠️ Bilinmeyen rapor türü: {report_type}")
+            logger.warning("⚠️ Bilinmeyen rapor türü: %s", report_type)
+    
+    def _results_since(self, batch_results: List[Any], start_date: datetime) -> List[Any]:
+        """
+        start_date ve sonrasında başlamış batch'ler (başlangıç zamanı olmayanlar her aralığa dahil)
+        
+        Sıralı indeks yalnızca batch geçmişi değiştiğinde yeniden kurulur; aynı geçmişle
+        çalışan raporlar kesim noktasını bisect ile bulur.
+        """
+        # İndeks nesnelere referans tuttuğu için id'ler yeniden kullanılamaz
+        signature = tuple(map(id, batch_results))
+        index = self._history_index
+        if index is None or index[0] != signature:
+            dated = sorted((r for r in batch_results if r.started_at is not None), key=attrgetter("started_at"))
+            undated = [r for r in batch_results if r.started_at is None]
+            index = (signature, [r.started_at for r in dated], dated, undated)
+            self._history_index = index
+        
+        _, keys, dated, undated = index
+        return undated + dated[bisect_left(keys, start_date):]
     
     def _execute_maintenance_task(self, task: ScheduledTask):
         """Bakım görevini çalıştır"""
@@ -356,22 +527,23 @@ class WorkflowScheduler:
             # Backup işlemi
             self._backup_data()
         else:
-            print(f"⚠️ Bilinmeyen bakım türü: {maintenance_type}")
+            logger.warning("⚠️ Bilinmeyen bakım türü: %s", maintenance_type)
     
     def _cleanup_old_files(self):
         """Eski dosyaları temizle"""
         # 30 günden eski batch sonuçlarını temizle
-        cutoff_date = datetime.now() - timedelta(days=30)
+        cutoff = (datetime.now() - timedelta(days=30)).timestamp()
         
-        # Batch results
+        # Batch results (scandir girdileri dizin okumasıyla gelir, dosya başına tek stat)
         batch_dir = Path("interfaces/data/batch_results")
         if batch_dir.exists():
-            for file_path in batch_dir.glob("*.json"):
-                if file_path.stat().st_mtime < cutoff_date.timestamp():
-                    file_path.unlink()
-                    print(f"🗑️ Eski dosya silindi: {file_path}")
+            with os.scandir(batch_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json") and entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        logger.info("🗑️ Eski dosya silindi: %s", entry.path)
         
-        print("🧹 Dosya temizliği tamamlandı")
+        logger.info("🧹 Dosya temizliği tamamlandı")
     
     def _backup_data(self):
         """Veri yedekleme"""
@@ -388,102 +560,144 @@ class WorkflowScheduler:
             
             for file_path in memory_dir.glob("*.json"):
                 backup_file = backup_memory_dir / file_path.name
-                backup_file.write_text(file_path.read_text())
+                # İçerik Python'a okunmadan kopyalanır (Linux'ta sendfile)
+                shutil.copyfile(file_path, backup_file)
         
-        print(f"💾 Veri yedekleme tamamlandı: {timestamp}")
+        logger.info("💾 Veri yedekleme tamamlandı: %s", timestamp)
     
     def create_task_from_template(self, template_name: str, custom_config: Dict[str, Any] = None) -> str:
         """Şablondan görev oluştur"""
-        if template_name not in self.task_templates:
+        if template_name not in _TASK_TEMPLATES:
             raise ValueError(f"Bilinmeyen şablon: {template_name}")
         
-        template = self.task_templates[template_name].copy()
-        
-        # Custom config ile şablonu güncelle
+        # Custom config ile şablonun kopyası güncellenir; ortak şablon değişmez
+        template = _TASK_TEMPLATES[template_name]
         if custom_config:
+            template = copy.deepcopy(template)
             template.update(custom_config)
         
+        # İç içe dict'ler kopyalanır; görevdeki değişiklik ortak şablona yansımaz
         return self.add_scheduled_task(
             name=template["name"],
             task_type=template["task_type"],
             schedule_type=template["schedule_type"],
-            schedule_config=template["schedule_config"],
-            task_config=template["task_config"]
+            schedule_config=copy.deepcopy(template["schedule_config"]),
+            task_config=copy.deepcopy(template["task_config"])
         )
     
     def remove_scheduled_task(self, task_id: str) -> bool:
         """Zamanlanmış görevi kaldır"""
-        if task_id not in self.scheduled_tasks:
-            return False
-        
-        task = self.scheduled_tasks[task_id]
-        task.is_active = False
-        
-        # Schedule'dan kaldır (schedule kütüphanesi tüm job'ları temizlemek için)
-        schedule.clear()
-        
-        # Aktif görevleri yeniden schedule'a ekle
-        for remaining_task in self.scheduled_tasks.values():
-            if remaining_task.is_active and remaining_task.id != task_id:
-                self._schedule_task(remaining_task)
-        
-        self._save_scheduled_tasks()
+        with self._lock:
+            task = self.scheduled_tasks.get(task_id)
+            if task is None:
+                return False
+            
+            task.is_active = False
+            
+            # Yalnızca bu göreve ait job'ları schedule'dan kaldır
+            schedule.clear(task_id)
+            
+            self._save_scheduled_tasks()
         
-        print(f"🗑️ Zamanlanmış görev kaldırıldı: {task.name}")
+        logger.info("🗑️ Zamanlanmış görev kaldırıldı: %s", task.name)
         return True
     
     def get_scheduled_tasks(self) -> List[ScheduledTask]:
         """Zamanlanmış görevleri döndür"""
-        return list(self.scheduled_tasks.values())
+        with self._lock:
+            return list(self.scheduled_tasks.values())
     
     def get_task_history(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Görev geçmişini döndür"""
-        return self.task_history[-limit:]
+        with self._lock:
+            start = max(0, len(self.task_history) - limit)
+            return list(islice(self.task_history, start, None))
     
     def get_scheduler_stats(self) -> Dict[str, Any]:
         """Scheduler istatistiklerini döndür"""
-        active_tasks = [t for t in self.scheduled_tasks.values() if t.is_active]
-        
-        total_runs = sum(t.run_count for t in self.scheduled_tasks.values())
-        total_successes = sum(t.success_count for t in self.scheduled_tasks.values())
+        with self._lock:
+            active_tasks = [t for t in self.scheduled_tasks.values() if t.is_active]
+            
+            total_runs = sum(t.run_count for t in self.scheduled_tasks.values())
+            total_successes = sum(t.success_count for t in self.scheduled_tasks.values())
+            task_count = len(self.scheduled_tasks)
+            history_size = len(self.task_history)
         
         return {
             "is_running": self.is_running,
-            "total_tasks": len(self.scheduled_tasks),
+            "total_tasks": task_count,
             "active_tasks": len(active_tasks),
             "total_runs": total_runs,
             "total_successes": total_successes,
             "success_rate": (total_successes / total_runs * 100) if total_runs > 0 else 0,
-            "task_history_size": len(self.task_history),
-            "available_templates": list(self.task_templates.keys())
+            "task_history_size": history_size,
+            "available_templates": list(_TASK_TEMPLATES)
         }
     
     def _save_scheduled_tasks(self):
-        """Zamanlanmış görevleri kaydet"""
+        """Zamanlanmış görevleri kaydet (geçmiş ayrı dosyada, bkz. _append_task_history)"""
         try:
-            tasks_data = {
-                "tasks": {task_id: task.to_dict() for task_id, task in self.scheduled_tasks.items()},
-                "task_history": self.task_history,
-                "last_updated": datetime.now().isoformat()
-            }
-            
-            tasks_file = self.config_path / "scheduled_tasks.json"
-            with open(tasks_file, 'w', encoding='utf-8') as f:
-                json.dump(tasks_data, f, indent=2, ensure_ascii=False)
+            with self._lock:
+                tasks_data = {
+                    "tasks": {task_id: task.to_dict() for task_id, task in self.scheduled_tasks.items()},
+                    "last_updated": datetime.now().isoformat()
+                }
+                
+                tasks_file = self.config_path / self.TASKS_FILE
+                if orjson is not None:
+                    # Ara str üretilmeden doğrudan UTF-8 bayt olarak yazılır
+                    tasks_file.write_bytes(orjson.dumps(tasks_data, option=orjson.OPT_INDENT_2))
+                else:
+                    with open(tasks_file, 'w', encoding='utf-8') as f:
+                        json.dump(tasks_data, f, indent=2, ensure_ascii=False)
                 
         except Exception as e:
-            print(f"⚠️ Görev kaydetme hatası: {e}")
+            logger.warning("⚠️ Görev kaydetme hatası: %s", e)
+    
+    def _append_task_history(self, entry: Dict[str, Any]):
+        """Geçmiş kaydını belleğe ve geçmiş dosyasının sonuna ekle"""
+        if orjson is not None:
+            line = orjson.dumps(entry) + b"\n"
+        else:
+            line = (json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8')
+        try:
+            with self._lock:
+                self.task_history.append(entry)
+                with open(self.config_path / self.HISTORY_FILE, 'ab') as f:
+                    f.write(line)
+        except Exception as e:
+            logger.warning("⚠️ Görev geçmişi kaydetme hatası: %s", e)
+    
+    def _load_task_history(self, legacy_history: List[Dict[str, Any]]):
+        """Geçmişi JSONL dosyasından yükle; yoksa eski scheduled_tasks.json içeriğini taşı"""
+        history_file = self.config_path / self.HISTORY_FILE
+        if history_file.exists():
+            with open(history_file, 'rb') as f:
+                # Yalnızca son HISTORY_LIMIT satır parse edilir
+                lines = deque(f, maxlen=self.HISTORY_LIMIT)
+            loads = orjson.loads if orjson is not None else json.loads
+            self.task_history = deque((loads(line) for line in lines if line.strip()), maxlen=self.HISTORY_LIMIT)
+            return
+        
+        self.task_history = deque(maxlen=self.HISTORY_LIMIT)
+        for entry in legacy_history:
+            self._append_task_history(entry)
     
     def _load_scheduled_tasks(self):
         """Zamanlanmış görevleri yükle"""
         try:
-            tasks_file = self.config_path / "scheduled_tasks.json"
+            tasks_file = self.config_path / self.TASKS_FILE
             
             if tasks_file.exists():
-                with open(tasks_file, 'r', encoding='utf-8') as f:
-                    tasks_data = json.load(f)
+                if orjson is not None:
+                    tasks_data = orjson.loads(tasks_file.read_bytes())
+                else:
+                    with open(tasks_file, 'r', encoding='utf-8') as f:
+                        tasks_data = json.load(f)
                 
-                # Görevleri yükle
+                # Görevleri yükle (yerel isimler döngüde attribute aramasını önler)
+                parse_time = datetime.fromisoformat
+                parse_optional_time = lambda value: parse_time(value) if value else None
                 for task_id, task_dict in tasks_data.get("tasks", {}).items():
                     task = ScheduledTask(
                         id=task_dict["id"],
@@ -492,9 +706,9 @@ class WorkflowScheduler:
                         schedule_type=ScheduleType(task_dict["schedule_type"]),
                         schedule_config=task_dict["schedule_config"],
                         task_config=task_dict["task_config"],
-                        created_at=datetime.fromisoformat(task_dict["created_at"]),
-                        last_run=datetime.fromisoformat(task_dict["last_run"]) if task_dict["last_run"] else None,
-                        next_run=datetime.fromisoformat(task_dict["next_run"]) if task_dict["next_run"] else None,
+                        created_at=parse_time(task_dict["created_at"]),
+                        last_run=parse_optional_time(task_dict.get("last_run")),
+                        next_run=parse_optional_time(task_dict.get("next_run")),
                         is_active=task_dict["is_active"],
                         run_count=task_dict["run_count"],
                         success_count=task_dict["success_count"],
@@ -502,18 +716,30 @@ class WorkflowScheduler:
                     )
                     
                     self.scheduled_tasks[task_id] = task
-                    
-                    # Aktif görevleri schedule'a ekle
-                    if task.is_active:
-                        self._schedule_task(task)
                 
-                # Görev geçmişini yükle
-                self.task_history = tasks_data.get("task_history", [])
+                # Tüm görevler okunduktan sonra aktif olanlar tek geçişte schedule'a eklenir
+                with self._lock:
+                    for task in self.scheduled_tasks.values():
+                        if task.is_active:
+                            try:
+                                self._schedule_task(task)
+                            except ValueError as e:
+                                # Hatalı konfigürasyonlu görev diğerlerinin yüklenmesini engellemez
+                                logger.warning("⚠️ Görev zamanlanamadı: %s - %s", task.name, e)
+                
+                suffixes = [int(task_id.rsplit("_", 1)[-1]) for task_id in self.scheduled_tasks
+                            if task_id.rsplit("_", 1)[-1].isdigit()]
+                self._id_counter = count(max(suffixes, default=-1) + 1)
                 
-                print(f"✅ Zamanlanmış görevler yüklendi: {len(self.scheduled_tasks)} görev")
+                # Görev geçmişini yükle (eski dosyalarda tasks ile aynı dosyada)
+                self._load_task_history(tasks_data.get("task_history", []))
+                
+                logger.info("✅ Zamanlanmış görevler yüklendi: %d görev", len(self.scheduled_tasks))
+            else:
+                self._load_task_history([])
                 
         except Exception as e:
-            print(f"⚠️ Görev yükleme hatası: {e}")
+            logger.warning("⚠️ Görev yükleme hatası: %s", e)
     
     def __del__(self):
         """Destructor - scheduler'ı temiz kapat"""